@@ -0,0 +1,54 @@
+"""
+In-memory stand-in for a Motor database, enough for the write paths the
+benchmarks exercise (bulk_write of InsertOne, insert_one/insert_many).
+
+Every document is BSON-encoded on the way in, so the client-side
+serialization cost a real driver pays is still measured; the network and
+server are not. Pass --mongo-url to the benchmarks to measure a real server.
+"""
+from typing import Dict, List
+
+import bson
+from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.results import BulkWriteResult, InsertManyResult, InsertOneResult
+
+class InMemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.documents: Dict[ObjectId, bytes] = {}
+
+    def store(self, document: dict) -> ObjectId:
+        document.setdefault("_id", ObjectId())
+        self.documents[document["_id"]] = bson.encode(document)
+        return document["_id"]
+
+    async def create_index(self, *args, **kwargs) -> str:
+        return kwargs.get("name", "index")
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        return InsertOneResult(self.store(document), acknowledged=True)
+
+    async def insert_many(self, documents: List[dict], ordered: bool = True) -> InsertManyResult:
+        return InsertManyResult([self.store(document) for document in documents], acknowledged=True)
+
+    async def bulk_write(self, operations: List[InsertOne], ordered: bool = True) -> BulkWriteResult:
+        for operation in operations:
+            # InsertOne keeps its document in _doc
+            self.store(operation._doc)
+        return BulkWriteResult({"nInserted": len(operations)}, acknowledged=True)
+
+    async def count_documents(self, filter: dict) -> int:
+        return len(self.documents)
+
+    async def drop(self) -> None:
+        self.documents.clear()
+
+class InMemoryDatabase:
+    def __init__(self):
+        self.collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = InMemoryCollection(name)
+        return self.collections[name]
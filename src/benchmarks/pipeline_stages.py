@@ -0,0 +1,394 @@
+"""
+Per-stage throughput, latency and memory of the ingestion and retrieval
+hot paths, on a synthetic TXT/PDF corpus.
+
+    cd src
+    python -m benchmarks.pipeline_stages --txt-files 20 --pdf-files 10 --output stages.json
+
+Stages (one timed op in brackets):
+    compute_file_hash      DataController.compute_file_hash       [one upload]
+    save_file_to_disk      DataController.save_file_to_disk       [one upload]
+    get_file_content       ProcessController.get_file_content     [one file]
+    process_file_content   ProcessController.process_file_content [one file]
+    insert_many_chunks     ChunkModel.insert_many_chunks          [one batch]
+    vectordb_insert_many   QdrantDBProvider.insert_many           [one batch]
+    vectordb_search        QdrantDBProvider.search_by_vector      [one query]
+
+Each stage reports op count, throughput in its own unit (bytes, chunks, points,
+queries), mean/p50/p95/p99 latency per op and the peak Python heap during
+one extra untimed pass under tracemalloc. Timings never run under
+tracemalloc, so they are not inflated by it.
+
+Mongo writes go to benchmarks.mongo_standin (BSON encoding included, no
+server) unless --mongo-url is given. Qdrant runs embedded unless --url is.
+Uses the app's settings (.env); files are written under a throwaway project
+directory that is removed afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import uuid
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Dict, List, Optional
+
+import fitz
+import numpy as np
+from bson import ObjectId
+from starlette.datastructures import UploadFile
+
+from controllers import DataController, ProcessController
+from helpers.latency import LatencyTracker
+from models import ChunkModel
+from models.db_schemes import DataChunk
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+from .mongo_standin import InMemoryDatabase
+
+# Starlette spools uploads to disk above 1 MB; mimic what FastAPI hands the routes
+UPLOAD_SPOOL_MAX_SIZE = 1024 * 1024
+
+def make_vocabulary(size: int, rng: np.random.Generator) -> List[str]:
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lengths = rng.integers(2, 11, size=size)
+    return ["".join(rng.choice(letters, size=length)) for length in lengths]
+
+def make_text(vocabulary: List[str], characters: int, rng: np.random.Generator) -> str:
+    # Zipf-like word frequencies, sentences and paragraphs so the splitter has real separators
+    weights = 1 / np.arange(1, len(vocabulary) + 1)
+    words = rng.choice(vocabulary, size=characters // 6 + 1, p=weights / weights.sum())
+    parts, length = [], 0
+    for i, word in enumerate(words):
+        if length >= characters:
+            break
+        separator = "\n\n" if i % 120 == 119 else (". " if i % 12 == 11 else " ")
+        parts.append(word + separator)
+        length += len(word) + len(separator)
+    return "".join(parts)
+
+def make_pdf(path: str, pages: List[str]) -> None:
+    with fitz.open() as doc:
+        for text in pages:
+            page = doc.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=9)
+        doc.save(path)
+
+def make_corpus(directory: str, args, rng: np.random.Generator) -> List[str]:
+    """Write the synthetic corpus; returns the file paths."""
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    paths = []
+    for i in range(args.txt_files):
+        path = os.path.join(directory, f"doc{i}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_text(vocabulary, args.txt_kb * 1024, rng))
+        paths.append(path)
+    for i in range(args.pdf_files):
+        path = os.path.join(directory, f"doc{i}.pdf")
+        # ~3 KB of text fits one page at this font size
+        make_pdf(path, [make_text(vocabulary, 3000, rng) for _ in range(args.pdf_pages)])
+        paths.append(path)
+    return paths
+
+def make_upload(path: str) -> UploadFile:
+    spooled = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    with open(path, "rb") as f:
+        shutil.copyfileobj(f, spooled)
+    spooled.seek(0)
+    return UploadFile(file=spooled, size=os.path.getsize(path), filename=os.path.basename(path))
+
+def summarize(tracker: LatencyTracker, seconds: float, units: float, unit: str, peak_bytes: Optional[int]) -> Dict:
+    return {
+        "unit": unit,
+        "units": units,
+        "seconds": round(seconds, 4),
+        f"{unit}_per_second": round(units / seconds, 1) if seconds > 0 else None,
+        **tracker.stats(),
+        "peak_memory_mb": round(peak_bytes / 2**20, 3) if peak_bytes is not None else None,
+    }
+
+def measure_memory(run_once: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        run_once()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench(ops: List[Callable[[], float]], repeat: int, unit: str, memory_pass: Callable[[], None]) -> Dict:
+    """
+    Time each op `repeat` times. An op runs one unit of work and returns how
+    many units it processed.
+    """
+    tracker = LatencyTracker(max_samples=len(ops) * repeat)
+    units, seconds = 0.0, 0.0
+    for _ in range(repeat):
+        for op in ops:
+            started_at = time.perf_counter()
+            done = op()
+            elapsed = time.perf_counter() - started_at
+            tracker.record(elapsed)
+            seconds += elapsed
+            units += done
+    return summarize(tracker, seconds, units, unit, measure_memory(memory_pass))
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_stages(args, paths: List[str], loop: asyncio.AbstractEventLoop) -> Dict[str, Dict]:
+    project_id = f"bench{uuid.uuid4().hex[:12]}"
+    data_controller = DataController()
+    process_controller = ProcessController(project_id=project_id)
+    results = {}
+
+    try:
+        # ---- uploads ----
+        # Spooled once up front, like the request body FastAPI has already received
+        uploads = [make_upload(path) for path in paths]
+
+        def hash_op(upload):
+            def op():
+                loop.run_until_complete(data_controller.compute_file_hash(upload))
+                return upload.size
+            return op
+
+        results["compute_file_hash"] = bench(
+            [hash_op(upload) for upload in uploads], args.repeat, "bytes",
+            memory_pass=lambda: [hash_op(upload)() for upload in uploads],
+        )
+
+        saved: List[str] = []
+
+        def save_op(upload):
+            def op():
+                loop.run_until_complete(upload.seek(0))
+                _, _, file_id = loop.run_until_complete(
+                    data_controller.save_file_to_disk(upload, project_id=project_id)
+                )
+                saved.append(file_id)
+                return upload.size
+            return op
+
+        results["save_file_to_disk"] = bench(
+            [save_op(upload) for upload in uploads], args.repeat, "bytes",
+            memory_pass=lambda: [save_op(upload)() for upload in uploads],
+        )
+        for upload in uploads:
+            upload.file.close()
+        # One saved copy per input file feeds the processing stages
+        file_ids = saved[:len(paths)]
+
+        # ---- parsing and chunking ----
+        contents = {}
+
+        def load_op(file_id):
+            def op():
+                contents[file_id] = process_controller.get_file_content(file_id)
+                return 1
+            return op
+
+        results["get_file_content"] = bench(
+            [load_op(file_id) for file_id in file_ids], args.repeat, "files",
+            memory_pass=lambda: [load_op(file_id)() for file_id in file_ids],
+        )
+
+        chunks_by_file = {}
+
+        def split_op(file_id):
+            def op():
+                chunks = process_controller.process_file_content(
+                    file_content=contents[file_id],
+                    file_id=file_id,
+                    chunk_size=args.chunk_size,
+                    overlap_size=args.overlap_size,
+                )
+                chunks_by_file[file_id] = chunks
+                return len(chunks)
+            return op
+
+        results["process_file_content"] = bench(
+            [split_op(file_id) for file_id in file_ids], args.repeat, "chunks",
+            memory_pass=lambda: [split_op(file_id)() for file_id in file_ids],
+        )
+
+        texts = [chunk.page_content for chunks in chunks_by_file.values() for chunk in chunks]
+        metadatas = [chunk.metadata for chunks in chunks_by_file.values() for chunk in chunks]
+
+        # ---- Mongo ----
+        if args.mongo_url:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            mongo_client = AsyncIOMotorClient(args.mongo_url)
+            db_client = mongo_client[f"benchmark_{project_id}"]
+        else:
+            mongo_client, db_client = None, InMemoryDatabase()
+        chunk_model = ChunkModel(db_client=db_client)
+
+        project_object_id, asset_object_id = ObjectId(), ObjectId()
+
+        # Built once: insert_many_chunks dumps fresh dicts, so the models can be re-sent
+        chunk_models = [
+            DataChunk(
+                chunk_text=texts[i],
+                chunk_metadata=metadatas[i],
+                chunk_order=i + 1,
+                chunk_project_id=project_object_id,
+                chunk_asset_id=asset_object_id,
+                chunk_size=args.chunk_size,
+                chunk_overlap_size=args.overlap_size,
+                chunk_hash_id=DataChunk.compute_hash_id(asset_object_id, texts[i]),
+            )
+            for i in range(len(texts))
+        ]
+
+        def insert_op(start, end):
+            def op():
+                return loop.run_until_complete(chunk_model.insert_many_chunks(
+                    chunk_models[start:end], batch_size=args.mongo_batch_size
+                ))
+            return op
+
+        chunk_batches = [
+            insert_op(i, min(i + args.mongo_batch_size, len(texts)))
+            for i in range(0, len(texts), args.mongo_batch_size)
+        ]
+        results["insert_many_chunks"] = bench(
+            chunk_batches, args.repeat, "chunks",
+            memory_pass=lambda: [op() for op in chunk_batches],
+        )
+        if mongo_client is not None:
+            loop.run_until_complete(mongo_client.drop_database(f"benchmark_{project_id}"))
+            mongo_client.close()
+
+        # ---- vector DB ----
+        rng = np.random.default_rng(args.seed)
+        matrix = rng.standard_normal((len(texts), args.dim), dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        record_ids = [DataChunk.compute_hash_id(asset_object_id, f"{i}:{text}") for i, text in enumerate(texts)]
+
+        with tempfile.TemporaryDirectory() as db_path:
+            provider = QdrantDBProvider(
+                db_path=db_path,
+                distance_method="cosine",
+                db_url=args.url,
+                upsert_batch_size=args.upsert_batch_size,
+            )
+            provider.connect()
+            collection_name = f"collection_{project_id}"
+
+            def upsert_op(start, end):
+                def op():
+                    provider.insert_many(
+                        collection_name=collection_name,
+                        texts=texts[start:end],
+                        vectors=matrix[start:end],
+                        metadatas=metadatas[start:end],
+                        record_ids=record_ids[start:end],
+                    )
+                    return end - start
+                return op
+
+            upserts = [
+                upsert_op(i, min(i + args.upsert_batch_size, len(texts)))
+                for i in range(0, len(texts), args.upsert_batch_size)
+            ]
+
+            def fresh_collection():
+                provider.create_collection(collection_name=collection_name, embedding_size=args.dim, do_reset=True)
+
+            def upsert_all():
+                fresh_collection()
+                for op in upserts:
+                    op()
+
+            fresh_collection()
+            results["vectordb_insert_many"] = bench(upserts, args.repeat, "points", memory_pass=upsert_all)
+
+            queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+            queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+            def search_op(vector):
+                def op():
+                    provider.search_by_vector(collection_name=collection_name, vector=vector, limit=args.k)
+                    return 1
+                return op
+
+            searches = [search_op(vector) for vector in queries.tolist()]
+            results["vectordb_search"] = bench(
+                searches, args.repeat, "queries",
+                memory_pass=lambda: [op() for op in searches],
+            )
+
+            provider.delete_collection(collection_name=collection_name)
+            provider.disconnect()
+    finally:
+        shutil.rmtree(process_controller.project_path, ignore_errors=True)
+
+    results["corpus"] = {
+        "files": len(paths),
+        "bytes": sum(os.path.getsize(path) for path in paths),
+        "chunks": len(texts),
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--txt-files", type=int, default=20)
+    parser.add_argument("--txt-kb", type=int, default=64)
+    parser.add_argument("--pdf-files", type=int, default=10)
+    parser.add_argument("--pdf-pages", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap-size", type=int, default=50)
+    parser.add_argument("--mongo-batch-size", type=int, default=100)
+    parser.add_argument("--upsert-batch-size", type=int, default=256)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over each stage's ops")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mongo-url", type=str, default=None)
+    parser.add_argument("--url", type=str, default=None, help="Qdrant server; embedded if omitted")
+    parser.add_argument("--output", type=str, default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    loop = asyncio.new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            paths = make_corpus(corpus_dir, args, rng)
+            stages = run_stages(args, paths, loop)
+    finally:
+        loop.close()
+
+    report = {
+        "benchmark": "pipeline_stages",
+        "meta": {
+            "git_commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "config": vars(args),
+        "corpus": stages.pop("corpus"),
+        "stages": stages,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
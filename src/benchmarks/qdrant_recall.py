@@ -0,0 +1,113 @@
+"""
+Recall@k vs search latency for Qdrant collection settings.
+
+    cd src
+    python -m benchmarks.qdrant_recall --url http://localhost:6333 \
+        --points 100000 --dim 384 --m 8 16 32 --ef 32 64 128 --quantization none scalar binary
+
+Every (m, quantization) pair builds one collection. Each search-time ef is
+then measured against exact top-k from a NumPy matmul, and one JSON row per
+configuration is printed. HNSW and quantization only exist in server mode:
+without --url, embedded mode does exact search and recall is always 1.0.
+"""
+import argparse
+import json
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+
+def make_corpus(points: int, dim: int, queries: int, seed: int = 0):
+    # Clustered data makes ANN recall realistic (uniform noise is too easy to mis-rank)
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(points // 1000, 8), dim)).astype(np.float32)
+    labels = rng.integers(0, len(centers), size=points + queries)
+    data = centers[labels] + 0.3 * rng.normal(size=(points + queries, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data[:points], data[points:]
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ matrix.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="+", default=[16])
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--ef", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--quantization", nargs="+", default=["none", "scalar"])
+    parser.add_argument("--oversampling", type=float, default=None)
+    parser.add_argument("--on-disk", action="store_true")
+    parser.add_argument("--url", type=str, default=None)
+    args = parser.parse_args()
+
+    matrix, queries = make_corpus(args.points, args.dim, args.queries)
+    truth = exact_top_k(matrix, queries, args.k)
+    record_ids = [str(uuid.uuid4()) for _ in range(args.points)]
+    index_of = {record_id: i for i, record_id in enumerate(record_ids)}
+
+    with tempfile.TemporaryDirectory() as db_path:
+        for m in args.m:
+            for quantization in args.quantization:
+                provider = QdrantDBProvider(
+                    db_path=db_path,
+                    distance_method="cosine",
+                    db_url=args.url,
+                    hnsw_m=m,
+                    hnsw_ef_construct=args.ef_construct,
+                    quantization=None if quantization == "none" else quantization,
+                    quantization_oversampling=args.oversampling,
+                    vectors_on_disk=args.on_disk,
+                )
+                provider.connect()
+
+                collection_name = f"bench_recall_m{m}_{quantization}"
+                provider.create_collection(collection_name, args.dim, do_reset=True)
+                provider.insert_many(
+                    collection_name=collection_name,
+                    texts=[""] * args.points,
+                    vectors=matrix,
+                    record_ids=record_ids,
+                )
+
+                for ef in args.ef:
+                    provider.search_hnsw_ef = ef
+                    latencies, hits = [], 0
+                    for query, expected in zip(queries, truth):
+                        started_at = time.perf_counter()
+                        found = provider.client.search(
+                            collection_name=collection_name,
+                            query_vector=query,
+                            limit=args.k,
+                            search_params=provider.get_search_params(),
+                            with_payload=False,
+                        )
+                        latencies.append(time.perf_counter() - started_at)
+                        hits += len({index_of[str(point.id)] for point in found} & set(expected.tolist()))
+
+                    latencies_ms = np.array(latencies) * 1000
+                    print(json.dumps({
+                        "m": m,
+                        "ef_construct": args.ef_construct,
+                        "ef": ef,
+                        "quantization": quantization,
+                        "on_disk": args.on_disk,
+                        f"recall@{args.k}": round(hits / (args.k * len(queries)), 4),
+                        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+                        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+                        "qps": round(len(queries) / (latencies_ms.sum() / 1000), 1),
+                    }))
+
+                provider.delete_collection(collection_name)
+                provider.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Points/s of QdrantDBProvider.insert_many before and after the bulk path.
+
+    cd src
+    python -m benchmarks.qdrant_upsert --points 50000 --dim 384
+
+"before" replays the old loop (one models.Record per row, a collection check
+per call, batches of 50); "after" is the current column-oriented insert_many.
+Pass --url to benchmark against a Qdrant server (enables --parallel).
+"""
+import argparse
+import json
+import tempfile
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import models
+
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+
+def legacy_insert_many(provider: QdrantDBProvider, collection_name, texts, vectors, record_ids, batch_size=50):
+    if not provider.client.collection_exists(collection_name=collection_name):
+        return False
+    for i in range(0, len(texts), batch_size):
+        provider.client.upload_records(
+            collection_name=collection_name,
+            records=[
+                models.Record(
+                    id=record_ids[j],
+                    vector=vectors[j],
+                    payload={"text": texts[j], "metadata": {}}
+                )
+                for j in range(i, min(i + batch_size, len(texts)))
+            ]
+        )
+    return True
+
+def run(provider: QdrantDBProvider, name: str, insert, texts, vectors, record_ids, dim: int):
+    collection_name = f"bench_upsert_{name}"
+    provider.create_collection(collection_name=collection_name, embedding_size=dim, do_reset=True)
+
+    started_at = time.perf_counter()
+    insert(collection_name)
+    elapsed = time.perf_counter() - started_at
+
+    provider.delete_collection(collection_name=collection_name)
+    return {
+        "points": len(texts),
+        "seconds": round(elapsed, 3),
+        "points_per_second": round(len(texts) / elapsed, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=1)
+    parser.add_argument("--url", type=str, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = rng.random((args.points, args.dim), dtype=np.float32)
+    texts = [f"chunk {i}" for i in range(args.points)]
+    record_ids = [str(uuid.uuid4()) for _ in range(args.points)]
+
+    with tempfile.TemporaryDirectory() as db_path:
+        provider = QdrantDBProvider(
+            db_path=db_path,
+            distance_method="cosine",
+            db_url=args.url,
+            upsert_batch_size=args.batch_size,
+            upsert_parallel=args.parallel
+        )
+        provider.connect()
+
+        vectors_as_lists = matrix.tolist()
+        before = run(
+            provider, "before",
+            lambda name: legacy_insert_many(provider, name, texts, vectors_as_lists, record_ids),
+            texts, vectors_as_lists, record_ids, args.dim
+        )
+        after = run(
+            provider, "after",
+            lambda name: provider.insert_many(
+                collection_name=name, texts=texts, vectors=matrix, record_ids=record_ids
+            ),
+            texts, matrix, record_ids, args.dim
+        )
+        provider.disconnect()
+
+    print(json.dumps({
+        "config": vars(args),
+        "before": before,
+        "after": after,
+        "speedup": round(after["points_per_second"] / before["points_per_second"], 2),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import logging
+from typing import List, Dict, Optional, Tuple
+
+from .BaseController import BaseController
+from .ContextController import ContextController
+from models import ChatSessionModel, ChatMessageModel
+from models.db_schemes import Project, ChatMessage
+from helpers.cache import TTLCache
+from stores.llm.templates import TemplateParser
+
+class ChatSessionController(BaseController):
+    """
+    Server-side chat sessions, so clients send a session_id instead of an
+    ever-growing chat_history.
+
+    Every message is one Mongo document; a session document holds the rolling
+    summary of the messages older than the hot tail. The newest messages and
+    the summary are cached per process (hot_tail_cache), so a turn on a warm
+    session costs one insert and no reads. The cache is per worker: with
+    several workers, keep a session on one worker or the TTL short.
+
+    Each turn sends the model only the newest messages that fit
+    CHAT_HISTORY_TOKEN_BUDGET (plus the summary), so prompt size stays flat
+    however long the session runs.
+    """
+
+    USER_ROLE = "user"
+    ASSISTANT_ROLE = "assistant"
+    # Summarizing folds the tail down to this share of the budget, so the
+    # summary call runs every few turns rather than on every turn once full
+    SUMMARY_KEEP_RATIO = 0.5
+
+    def __init__(
+        self,
+        session_model: ChatSessionModel,
+        message_model: ChatMessageModel,
+        generation_client,
+        template_parser: TemplateParser,
+        hot_tail_cache: Optional[TTLCache] = None
+    ):
+        super().__init__()
+
+        self.session_model = session_model
+        self.message_model = message_model
+        self.generation_client = generation_client
+        self.template_parser = template_parser
+        self.hot_tail_cache = hot_tail_cache
+        self.context_controller = ContextController()
+
+        self.token_budget = self.app_settings.CHAT_HISTORY_TOKEN_BUDGET
+        self.hot_tail_messages = self.app_settings.CHAT_HOT_TAIL_MESSAGES
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    async def load_session(self, project: Project, session_id: str) -> dict:
+        """
+        Returns the session state: {"summary", "summarized_until", "messages"},
+        where messages are the unsummarized tail, oldest first.
+        """
+        if self.hot_tail_cache is not None:
+            state = self.hot_tail_cache.get(session_id, namespace=project.project_id)
+            if state is not None:
+                return state
+
+        session = await self.session_model.get_or_create_session(
+            session_project_id=project.id,
+            session_id=session_id,
+        )
+        messages = await self.message_model.get_recent_messages(
+            message_project_id=project.id,
+            message_session_id=session_id,
+            limit=self.hot_tail_messages,
+            after_id=session.session_summarized_until,
+        )
+
+        state = {
+            "summary": session.session_summary,
+            "summarized_until": session.session_summarized_until,
+            "messages": [
+                {"id": message.id, "role": message.message_role, "content": message.message_content}
+                for message in messages
+            ],
+            "summarizing": False,
+        }
+        if self.hot_tail_cache is not None:
+            self.hot_tail_cache.set(session_id, state, namespace=project.project_id)
+        return state
+
+    def get_history_budget(self, state: dict) -> int:
+        # The summary rides along with every turn, so it comes out of the same budget
+        return max(self.token_budget - self.context_controller.estimate_tokens(state["summary"]), 0)
+
+    def build_chat_history(self, state: dict, system_prompt: str) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Build the provider chat history for the next turn: the system prompt
+        (with the summary appended) and the newest messages within budget.
+        Returns: (chat_history, estimated history tokens)
+        """
+        kept, _ = self.context_controller.trim_history(
+            state["messages"],
+            token_budget=self.get_history_budget(state),
+            assistant_role=self.ASSISTANT_ROLE,
+        )
+
+        if state["summary"]:
+            system_prompt = "\n\n".join([
+                system_prompt,
+                self.template_parser.get("chat", "history_summary_prompt", {"summary": state["summary"]}),
+            ])
+
+        roles = {
+            self.USER_ROLE: self.generation_client.enums.USER.value,
+            self.ASSISTANT_ROLE: self.generation_client.enums.ASSISTANT.value,
+        }
+        chat_history = [
+            self.generation_client.construct_prompt(
+                prompt=system_prompt,
+                role=self.generation_client.enums.SYSTEM.value,
+            )
+        ] + [
+            self.generation_client.construct_prompt(prompt=message["content"], role=roles[message["role"]])
+            for message in kept
+        ]
+
+        return chat_history, self.context_controller.estimate_messages_tokens(chat_history)
+
+    async def append_turn(self, project: Project, session_id: str, state: dict, query: str, answer: str) -> None:
+        """Persist one question/answer pair and add it to the cached tail."""
+        messages = await self.message_model.insert_messages([
+            ChatMessage(
+                message_project_id=project.id,
+                message_session_id=session_id,
+                message_role=role,
+                message_content=content,
+                message_tokens=self.context_controller.estimate_tokens(content),
+            )
+            for role, content in ((self.USER_ROLE, query), (self.ASSISTANT_ROLE, answer))
+        ])
+
+        state["messages"].extend(
+            {"id": message.id, "role": message.message_role, "content": message.message_content}
+            for message in messages
+        )
+        # With summaries on, the tail is only cut by summarize, after its oldest
+        # messages are folded in; a failed summary leaves them in place
+        if not self.app_settings.CHAT_SUMMARY_ENABLED:
+            del state["messages"][:-self.hot_tail_messages]
+
+        if self.hot_tail_cache is not None:
+            self.hot_tail_cache.set(session_id, state, namespace=project.project_id)
+
+    def needs_summary(self, state: dict) -> bool:
+        if not self.app_settings.CHAT_SUMMARY_ENABLED or state["summarizing"]:
+            return False
+        if len(state["messages"]) > self.hot_tail_messages:
+            return True
+        return self.context_controller.estimate_messages_tokens(state["messages"]) > self.get_history_budget(state)
+
+    async def summarize(self, project: Project, session_id: str, state: dict) -> bool:
+        """
+        Fold the oldest messages into the rolling summary until the tail is
+        back under half the history budget and half the hot tail. Meant to run
+        after the answer has been sent, so it never adds to a turn's latency.
+        """
+        messages = state["messages"]
+        _, dropped = self.context_controller.trim_history(
+            messages,
+            token_budget=int(self.get_history_budget(state) * self.SUMMARY_KEEP_RATIO),
+            assistant_role=self.ASSISTANT_ROLE,
+        )
+        start = max(len(dropped), len(messages) - int(self.hot_tail_messages * self.SUMMARY_KEEP_RATIO))
+        while start < len(messages) and messages[start]["role"] == self.ASSISTANT_ROLE:
+            start += 1
+        dropped = messages[:start]
+        if not dropped:
+            return False
+
+        state["summarizing"] = True
+        try:
+            transcript = "\n".join(f"{message['role']}: {message['content']}" for message in dropped)
+            prompt = self.template_parser.get("chat", "summary_prompt", {
+                "summary": state["summary"] or "-",
+                "transcript": transcript,
+            })
+            summary, _ = await self.generation_client.generate_text(
+                prompt=prompt,
+                chat_history=[],
+                max_output_tokens=self.app_settings.CHAT_SUMMARY_MAX_TOKENS,
+            )
+            if not summary:
+                return False
+
+            summarized_until = dropped[-1]["id"]
+            updated = await self.session_model.update_summary(
+                session_project_id=project.id,
+                session_id=session_id,
+                summary=summary.strip(),
+                summarized_until=summarized_until,
+                previous_until=state["summarized_until"],
+            )
+            if not updated:
+                # Another worker summarized first; reload its state on the next turn
+                if self.hot_tail_cache is not None:
+                    self.hot_tail_cache.pop(session_id, namespace=project.project_id)
+                return False
+
+            state["summary"] = summary.strip()
+            state["summarized_until"] = summarized_until
+            state["messages"] = [message for message in state["messages"] if message["id"] > summarized_until]
+            return True
+        except Exception as e:
+            self.logger.exception(f"Summarizing chat session {session_id} failed: {e}")
+            return False
+        finally:
+            state["summarizing"] = False
+
+    async def delete_session(self, project: Project, session_id: str) -> int:
+        if self.hot_tail_cache is not None:
+            self.hot_tail_cache.pop(session_id, namespace=project.project_id)
+        await self.session_model.delete_session(session_project_id=project.id, session_id=session_id)
+        return await self.message_model.delete_session_messages(
+            message_project_id=project.id,
+            message_session_id=session_id,
+        )
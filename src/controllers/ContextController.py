@@ -0,0 +1,176 @@
+import math
+import re
+from typing import List, Dict, Optional, Tuple
+
+from .BaseController import BaseController
+from models.db_schemes import DataChunk
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class ContextController(BaseController):
+    """
+    Turns retrieval hits into the context block of a RAG prompt:
+
+    1. hits from the same asset whose chunk_order is adjacent are merged into
+       one passage, removing the text the splitter's overlap repeated;
+    2. passages that are near-duplicates of a better-scoring one are dropped;
+    3. passages are packed best-score-first into the model's token budget.
+
+    It also trims chat history to a token budget. Token counts use a local
+    chars-per-token estimate, so no tokenizer or API call is needed.
+    """
+
+    # Shortest suffix/prefix match accepted as splitter overlap when merging
+    MIN_OVERLAP_CHARS = 8
+    # Approximate tokens added per passage by document_prompt ("## Document No: ...")
+    PASSAGE_OVERHEAD_TOKENS = 12
+    # Approximate tokens added per chat message by the role/format wrapper
+    MESSAGE_OVERHEAD_TOKENS = 4
+
+    def __init__(self):
+        super().__init__()
+        self.chars_per_token = self.app_settings.GENERATION_CHARS_PER_TOKEN
+        self.dedup_threshold = self.app_settings.GENERATION_CONTEXT_DEDUP_THRESHOLD
+
+    def estimate_tokens(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def estimate_messages_tokens(self, messages: List[Dict[str, str]]) -> int:
+        return sum(
+            self.estimate_tokens(message.get("content") or message.get("message"))
+            + self.MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        )
+
+    def trim_history(
+        self,
+        messages: List[Dict[str, str]],
+        token_budget: int,
+        assistant_role: str = "assistant"
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """
+        Keep the newest messages that fit token_budget. The kept window never
+        opens on an assistant reply whose question was trimmed away.
+        Returns: (kept, dropped), both oldest first
+        """
+        used = 0
+        start = len(messages)
+        while start > 0:
+            cost = self.estimate_messages_tokens([messages[start - 1]])
+            if used + cost > token_budget:
+                break
+            used += cost
+            start -= 1
+
+        while start < len(messages) and messages[start].get("role") == assistant_role:
+            start += 1
+
+        return messages[start:], messages[:start]
+
+    def get_token_budget(self, model_id: Optional[str]) -> int:
+        return self.app_settings.GENERATION_CONTEXT_TOKEN_BUDGETS.get(
+            model_id, self.app_settings.GENERATION_CONTEXT_DEFAULT_TOKEN_BUDGET
+        )
+
+    def merge_text(self, left: str, right: str, max_overlap: int) -> str:
+        """Join consecutive chunks, dropping the prefix of right that repeats the end of left."""
+        limit = min(len(left), len(right), max_overlap)
+        for size in range(limit, self.MIN_OVERLAP_CHARS - 1, -1):
+            if left.endswith(right[:size]):
+                return left + right[size:]
+        return f"{left}\n{right}"
+
+    def merge_adjacent(
+        self,
+        documents: List[RetrievedDocument],
+        chunks: List[DataChunk]
+    ) -> List[RetrievedDocument]:
+        """
+        Merge hits whose chunks are consecutive in the same asset; a merged
+        passage keeps the best score of its hits. Hits with no known chunk
+        (e.g. records indexed before content-hash ids) pass through unchanged.
+        """
+        chunks_by_id = {chunk.chunk_hash_id: chunk for chunk in chunks}
+
+        by_asset: Dict[str, List[Tuple[DataChunk, RetrievedDocument]]] = {}
+        passages: List[RetrievedDocument] = []
+        for document in documents:
+            chunk = chunks_by_id.get(document.id)
+            if chunk is None:
+                passages.append(document)
+            else:
+                by_asset.setdefault(str(chunk.chunk_asset_id), []).append((chunk, document))
+
+        for hits in by_asset.values():
+            hits.sort(key=lambda hit: hit[0].chunk_order)
+
+            run_chunk, run_document = hits[0]
+            text, score, last_order = run_document.text, run_document.score, run_chunk.chunk_order
+            for chunk, document in hits[1:]:
+                if chunk.chunk_order == last_order:
+                    score = max(score, document.score)
+                    continue
+                if chunk.chunk_order == last_order + 1:
+                    text = self.merge_text(text, document.text, max_overlap=chunk.chunk_overlap_size)
+                    score = max(score, document.score)
+                else:
+                    passages.append(RetrievedDocument(text=text, score=score, id=run_document.id))
+                    run_document = document
+                    text, score = document.text, document.score
+                last_order = chunk.chunk_order
+            passages.append(RetrievedDocument(text=text, score=score, id=run_document.id))
+
+        return passages
+
+    def get_shingles(self, text: str, size: int = 3) -> set:
+        words = re.findall(r"\w+", text.casefold())
+        if len(words) <= size:
+            return {" ".join(words)}
+        return {" ".join(words[i: i + size]) for i in range(len(words) - size + 1)}
+
+    def is_near_duplicate(self, shingles: set, selected: List[set]) -> bool:
+        for other in selected:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.dedup_threshold:
+                return True
+        return False
+
+    def pack(
+        self,
+        passages: List[RetrievedDocument],
+        token_budget: int
+    ) -> Tuple[List[RetrievedDocument], int]:
+        """
+        Greedily keep the best-scoring passages that fit the budget, skipping
+        near-duplicates of passages already kept.
+        Returns: (selected passages, estimated tokens used)
+        """
+        selected: List[RetrievedDocument] = []
+        selected_shingles: List[set] = []
+        used = 0
+
+        for passage in sorted(passages, key=lambda passage: passage.score, reverse=True):
+            cost = self.estimate_tokens(passage.text) + self.PASSAGE_OVERHEAD_TOKENS
+            if used + cost > token_budget:
+                continue
+
+            shingles = self.get_shingles(passage.text)
+            if self.is_near_duplicate(shingles, selected_shingles):
+                continue
+
+            selected.append(passage)
+            selected_shingles.append(shingles)
+            used += cost
+
+        return selected, used
+
+    def build_context(
+        self,
+        documents: List[RetrievedDocument],
+        chunks: List[DataChunk],
+        model_id: Optional[str] = None
+    ) -> Tuple[List[RetrievedDocument], int]:
+        """Returns: (passages for the prompt, estimated context tokens)"""
+        passages = self.merge_adjacent(documents=documents, chunks=chunks)
+        return self.pack(passages=passages, token_budget=self.get_token_budget(model_id))
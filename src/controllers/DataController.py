@@ -1,11 +1,13 @@
 from fastapi import UploadFile
 import re
 import os
+import asyncio
 import aiofiles
 import hashlib
 
 from .BaseController import BaseController
 from models.enums import ResponseSignal
+from helpers.metrics import project_label, FILE_HASHED_BYTES, FILE_SAVE_SECONDS
 
 class DataController(BaseController):
     def __init__(self):
@@ -63,3 +65,56 @@ class DataController(BaseController):
             return True, file_path, file_id_name
         except Exception as e:
             return False, "", str(e)
+
+    async def save_and_hash_file(self, file: UploadFile, project_id: str):
+        """
+        Stream the upload into a temporary file inside the project directory
+        and compute its SHA-256 in the same pass.
+        Returns: (success, temp_file_path, file_hash or error message)
+        """
+        project_path = self.get_project_path(project_id=project_id)
+        temp_file_path = os.path.join(
+            project_path,
+            f".upload_{self.generate_random_string()}.tmp"
+        )
+        sha256 = hashlib.sha256()
+        hashed_bytes = 0
+
+        try:
+            with FILE_SAVE_SECONDS.labels(project_label(project_id)).time():
+                await file.seek(0)  # Ensure pointer is at start
+                async with aiofiles.open(temp_file_path, "wb") as out:
+                    while chunk := await file.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                        # hashlib releases the GIL on large buffers, so hashing in a
+                        # worker thread overlaps with the write and keeps the loop free
+                        await asyncio.gather(
+                            asyncio.to_thread(sha256.update, chunk),
+                            out.write(chunk),
+                        )
+                        hashed_bytes += len(chunk)
+            FILE_HASHED_BYTES.labels(project_label(project_id)).inc(hashed_bytes)
+            return True, temp_file_path, sha256.hexdigest()
+        except Exception as e:
+            self.discard_temp_file(temp_file_path)
+            return False, "", str(e)
+        except BaseException:
+            # Client disconnect (CancelledError): don't leave the temp file behind
+            self.discard_temp_file(temp_file_path)
+            raise
+
+    def commit_temp_file(self, temp_file_path: str, org_file_name: str, project_id: str):
+        """
+        Atomically move a streamed upload to its final unique name.
+        Returns: (file_path, file_id_name)
+        """
+        file_path, file_id_name = self.generate_unique_filepath(
+            org_file_name=org_file_name,
+            project_id=project_id
+        )
+        # Same directory -> same filesystem, so os.replace is an atomic rename
+        os.replace(temp_file_path, file_path)
+        return file_path, file_id_name
+
+    def discard_temp_file(self, temp_file_path: str) -> None:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
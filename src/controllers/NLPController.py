@@ -0,0 +1,564 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Dict, AsyncIterator, Tuple
+
+from .BaseController import BaseController
+from .ContextController import ContextController
+from models.db_schemes import Project, DataChunk
+from models.db_schemes.data_chunk import RetrievedDocument
+from models import ChunkModel
+from stores.llm.LLMEnum import DocumentTypeEnum
+from helpers.cache import TTLCache
+from stores.lexical import BM25Index
+from stores.llm.templates import TemplateParser
+from models.enums import SearchModeEnum
+from helpers.metrics import (
+    project_label, EMBEDDING_SECONDS, EMBEDDING_TEXTS, VECTORDB_UPSERT_SECONDS,
+    VECTORDB_UPSERTED_POINTS, VECTORDB_SEARCH_SECONDS, LEXICAL_SEARCH_SECONDS
+)
+
+class NLPController(BaseController):
+    def __init__(
+        self,
+        vectordb_client,
+        generation_client,
+        embedding_client,
+        query_embedding_cache: Optional[TTLCache] = None,
+        search_result_cache: Optional[TTLCache] = None,
+        lexical_index: Optional[BM25Index] = None,
+        template_parser: Optional[TemplateParser] = None
+    ):
+        super().__init__()
+
+        self.vectordb_client = vectordb_client
+        self.generation_client = generation_client
+        self.embedding_client = embedding_client
+
+        self.query_embedding_cache = query_embedding_cache
+        self.search_result_cache = search_result_cache
+        self.lexical_index = lexical_index
+        self.template_parser = template_parser
+        self.context_controller = ContextController()
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    def create_collection_name(self, project_id: str):
+        return f"collection_{project_id}".strip()
+
+    async def reset_vector_db_collection(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.delete_collection(collection_name=collection_name)
+
+    async def get_vector_db_collection_info(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.get_collection_info(collection_name=collection_name)
+
+    def invalidate_search_cache(self, project: Project) -> None:
+        # Called on any push/delete so cached top-k never outlives the index
+        if self.search_result_cache is not None:
+            self.search_result_cache.invalidate(namespace=project.project_id)
+
+    def normalize_query(self, text: str) -> str:
+        return " ".join(text.split()).casefold()
+
+    async def embed_query(self, text: str):
+        """Embed a search query, going through the query-embedding LRU first."""
+        query = self.normalize_query(text)
+        if self.query_embedding_cache is not None:
+            vector = self.query_embedding_cache.get(query)
+            if vector is not None:
+                return vector
+
+        vectors = await self.embedding_client.embed_text(
+            text=query,
+            document_type=DocumentTypeEnum.QUERY.value
+        )
+        if not vectors:
+            return None
+
+        if self.query_embedding_cache is not None:
+            self.query_embedding_cache.set(query, vectors[0])
+        return vectors[0]
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 5):
+        """
+        Top-k search for a project. Results are cached per (project, text, limit)
+        until the TTL runs out or the project's index changes.
+        Returns: list of RetrievedDocument, or None on failure
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        result_key = (self.normalize_query(text), limit)
+
+        if self.search_result_cache is not None:
+            results = self.search_result_cache.get(result_key, namespace=project.project_id)
+            if results is not None:
+                return results
+            # Read before any await: results that race a push are dropped, not cached
+            generation = self.search_result_cache.generation(namespace=project.project_id)
+
+        if not await self.vectordb_client.is_collection_existed(collection_name=collection_name):
+            return None
+
+        metric_project = project_label(project.project_id)
+        with EMBEDDING_SECONDS.labels(metric_project, self.app_settings.EMBEDDING_BACKEND, DocumentTypeEnum.QUERY.value).time():
+            vector = await self.embed_query(text)
+        if vector is None:
+            return None
+        EMBEDDING_TEXTS.labels(metric_project, self.app_settings.EMBEDDING_BACKEND, DocumentTypeEnum.QUERY.value).inc()
+
+        with VECTORDB_SEARCH_SECONDS.labels(metric_project, self.app_settings.VECTOR_DB_BACKEND, "search").time():
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=vector,
+                limit=limit
+            )
+        if results is None:
+            # Failures are not cached
+            return None
+
+        if self.search_result_cache is not None:
+            self.search_result_cache.set(
+                result_key, results, namespace=project.project_id, generation=generation
+            )
+        return results
+
+    async def embed_queries(self, texts: List[str]):
+        """Embed many queries with one provider call, skipping cached ones."""
+        queries = [self.normalize_query(text) for text in texts]
+        vectors = {}
+        if self.query_embedding_cache is not None:
+            for query in queries:
+                vector = self.query_embedding_cache.get(query)
+                if vector is not None:
+                    vectors[query] = vector
+
+        missing = list(dict.fromkeys(query for query in queries if query not in vectors))
+        if missing:
+            embedded = await self.embedding_client.embed_text(
+                text=missing,
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+            if not embedded or len(embedded) != len(missing):
+                return None
+
+            for query, vector in zip(missing, embedded):
+                vectors[query] = vector
+                if self.query_embedding_cache is not None:
+                    self.query_embedding_cache.set(query, vector)
+
+        return [vectors[query] for query in queries]
+
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 5):
+        """
+        Top-k search for several queries at once: cached results are reused,
+        the rest are embedded in one call and searched in one vector DB request.
+        Returns: list of RetrievedDocument lists in input order, or None on failure
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        result_keys = [(self.normalize_query(text), limit) for text in texts]
+
+        results = {}
+        if self.search_result_cache is not None:
+            for key in result_keys:
+                cached = self.search_result_cache.get(key, namespace=project.project_id)
+                if cached is not None:
+                    results[key] = cached
+            # Read before any await: results that race a push are dropped, not cached
+            generation = self.search_result_cache.generation(namespace=project.project_id)
+
+        pending = [key for key in dict.fromkeys(result_keys) if key not in results]
+        if pending:
+            if not await self.vectordb_client.is_collection_existed(collection_name=collection_name):
+                return None
+
+            metric_project = project_label(project.project_id)
+            with EMBEDDING_SECONDS.labels(metric_project, self.app_settings.EMBEDDING_BACKEND, DocumentTypeEnum.QUERY.value).time():
+                vectors = await self.embed_queries([query for query, _ in pending])
+            if vectors is None:
+                return None
+            EMBEDDING_TEXTS.labels(metric_project, self.app_settings.EMBEDDING_BACKEND, DocumentTypeEnum.QUERY.value).inc(len(pending))
+
+            with VECTORDB_SEARCH_SECONDS.labels(metric_project, self.app_settings.VECTOR_DB_BACKEND, "search_batch").time():
+                batch_results = await self.vectordb_client.search_by_vectors(
+                    collection_name=collection_name,
+                    vectors=vectors,
+                    limit=limit
+                )
+            if batch_results is None:
+                # Failures are not cached
+                return None
+
+            for key, documents in zip(pending, batch_results):
+                results[key] = documents
+                if self.search_result_cache is not None:
+                    self.search_result_cache.set(
+                        key, documents, namespace=project.project_id, generation=generation
+                    )
+
+        return [results[key] for key in result_keys]
+
+    async def ensure_lexical_index(self, project: Project, chunk_model: ChunkModel) -> None:
+        """
+        Backfill the project's BM25 index from Mongo if it was never fully built.
+        Process jobs add their chunks whether or not the index is built, so
+        chunks written behind the scan are indexed by the job itself.
+        """
+        if await asyncio.to_thread(self.lexical_index.is_built, project.project_id):
+            return
+
+        async with self.lexical_index.get_backfill_lock(project.project_id):
+            # Another request may have finished the backfill while this one waited
+            if await asyncio.to_thread(self.lexical_index.is_built, project.project_id):
+                return
+
+            await asyncio.to_thread(self.lexical_index.reset, project.project_id, False)
+            async for chunks in chunk_model.iter_project_chunks(
+                project_id=project.id,
+                batch_size=self.app_settings.INDEXING_UPSERT_BATCH_SIZE,
+            ):
+                await asyncio.to_thread(
+                    self.lexical_index.add_chunks,
+                    project.project_id,
+                    [
+                        (
+                            chunk.chunk_hash_id or DataChunk.compute_hash_id(chunk.chunk_asset_id, chunk.chunk_text),
+                            str(chunk.chunk_asset_id),
+                            chunk.chunk_text,
+                        )
+                        for chunk in chunks
+                    ]
+                )
+            await asyncio.to_thread(self.lexical_index.mark_built, project.project_id)
+
+    async def search_lexical(self, project: Project, chunk_model: ChunkModel, text: str, limit: int = 5):
+        """
+        BM25 search over the project's chunks; needs no embedding call.
+        Returns: list of RetrievedDocument, or None if the lexical index is disabled
+        """
+        if self.lexical_index is None:
+            return None
+
+        await self.ensure_lexical_index(project=project, chunk_model=chunk_model)
+        with LEXICAL_SEARCH_SECONDS.labels(project_label(project.project_id)).time():
+            return await asyncio.to_thread(self.lexical_index.search, project.project_id, text, limit)
+
+    def fuse_by_reciprocal_rank(self, result_lists: List[List[RetrievedDocument]], limit: int):
+        """Reciprocal rank fusion: score(d) = sum over lists of 1 / (k + rank of d)."""
+        rrf_k = self.app_settings.SEARCH_HYBRID_RRF_K
+        scores = {}
+        documents = {}
+        for results in result_lists:
+            for rank, document in enumerate(results, start=1):
+                # Both retrievers key records by chunk_hash_id; fall back to text for legacy ids
+                key = document.id or document.text
+                scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+                documents.setdefault(key, document)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            RetrievedDocument(text=documents[key].text, score=score, id=documents[key].id)
+            for key, score in ranked
+        ]
+
+    async def search_hybrid(self, project: Project, chunk_model: ChunkModel, text: str, limit: int = 5):
+        """
+        Run vector and BM25 search concurrently and fuse them by reciprocal rank.
+        Falls back to whichever side is available.
+        Returns: list of RetrievedDocument, or None if both sides fail
+        """
+        candidates = max(limit, self.app_settings.SEARCH_HYBRID_CANDIDATES)
+        vector_results, lexical_results = await asyncio.gather(
+            self.search_vector_db_collection(project=project, text=text, limit=candidates),
+            self.search_lexical(project=project, chunk_model=chunk_model, text=text, limit=candidates),
+        )
+
+        result_lists = [results for results in (vector_results, lexical_results) if results is not None]
+        if not result_lists:
+            return None
+        return self.fuse_by_reciprocal_rank(result_lists, limit=limit)
+
+    async def retrieve_documents(
+        self,
+        project: Project,
+        chunk_model: ChunkModel,
+        text: str,
+        limit: int = 5,
+        mode: str = SearchModeEnum.VECTOR.value
+    ):
+        """Dispatch a search to the vector, lexical or hybrid retriever."""
+        if mode == SearchModeEnum.LEXICAL.value:
+            return await self.search_lexical(project=project, chunk_model=chunk_model, text=text, limit=limit)
+        if mode == SearchModeEnum.HYBRID.value:
+            return await self.search_hybrid(project=project, chunk_model=chunk_model, text=text, limit=limit)
+        return await self.search_vector_db_collection(project=project, text=text, limit=limit)
+
+    async def build_rag_context(
+        self,
+        project: Project,
+        chunk_model: ChunkModel,
+        documents: List[RetrievedDocument]
+    ) -> Tuple[List[RetrievedDocument], int]:
+        """
+        Merge adjacent hits, drop near-duplicates and pack the rest into the
+        generation model's token budget.
+        Returns: (passages, estimated context tokens)
+        """
+        hash_ids = [document.id for document in documents if document.id]
+        chunks = await chunk_model.get_chunks_by_hash_ids(project_id=project.id, hash_ids=hash_ids) if hash_ids else []
+        return self.context_controller.build_context(
+            documents=documents,
+            chunks=chunks,
+            model_id=self.generation_client.generate_model_id,
+        )
+
+    def build_rag_prompt(self, query: str, documents: List[RetrievedDocument]) -> Tuple[str, str]:
+        """Returns: (system_prompt, user_prompt) for answering query from documents."""
+        system_prompt = self.template_parser.get("rag", "system_prompt")
+
+        documents_prompt = "\n".join([
+            self.template_parser.get("rag", "document_prompt", {
+                "doc_num": i + 1,
+                "chunk_text": document.text,
+            })
+            for i, document in enumerate(documents)
+        ])
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {"query": query})
+
+        return system_prompt, "\n\n".join([documents_prompt, footer_prompt])
+
+    def trim_chat_history(self, chat_history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """
+        Bound a client-supplied chat history: leading system messages are
+        kept, the turns after them are trimmed to CHAT_HISTORY_TOKEN_BUDGET.
+        """
+        chat_history = list(chat_history or [])
+        system_role = self.generation_client.enums.SYSTEM.value
+
+        head = 0
+        while head < len(chat_history) and chat_history[head].get("role") == system_role:
+            head += 1
+
+        kept, _ = self.context_controller.trim_history(
+            chat_history[head:],
+            token_budget=self.app_settings.CHAT_HISTORY_TOKEN_BUDGET,
+            assistant_role=self.generation_client.enums.ASSISTANT.value,
+        )
+        return chat_history[:head] + kept
+
+    async def stream_rag_answer(
+        self,
+        query: str,
+        documents: List[RetrievedDocument],
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        started_at: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Stream an answer grounded in documents as ("token", {...}) events,
+        ending with one ("done", {...}) event that carries the updated chat
+        history, the estimated prompt tokens and timings, or ("error", {...})
+        if generation failed.
+        started_at (perf_counter) defaults to now; time-to-first-token is
+        measured from it.
+        """
+        started_at = started_at if started_at is not None else time.perf_counter()
+        system_prompt, prompt = self.build_rag_prompt(query=query, documents=documents)
+
+        chat_history = list(chat_history or [])
+        if not chat_history:
+            chat_history.append(self.generation_client.construct_prompt(
+                prompt=system_prompt,
+                role=self.generation_client.enums.SYSTEM.value,
+            ))
+
+        prompt_tokens = self.context_controller.estimate_messages_tokens(
+            chat_history + [self.generation_client.construct_prompt(prompt=prompt, role=self.generation_client.enums.USER.value)]
+        )
+
+        first_token_at = None
+        parts = []
+        try:
+            async for text in self.generation_client.stream_text(prompt=prompt, chat_history=chat_history):
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(text)
+                yield "token", {"text": text}
+        except Exception as e:
+            self.logger.exception(f"RAG answer stream failed: {e}")
+            yield "error", {"message": str(e)}
+            return
+
+        finished_at = time.perf_counter()
+        yield "done", {
+            "answer": "".join(parts).strip(),
+            "chat_history": chat_history,
+            "prompt_tokens": prompt_tokens,
+            "ttft_seconds": (first_token_at or finished_at) - started_at,
+            "total_seconds": finished_at - started_at,
+        }
+
+    async def embed_chunks(self, chunks: List[DataChunk], project_id: Optional[str] = None):
+        texts = [chunk.chunk_text for chunk in chunks]
+        labels = (project_label(project_id or ""), self.app_settings.EMBEDDING_BACKEND, DocumentTypeEnum.DOCUMENT.value)
+        with EMBEDDING_SECONDS.labels(*labels).time():
+            vectors = await self.embedding_client.embed_text(
+                text=texts,
+                document_type=DocumentTypeEnum.DOCUMENT.value
+            )
+        if not vectors or len(vectors) != len(texts):
+            raise RuntimeError("Embedding provider returned no vectors for a batch.")
+        EMBEDDING_TEXTS.labels(*labels).inc(len(texts))
+        return chunks, vectors
+
+    async def select_new_chunks(
+        self,
+        collection_name: str,
+        chunks: List[DataChunk],
+        chunk_model: ChunkModel,
+        check_existing: bool = True
+    ) -> List[DataChunk]:
+        """
+        Give every chunk its content-hash id (backfilling chunks stored before
+        ids existed) and keep only those whose id is not in the collection yet.
+        """
+        missing_ids = [chunk for chunk in chunks if not chunk.chunk_hash_id]
+        for chunk in missing_ids:
+            chunk.chunk_hash_id = DataChunk.compute_hash_id(chunk.chunk_asset_id, chunk.chunk_text)
+        if missing_ids:
+            await chunk_model.set_chunk_hash_ids(missing_ids)
+
+        # Identical text within an asset shares an id; embed it once
+        unique = list({chunk.chunk_hash_id: chunk for chunk in chunks}.values())
+        if not check_existing:
+            return unique
+
+        existing = await self.vectordb_client.get_existing_ids(
+            collection_name=collection_name,
+            record_ids=[chunk.chunk_hash_id for chunk in unique],
+        )
+        return [chunk for chunk in unique if chunk.chunk_hash_id not in existing]
+
+    async def delete_vanished_records(
+        self,
+        collection_name: str,
+        project: Project,
+        chunk_model: ChunkModel
+    ) -> int:
+        """Delete vector records whose chunk no longer exists in Mongo."""
+        deleted = 0
+        async for record_ids in self.vectordb_client.iter_record_ids(
+            collection_name=collection_name,
+            batch_size=self.app_settings.INDEXING_UPSERT_BATCH_SIZE,
+        ):
+            alive = await chunk_model.get_existing_hash_ids(
+                project_id=project.id,
+                hash_ids=record_ids,
+            )
+            vanished = [record_id for record_id in record_ids if record_id not in alive]
+            if vanished:
+                await self.vectordb_client.delete_many(
+                    collection_name=collection_name,
+                    record_ids=vanished,
+                )
+                deleted += len(vanished)
+        return deleted
+
+    async def index_into_vector_db(
+        self,
+        project: Project,
+        chunk_model: ChunkModel,
+        do_reset: bool = False
+    ):
+        """
+        Stream the project's chunks from Mongo and push only the changed ones
+        into the vector DB, keyed by their content-hash id.
+
+        Pipeline: the producer reads embedding-sized batches, drops chunks whose
+        id is already indexed and starts embedding the rest right away (at most
+        INDEXING_MAX_CONCURRENT_BATCHES in flight), while the consumer upserts
+        finished batches in order. Records whose chunk vanished are deleted last.
+        Returns: dict with inserted/skipped/deleted counts and elapsed seconds
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        started_at = time.perf_counter()
+
+        await self.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=do_reset,
+        )
+
+        pending: asyncio.Queue = asyncio.Queue(
+            maxsize=self.app_settings.INDEXING_MAX_CONCURRENT_BATCHES
+        )
+        skipped = 0
+
+        async def produce():
+            nonlocal skipped
+            try:
+                async for chunks in chunk_model.iter_project_chunks(
+                    project_id=project.id,
+                    batch_size=self.app_settings.INDEXING_EMBEDDING_BATCH_SIZE,
+                ):
+                    new_chunks = await self.select_new_chunks(
+                        collection_name=collection_name,
+                        chunks=chunks,
+                        chunk_model=chunk_model,
+                        check_existing=not do_reset,
+                    )
+                    skipped += len(chunks) - len(new_chunks)
+                    if new_chunks:
+                        await pending.put(asyncio.create_task(
+                            self.embed_chunks(new_chunks, project_id=project.project_id)
+                        ))
+            finally:
+                await pending.put(None)
+
+        upsert_labels = (project_label(project.project_id), self.app_settings.VECTOR_DB_BACKEND)
+
+        async def consume():
+            inserted = 0
+            while (task := await pending.get()) is not None:
+                chunks, vectors = await task
+                with VECTORDB_UPSERT_SECONDS.labels(*upsert_labels).time():
+                    is_inserted = await self.vectordb_client.insert_many(
+                        collection_name=collection_name,
+                        texts=[chunk.chunk_text for chunk in chunks],
+                        vectors=vectors,
+                        metadatas=[chunk.chunk_metadata for chunk in chunks],
+                        record_ids=[chunk.chunk_hash_id for chunk in chunks],
+                        batch_size=self.app_settings.INDEXING_UPSERT_BATCH_SIZE,
+                    )
+                if not is_inserted:
+                    raise RuntimeError(f"Vector DB rejected a batch for '{collection_name}'.")
+                VECTORDB_UPSERTED_POINTS.labels(*upsert_labels).inc(len(chunks))
+                inserted += len(chunks)
+            return inserted
+
+        producer = asyncio.create_task(produce())
+        try:
+            inserted = await consume()
+            await producer
+        except Exception:
+            producer.cancel()
+            # Drop any embedding still in flight
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+            raise
+
+        deleted = 0
+        if not do_reset:
+            deleted = await self.delete_vanished_records(
+                collection_name=collection_name,
+                project=project,
+                chunk_model=chunk_model,
+            )
+
+        return {
+            "inserted": inserted,
+            "skipped": skipped,
+            "deleted": deleted,
+            "elapsed": time.perf_counter() - started_at,
+        }
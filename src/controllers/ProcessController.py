@@ -1,9 +1,18 @@
 import os
+import time
+import asyncio
+from queue import Empty
+from contextlib import suppress
+import fitz
+from langchain_core.documents import Document
 from langchain_community.document_loaders import TextLoader, PyMuPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from .BaseController import BaseController
 from models.enums import FileTypeEnum
+from helpers.metrics import (
+    project_label, FILE_PAGES_LOADED, FILE_LOAD_SECONDS, FILE_SPLIT_SECONDS, CHUNKS_PRODUCED
+)
 
 class ProcessController(BaseController):
     def __init__(self, project_id: str):
@@ -57,4 +66,210 @@ class ProcessController(BaseController):
             metadatas=file_content_metadata
         )
 
-        return chunks
\ No newline at end of file
+        return chunks
+
+
+    def iter_file_pages(self, file_id: str):
+        """
+        Lazily yield the file one page at a time (PDF) or one block of
+        FILE_DEFAULT_CHUNK_SIZE characters at a time (TXT).
+        """
+        file_ext = self.get_file_extension(file_id)
+        file_path = os.path.join(self.project_path, file_id)
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+
+        if file_ext == FileTypeEnum.TXT.value:
+            with open(file_path, encoding='utf-8') as f:
+                while block := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                    yield Document(page_content=block, metadata={"source": file_path})
+            return
+
+        if file_ext == FileTypeEnum.PDF.value:
+            with fitz.open(file_path) as doc:
+                # Same metadata layout as PyMuPDFLoader
+                doc_metadata = {
+                    k: v for k, v in doc.metadata.items()
+                    if isinstance(v, (str, int))
+                }
+                for page in doc:
+                    yield Document(
+                        page_content=page.get_text(),
+                        metadata={
+                            "source": file_path,
+                            "file_path": file_path,
+                            "page": page.number,
+                            "total_pages": len(doc),
+                            **doc_metadata,
+                        }
+                    )
+            return
+
+        raise ValueError(f"Unsupported file type: {file_ext}")
+
+    def iter_file_chunks(self, file_id: str, chunk_size: int, overlap_size: int, stats: dict = None):
+        """
+        Split pages incrementally. The trailing (possibly incomplete) chunk of
+        each page is carried into the next one, so chunks and their overlap
+        span page boundaries while only one page is held in memory.
+        If given, stats accumulates pages, chunks, load_seconds and split_seconds.
+        Yields: (chunk_text, chunk_metadata)
+        """
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=overlap_size,
+            length_function=len,
+        )
+        stats = stats if stats is not None else {}
+        for key in ("pages", "chunks", "load_seconds", "split_seconds"):
+            stats.setdefault(key, 0)
+
+        pages = self.iter_file_pages(file_id)
+        carry_text, carry_metadata = "", {}
+        while True:
+            started_at = time.perf_counter()
+            page = next(pages, None)
+            split_started_at = time.perf_counter()
+            stats["load_seconds"] += split_started_at - started_at
+            if page is None:
+                break
+            stats["pages"] += 1
+
+            text = carry_text + page.page_content
+            pieces = text_splitter.split_text(text)
+            if not pieces:
+                stats["split_seconds"] += time.perf_counter() - split_started_at
+                continue
+
+            # Each chunk takes the metadata of the page it starts on
+            cursor = 0
+            metadatas = []
+            for piece in pieces:
+                start = text.find(piece, cursor)
+                if start >= 0:
+                    cursor = start
+                metadatas.append(carry_metadata if cursor < len(carry_text) else page.metadata)
+            # Measured before yielding so the consumer's time is not counted
+            stats["split_seconds"] += time.perf_counter() - split_started_at
+            stats["chunks"] += len(pieces) - 1
+
+            for piece, metadata in zip(pieces[:-1], metadatas[:-1]):
+                yield piece, metadata
+
+            carry_text, carry_metadata = pieces[-1], metadatas[-1]
+
+        if carry_text:
+            stats["chunks"] += 1
+            yield carry_text, carry_metadata
+
+    async def stream_chunk_batches(
+        self,
+        executor,
+        manager,
+        file_id: str,
+        chunk_size: int,
+        overlap_size: int,
+        batch_size: int
+    ):
+        """
+        Run stream_file_chunks in the process pool and yield its batches as
+        they arrive. The queue holds at most two batches, so the worker never
+        runs far ahead of the consumer and memory stays flat.
+        Closing the generator early stops the worker after its current batch.
+        """
+        loop = asyncio.get_running_loop()
+        queue = manager.Queue(maxsize=2)
+        stop_event = manager.Event()
+        future = loop.run_in_executor(
+            executor,
+            stream_file_chunks,
+            self.project_id,
+            file_id,
+            chunk_size,
+            overlap_size,
+            batch_size,
+            queue,
+            stop_event,
+        )
+
+        finished = False
+        try:
+            while True:
+                try:
+                    batch = await loop.run_in_executor(None, queue.get, True, 1.0)
+                except Empty:
+                    if future.done():
+                        break
+                    continue
+
+                if batch is None:
+                    finished = True
+                    break
+                yield batch
+        finally:
+            if not finished:
+                # Consumer stopped early: the worker checks the flag before each put,
+                # and emptying the queue releases a put() it may be blocked on
+                stop_event.set()
+                await loop.run_in_executor(None, drain_queue, queue)
+                # Frees the pool slot; the worker parses at most one more page
+                with suppress(Exception):
+                    await future
+
+        stats = await future  # re-raise any error from the worker
+        self.record_chunking_stats(file_id=file_id, stats=stats)
+
+    def record_chunking_stats(self, file_id: str, stats: dict) -> None:
+        project, file_type = project_label(self.project_id), self.get_file_extension(file_id).lstrip(".")
+        FILE_PAGES_LOADED.labels(project, file_type).inc(stats["pages"])
+        FILE_LOAD_SECONDS.labels(project, file_type).observe(stats["load_seconds"])
+        FILE_SPLIT_SECONDS.labels(project, file_type).observe(stats["split_seconds"])
+        CHUNKS_PRODUCED.labels(project, file_type).inc(stats["chunks"])
+
+
+def stream_file_chunks(
+    project_id: str,
+    file_id: str,
+    chunk_size: int,
+    overlap_size: int,
+    batch_size: int,
+    queue,
+    stop_event
+):
+    """
+    Process-pool entry point: split one file page by page in a worker process
+    and push batches of (chunk_text, chunk_metadata) onto the queue.
+    A trailing None marks the end of the stream; stop_event ends it early.
+    Kept at module level so it can be pickled by ProcessPoolExecutor.
+    Returns: the iter_file_chunks stats, recorded by the parent process
+    """
+    process_controller = ProcessController(project_id=project_id)
+    stats = {}
+    batch = []
+    try:
+        for chunk in process_controller.iter_file_chunks(
+            file_id=file_id,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            stats=stats,
+        ):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                if stop_event.is_set():
+                    break
+                queue.put(batch)
+                batch = []
+
+        if batch and not stop_event.is_set():
+            queue.put(batch)
+    finally:
+        queue.put(None)
+    return stats
+
+def drain_queue(queue) -> None:
+    while True:
+        try:
+            queue.get_nowait()
+        except Empty:
+            return
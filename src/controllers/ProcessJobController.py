@@ -0,0 +1,396 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from models import ChunkModel, ProcessJobModel
+from models.db_schemes import Project, DataChunk, ProcessJob, ProcessJobAsset
+from models.enums import ProcessJobStatusEnum, ProcessAssetStatusEnum
+from stores.lexical import BM25Index
+from helpers.metrics import project_label, PROCESS_ASSET_SECONDS
+
+class ProcessJobCancelled(Exception):
+    pass
+
+class ProcessJobController(BaseController):
+    """
+    Runs /process requests as background jobs, so the request returns a job
+    id right away instead of holding the connection for the whole project.
+
+    Jobs wait in a bounded in-process queue and PROCESS_JOB_WORKERS of them
+    run at once; assets of all running jobs share one PROCESS_MAX_CONCURRENT_ASSETS
+    limit, so a burst of jobs can't flood the process pool. State and per-asset
+    progress live in Mongo. A request identical to a queued or running job
+    gets that job back instead of a new one.
+
+    Cancellation is checked between chunk batches; the asset in progress is
+    rolled back so a later run doesn't mistake its partial chunks for a full set.
+    A job running in another process picks up a cancel request at that
+    process's next heartbeat.
+
+    The queue is per API process. Each process stamps its jobs with an owner id
+    and heartbeats them, and every process periodically fails jobs whose owner
+    stopped heartbeating (crashed or killed), freeing their dedupe keys.
+    """
+
+    # How often cancel_project_jobs / cancel_all_jobs re-check jobs of other processes
+    CANCEL_POLL_SECONDS = 0.5
+
+    def __init__(
+        self,
+        db_client,
+        process_pool,
+        process_manager,
+        lexical_index: Optional[BM25Index] = None
+    ):
+        super().__init__()
+
+        self.db_client = db_client
+        self.process_pool = process_pool
+        self.process_manager = process_manager
+        self.lexical_index = lexical_index
+
+        self.job_model = ProcessJobModel(db_client=db_client)
+        self.chunk_model = ChunkModel(db_client=db_client)
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.app_settings.PROCESS_JOB_QUEUE_MAX_SIZE)
+        self.asset_semaphore = asyncio.Semaphore(self.app_settings.PROCESS_MAX_CONCURRENT_ASSETS)
+        self.workers: List[asyncio.Task] = []
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        # Unique per process, also across hosts sharing the Mongo database
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # job id -> (project id, cancel event, done event) for jobs running in this process
+        self.running: Dict[str, Tuple[str, asyncio.Event, asyncio.Event]] = {}
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    async def start(self) -> None:
+        await self.fail_orphaned_jobs()
+        self.workers = [
+            asyncio.create_task(self.work(), name=f"process-job-worker-{i}")
+            for i in range(self.app_settings.PROCESS_JOB_WORKERS)
+        ]
+        self.heartbeat_task = asyncio.create_task(self.heartbeat(), name="process-job-heartbeat")
+
+    async def stop(self) -> None:
+        tasks = [*self.workers, self.heartbeat_task] if self.heartbeat_task else self.workers
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers, self.heartbeat_task = [], None
+
+        # Running jobs failed themselves when cancelled; this closes the ones still queued
+        await self.job_model.fail_owner_jobs(self.owner_id, error="Interrupted by shutdown.")
+
+    async def fail_orphaned_jobs(self) -> None:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.app_settings.PROCESS_JOB_STALE_SECONDS)
+        orphaned = await self.job_model.fail_orphaned_jobs(
+            stale_before=stale_before,
+            error="Interrupted: the process running it stopped.",
+        )
+        if orphaned:
+            self.logger.warning(f"[Jobs] marked {orphaned} orphaned processing jobs as failed")
+
+    async def heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.app_settings.PROCESS_JOB_HEARTBEAT_SECONDS)
+            try:
+                await self.job_model.heartbeat(self.owner_id)
+                await self.sync_cancellations()
+                await self.fail_orphaned_jobs()
+            except Exception as e:
+                # A Mongo hiccup must not stop the heartbeat for good
+                self.logger.error(f"[Jobs] heartbeat failed: {e}")
+
+    async def sync_cancellations(self) -> None:
+        """Stop running jobs cancelled or deleted through another process."""
+        if not self.running:
+            return
+        uncancelled = await self.job_model.get_uncancelled_job_ids([ObjectId(job_id) for job_id in self.running])
+        for job_id, (_, cancel_event, _) in list(self.running.items()):
+            if ObjectId(job_id) not in uncancelled:
+                cancel_event.set()
+
+    def get_job_key(self, project_id: str, params: dict) -> str:
+        payload = json.dumps({"project_id": project_id, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def submit(
+        self,
+        project: Project,
+        params: dict,
+        assets: Dict[ObjectId, str]
+    ) -> Tuple[Optional[ProcessJob], bool]:
+        """
+        Queue a job for the given assets ({asset_id: asset_name}).
+        Returns: (job, created); job is None if the queue is full and no
+        identical job is in flight
+        """
+        job_key = self.get_job_key(project.project_id, params)
+
+        if self.queue.full():
+            return await self.job_model.get_active_job(job_key), False
+
+        job, created = await self.job_model.create_job(ProcessJob(
+            job_project_id=project.id,
+            job_status=ProcessJobStatusEnum.QUEUED.value,
+            job_active_key=job_key,
+            job_params={"project_id": project.project_id, **params},
+            job_assets=[
+                ProcessJobAsset(asset_id=str(asset_id), asset_name=asset_name)
+                for asset_id, asset_name in assets.items()
+            ],
+            job_total_assets=len(assets),
+            job_owner_id=self.owner_id,
+            job_heartbeat_at=datetime.now(timezone.utc),
+        ))
+        if not created:
+            return job, False
+
+        try:
+            self.queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            # Filled up while the job was being inserted
+            await self.job_model.finish_job(job.id, ProcessJobStatusEnum.FAILED.value, error="Job queue is full.")
+            return None, False
+        return job, True
+
+    async def cancel(self, project: Project, job_id: str) -> Optional[ProcessJob]:
+        """Request cancellation; a queued job is dropped when dequeued, a running one stops between batches."""
+        job = await self.job_model.request_cancel(job_project_id=project.id, job_id=job_id)
+        if job is not None and str(job.id) in self.running:
+            self.running[str(job.id)][1].set()
+        return job
+
+    def get_job_status(self, job: ProcessJob) -> dict:
+        """JSON-ready view of a job for the status endpoints."""
+        return {
+            "job_id": str(job.id),
+            "status": job.job_status,
+            "params": {key: value for key, value in job.job_params.items() if key != "project_id"},
+            "total_assets": job.job_total_assets,
+            "finished_assets": job.job_finished_assets,
+            "inserted_chunks": job.job_inserted_chunks,
+            "cancel_requested": job.job_cancel_requested,
+            "error": job.job_error,
+            "created_at": job.job_created_at.isoformat(),
+            "started_at": job.job_started_at.isoformat() if job.job_started_at else None,
+            "finished_at": job.job_finished_at.isoformat() if job.job_finished_at else None,
+            "assets": [asset.model_dump() for asset in job.job_assets],
+        }
+
+    async def cancel_project_jobs(self, project: Project) -> None:
+        """
+        Cancel a project's jobs in every process and wait until none is still
+        running, so nothing writes chunks after the caller deletes them.
+        """
+        await self.job_model.request_cancel_jobs(job_project_id=project.id)
+        await self.wait_for_cancelled(project_id=project.project_id, job_project_id=project.id)
+
+    async def cancel_all_jobs(self) -> None:
+        await self.job_model.request_cancel_jobs()
+        await self.wait_for_cancelled()
+
+    async def wait_for_cancelled(self, project_id: Optional[str] = None, job_project_id: Optional[ObjectId] = None) -> None:
+        done_events = []
+        for job_project, cancel_event, done_event in self.running.values():
+            if project_id is None or job_project == project_id:
+                cancel_event.set()
+                done_events.append(done_event)
+        # A cancelled job stops within one chunk batch (and at most one parsed page)
+        await asyncio.gather(*(done_event.wait() for done_event in done_events))
+
+        # Other processes see the request at their next heartbeat; a dead one goes stale
+        while await self.job_model.has_running_jobs(
+            stale_before=datetime.now(timezone.utc) - timedelta(seconds=self.app_settings.PROCESS_JOB_STALE_SECONDS),
+            job_project_id=job_project_id,
+        ):
+            await asyncio.sleep(self.CANCEL_POLL_SECONDS)
+
+    async def work(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                self.logger.exception(f"[Jobs] job {job_id} crashed: {e}")
+                await self.job_model.finish_job(job_id, ProcessJobStatusEnum.FAILED.value, error=str(e))
+            finally:
+                self.queue.task_done()
+
+    async def run_job(self, job_id: ObjectId) -> None:
+        job = await self.job_model.mark_running(job_id)
+        if job is None:
+            return  # deleted with its project while queued
+
+        if job.job_cancel_requested:
+            await self.job_model.finish_job(job.id, ProcessJobStatusEnum.CANCELLED.value)
+            return
+
+        project_id = job.job_params["project_id"]
+        cancel_event, done_event = asyncio.Event(), asyncio.Event()
+        self.running[str(job.id)] = (project_id, cancel_event, done_event)
+        try:
+            try:
+                inserted = await self.process_assets(job, cancel_event)
+            except asyncio.CancelledError:
+                await self.job_model.finish_job(job.id, ProcessJobStatusEnum.FAILED.value, error="Interrupted by shutdown.")
+                raise
+
+            status = ProcessJobStatusEnum.CANCELLED if cancel_event.is_set() else ProcessJobStatusEnum.COMPLETED
+            await self.job_model.finish_job(job.id, status.value)
+            self.logger.info(f"[Jobs] job {job.id} {status.value}: {inserted} chunks for project {project_id}")
+        finally:
+            # Set once the job's status is final, for cancel_project_jobs / cancel_all_jobs
+            self.running.pop(str(job.id), None)
+            done_event.set()
+
+    async def process_assets(self, job: ProcessJob, cancel_event: asyncio.Event) -> int:
+        params = job.job_params
+        project_id = params["project_id"]
+        project_object_id = job.job_project_id
+        chunk_size = params["chunk_size"]
+        overlap_size = params["overlap_size"]
+        lexical_index = self.lexical_index
+        chunk_model = self.chunk_model
+
+        # Delete all chunks
+        if params["do_reset"] == 1:
+            await chunk_model.delete_chunks_by_project_id(chunk_project_id=project_object_id)
+            self.logger.info(f"Delete all chunks of project_id({project_id})")
+
+        # Chunks always go into the BM25 index too, built or not: add_chunks skips
+        # ids it already has, so a backfill running alongside the job can't miss them
+        if lexical_index is not None and params["do_reset"] == 1:
+            await asyncio.to_thread(lexical_index.reset, project_id)
+
+        async def remove_lexical_asset(asset_id):
+            if lexical_index is not None:
+                await asyncio.to_thread(lexical_index.remove_asset, project_id, str(asset_id))
+
+        async def clear_asset(asset_id):
+            await chunk_model.delete_chunks_for_asset(
+                chunk_project_id=project_object_id,
+                chunk_asset_id=asset_id
+            )
+            await remove_lexical_asset(asset_id)
+
+        process_controller = ProcessController(project_id=project_id)
+
+        async def finish_asset(index: int, started_at: float, status: ProcessAssetStatusEnum, inserted: int = 0, error: str = None) -> None:
+            PROCESS_ASSET_SECONDS.labels(project_label(project_id), status.value).observe(time.perf_counter() - started_at)
+            cancel_requested = await self.job_model.update_asset(
+                job.id, index, status.value, inserted_chunks=inserted, error=error, finished=True
+            )
+            if cancel_requested:
+                # Cancelled through another API process
+                cancel_event.set()
+
+        async def process_asset(index: int, asset: ProcessJobAsset) -> int:
+            async with self.asset_semaphore:
+                asset_id, asset_name = ObjectId(asset.asset_id), asset.asset_name
+                started_at = time.perf_counter()
+                if cancel_event.is_set():
+                    await finish_asset(index, started_at, ProcessAssetStatusEnum.CANCELLED)
+                    return 0
+                await self.job_model.update_asset(job.id, index, ProcessAssetStatusEnum.PROCESSING.value)
+
+                if params["force_reproduce_chunks"]:
+                    await clear_asset(asset_id)
+                    self.logger.info(f"[Force] cleared chunks for {asset_name}")
+                else:
+                    # 1) identical‑param check
+                    same_params = await chunk_model.is_chunks_exist(
+                        chunk_project_id=project_object_id,
+                        chunk_asset_id=asset_id,
+                        chunk_size=chunk_size,
+                        overlap_size=overlap_size,
+                    )
+                    if same_params:
+                        self.logger.info(f"[Skip] identical chunks already exist → {asset_name}")
+                        await finish_asset(index, started_at, ProcessAssetStatusEnum.SKIPPED)
+                        return 0  # nothing to do
+
+                    # 2) different‑param chunks: remove them
+                    removed = await chunk_model.delete_chunks_for_asset(
+                        chunk_project_id=project_object_id,
+                        chunk_asset_id=asset_id
+                    )
+                    await remove_lexical_asset(asset_id)
+                    if removed:
+                        self.logger.info(f"[Update] removed {removed} outdated chunks for {asset_name}")
+
+                # -------- read, chunk (in process pool), insert batch by batch --------
+                inserted = 0
+                try:
+                    # aclosing() unblocks the pool worker right away if an insert fails
+                    async with aclosing(process_controller.stream_chunk_batches(
+                        executor=self.process_pool,
+                        manager=self.process_manager,
+                        file_id=asset_name,
+                        chunk_size=chunk_size,
+                        overlap_size=overlap_size,
+                        batch_size=self.app_settings.PROCESS_CHUNK_BATCH_SIZE,
+                    )) as batches:
+                        async for batch in batches:
+                            if cancel_event.is_set():
+                                raise ProcessJobCancelled()
+                            docs = [
+                                DataChunk(
+                                    chunk_project_id=project_object_id,
+                                    chunk_text=chunk_text,
+                                    chunk_metadata=chunk_metadata,
+                                    chunk_order=inserted + i + 1,
+                                    chunk_asset_id=asset_id,
+                                    chunk_size=chunk_size,
+                                    chunk_overlap_size=overlap_size,
+                                    chunk_hash_id=DataChunk.compute_hash_id(asset_id, chunk_text),
+                                )
+                                for i, (chunk_text, chunk_metadata) in enumerate(batch)
+                            ]
+                            inserted += await chunk_model.insert_many_chunks(docs, batch_size=len(docs))
+                            if lexical_index is not None:
+                                await asyncio.to_thread(
+                                    lexical_index.add_chunks,
+                                    project_id,
+                                    [(doc.chunk_hash_id, str(asset_id), doc.chunk_text) for doc in docs]
+                                )
+                except ProcessJobCancelled:
+                    # Don't leave a partial set of chunks that looks complete
+                    await clear_asset(asset_id)
+                    await finish_asset(index, started_at, ProcessAssetStatusEnum.CANCELLED)
+                    return 0
+                except asyncio.CancelledError:
+                    await clear_asset(asset_id)
+                    raise
+                except Exception as exc:
+                    self.logger.error(f"[Error] failed to process {asset_name}: {exc}")
+                    await clear_asset(asset_id)
+                    await finish_asset(index, started_at, ProcessAssetStatusEnum.FAILED, error=str(exc))
+                    return 0
+
+                if not inserted:
+                    self.logger.warning(f"[Skip] no chunks from {asset_name}")
+                    await finish_asset(index, started_at, ProcessAssetStatusEnum.EMPTY)
+                    return 0
+
+                self.logger.info(f"[Insert] {inserted} chunks stored for {asset_name}")
+                await finish_asset(index, started_at, ProcessAssetStatusEnum.PROCESSED, inserted=inserted)
+                return inserted
+
+        results = await asyncio.gather(*[
+            process_asset(index, asset)
+            for index, asset in enumerate(job.job_assets)
+        ])
+        return sum(results)
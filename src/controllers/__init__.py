@@ -1,3 +1,7 @@
 from .BaseController import BaseController
 from .DataController import DataController
-from .ProcessController import ProcessController
\ No newline at end of file
+from .ProcessController import ProcessController
+from .ContextController import ContextController
+from .ChatSessionController import ChatSessionController
+from .NLPController import NLPController
+from .ProcessJobController import ProcessJobController
\ No newline at end of file
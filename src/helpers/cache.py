@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    In-memory LRU cache with a per-entry time-to-live and hit/miss counters.
+
+    Entries can be grouped by namespace (e.g. a project id). invalidate(namespace)
+    bumps that namespace's generation in O(1): its old entries become
+    unreachable and are later evicted by LRU or TTL. A value computed across
+    an await should be stored with the generation() read before it, so a
+    result that raced an invalidate() is dropped instead of cached.
+    Not thread-safe; use it from the event loop only.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        # Bumped by clear(), so generations read before it never match again
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def _full_key(self, key: Hashable, namespace: Optional[Hashable]):
+        return namespace, self.generation(namespace), key
+
+    def get(self, key: Hashable, namespace: Optional[Hashable] = None) -> Optional[Any]:
+        full_key = self._full_key(key, namespace)
+        entry = self._entries.get(full_key)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[full_key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(full_key)
+        self.hits += 1
+        return entry[1]
+
+    def generation(self, namespace: Optional[Hashable] = None) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(namespace, 0)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        namespace: Optional[Hashable] = None,
+        generation: Optional[Tuple[int, int]] = None
+    ) -> None:
+        if generation is not None and generation != self.generation(namespace):
+            # The namespace was invalidated while the value was being computed
+            return
+
+        full_key = self._full_key(key, namespace)
+        self._entries[full_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(full_key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, namespace: Optional[Hashable] = None) -> Optional[Any]:
+        entry = self._entries.pop(self._full_key(key, namespace), None)
+        return entry[1] if entry is not None else None
+
+    def invalidate(self, namespace: Hashable) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+        self._epoch += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+        }
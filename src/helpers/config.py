@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
 
 class Settings(BaseSettings):
 
@@ -10,8 +11,21 @@ class Settings(BaseSettings):
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
 
+    PROCESS_POOL_MAX_WORKERS: Optional[int] = None     # None -> os.cpu_count()
+    PROCESS_MAX_CONCURRENT_ASSETS: int = 4
+    PROCESS_CHUNK_BATCH_SIZE: int = 100
+    PROCESS_JOB_WORKERS: int = 2                # /process jobs run at once (assets still share the limit above)
+    PROCESS_JOB_QUEUE_MAX_SIZE: int = 100       # queued jobs before /process answers 503
+    PROCESS_JOB_HEARTBEAT_SECONDS: int = 10     # how often a process marks its jobs alive
+    PROCESS_JOB_STALE_SECONDS: int = 60         # jobs without a heartbeat this long are failed
+
     MONGODB_URL: str
     MONGODB_DATABASE: str
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_CONNECT_TIMEOUT_MS: int = 20000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = None     # None -> no timeout
 
     GENERATION_AND_EMBEDDING_BACKEND: List[str]
 
@@ -28,13 +42,102 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
 
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH_NAME: str = "embedding_cache"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1_000_000
+
+    # Coalesce concurrent embed calls into one provider request
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_WINDOW_MS: float = 5
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
 
+    # RAG context packing: token budget for retrieved passages, per generation model id
+    GENERATION_CONTEXT_DEFAULT_TOKEN_BUDGET: int = 2000
+    GENERATION_CONTEXT_TOKEN_BUDGETS: Dict[str, int] = {}
+    GENERATION_CONTEXT_DEDUP_THRESHOLD: float = 0.9     # shingle Jaccard above which a passage is a duplicate
+    GENERATION_CHARS_PER_TOKEN: float = 4.0             # local token estimate, no tokenizer call
+
+    # Chat sessions: history sent per turn is trimmed to this budget (summary included)
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1000
+    CHAT_HOT_TAIL_MESSAGES: int = 40                    # newest messages cached per session
+    CHAT_HOT_TAIL_CACHE_MAX_SIZE: int = 10000           # sessions
+    CHAT_HOT_TAIL_CACHE_TTL_SECONDS: int = 1800
+    CHAT_SUMMARY_ENABLED: bool = True                   # fold trimmed messages into a rolling summary
+    CHAT_SUMMARY_MAX_TOKENS: int = 200
+
+    # Shared keep-alive pool, timeouts and retries for the async LLM clients
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5
+    LLM_READ_TIMEOUT_SECONDS: float = 60
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8
+    LLM_BULK_MAX_RETRIES: int = 8                       # indexing waits out rate limits instead of failing
+
+    # Per-client scheduler: rate limits (None -> unlimited) and AIMD concurrency bounds
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: Optional[int] = None
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None
+    LLM_INITIAL_CONCURRENCY: int = 4
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_RATE_LIMIT_COOLDOWN_SECONDS: float = 1.0        # pause after a 429 without Retry-After
+
+    # OFFLINE backend: local hash-seeded embeddings and echo generation, for benchmarks
+    OFFLINE_LLM_SEED: int = 0
+    OFFLINE_LLM_LATENCY_MS: float = 0                   # per call
+    OFFLINE_LLM_TOKEN_LATENCY_MS: float = 0             # per generated word
+    OFFLINE_LLM_ERROR_RATE: float = 0.0                 # share of calls that fail
+    OFFLINE_LLM_ERROR_STATUS_CODE: int = 503            # 429 exercises the rate-limit path
+
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH_NAME: str
     VECTOR_DB_DIATANCE_METHOD: str = None
+    VECTOR_DB_EXECUTOR_WORKERS: int = 1     # embedded Qdrant is not thread-safe
+    VECTOR_DB_URL: Optional[str] = None     # None -> embedded mode at VECTOR_DB_PATH_NAME
+    VECTOR_DB_UPSERT_BATCH_SIZE: int = 256
+    VECTOR_DB_UPSERT_PARALLEL: int = 1
+
+    # Collection layout (None -> Qdrant defaults); only applies in server mode
+    VECTOR_DB_HNSW_M: Optional[int] = None
+    VECTOR_DB_HNSW_EF_CONSTRUCT: Optional[int] = None
+    VECTOR_DB_SEARCH_HNSW_EF: Optional[int] = None
+    VECTOR_DB_QUANTIZATION: Optional[str] = None    # "scalar" | "binary"
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_QUANTIZATION_RESCORE: bool = True
+    VECTOR_DB_QUANTIZATION_OVERSAMPLING: Optional[float] = None
+    VECTOR_DB_VECTORS_ON_DISK: bool = False
+    VECTOR_DB_PAYLOAD_ON_DISK: bool = False
+
+    # NUMPY backend
+    VECTOR_DB_NUMPY_DTYPE: str = "float32"          # "float32" | "float16"
+    VECTOR_DB_NUMPY_COMPACTION_RATIO: float = 0.3   # share of tombstoned rows that triggers a rewrite
+
+    INDEXING_EMBEDDING_BATCH_SIZE: int = 96
+    INDEXING_MAX_CONCURRENT_BATCHES: int = 4
+    INDEXING_UPSERT_BATCH_SIZE: int = 256
+
+    SEARCH_QUERY_CACHE_MAX_SIZE: int = 10000
+    SEARCH_QUERY_CACHE_TTL_SECONDS: int = 3600
+    SEARCH_RESULT_CACHE_MAX_SIZE: int = 10000
+    SEARCH_RESULT_CACHE_TTL_SECONDS: int = 300
+    SEARCH_BATCH_MAX_QUERIES: int = 256
+    SEARCH_HYBRID_CANDIDATES: int = 50      # per-retriever depth fused by reciprocal rank
+    SEARCH_HYBRID_RRF_K: int = 60
+
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_PATH_NAME: str = "lexical_index"
+    LEXICAL_BM25_K1: float = 1.2
+    LEXICAL_BM25_B: float = 0.75
+
+    # /metrics: label per-stage metrics by project (off caps cardinality for many projects)
+    METRICS_PROJECT_LABELS: bool = True
 
     PRIMARY_LANG: str
     DEFAULT_LANG: str
@@ -44,5 +147,7 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding='utf-8')
 
 # Skelton
+# Cached: .env is read once per process instead of on every call/Depends
+@lru_cache
 def get_settings():
     return Settings()
\ No newline at end of file
@@ -0,0 +1,32 @@
+from collections import deque
+from typing import Dict, Union
+
+class LatencyTracker:
+    """
+    Keeps the last max_samples durations (seconds) and reports count and
+    mean/p50/p95/p99 in milliseconds. Not thread-safe; use it from the event loop.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        if not self.samples:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "mean_ms": round(1000 * sum(self.samples) / len(self.samples), 2),
+            "p50_ms": round(1000 * self.percentile(0.50), 2),
+            "p95_ms": round(1000 * self.percentile(0.95), 2),
+            "p99_ms": round(1000 * self.percentile(0.99), 2),
+        }
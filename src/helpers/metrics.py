@@ -0,0 +1,132 @@
+import os
+from typing import Iterator
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+from .config import get_settings
+
+# Per-stage metrics for /metrics, declared with prometheus_client.
+#
+# With several uvicorn workers, export PROMETHEUS_MULTIPROC_DIR (an empty,
+# writable directory, wiped before each start) so every worker writes its
+# samples there and /metrics serves the sum, whichever worker answers.
+# Only counters and histograms are declared here, since both merge across
+# processes without a multiprocess_mode. Process-local state (caches, LLM
+# schedulers) is read at scrape time by RuntimeMetricsCollector.
+
+# Seconds; covers a cached lookup (~1 ms) up to parsing a large PDF
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+def project_label(project_id: str) -> str:
+    # With METRICS_PROJECT_LABELS off every project shares one label value, capping cardinality
+    return project_id if get_settings().METRICS_PROJECT_LABELS else "all"
+
+def get_stage_registry() -> CollectorRegistry:
+    """The registry holding the per-stage metrics, merged across workers in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+class RuntimeMetricsCollector:
+    """
+    Cache and LLM scheduler state, read from the app on every scrape.
+    These live in process memory, so with several workers they describe
+    the worker that answered the scrape.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def collect(self) -> Iterator[Metric]:
+        app = self.app
+        caches = {
+            "query_embedding": app.query_embedding_cache.stats(),
+            "search_result": app.search_result_cache.stats(),
+            "chat_session": app.chat_session_cache.stats(),
+        }
+        if app.embedding_cache is not None:
+            stats = app.embedding_cache.stats()
+            caches["embedding"] = {**stats, "size": stats["entries"]}
+
+        # The caches keep their own hit/miss counts; mirror them as counters
+        hits = CounterMetricFamily("rag_cache_hits", "Cache hits since start.", labels=["cache"])
+        misses = CounterMetricFamily("rag_cache_misses", "Cache misses since start.", labels=["cache"])
+        size = GaugeMetricFamily("rag_cache_entries", "Entries currently cached.", labels=["cache"])
+        for name, stats in caches.items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+        yield from (hits, misses, size)
+
+        concurrency_limit = GaugeMetricFamily(
+            "rag_llm_scheduler_concurrency_limit", "Current AIMD concurrency limit.", labels=["client"])
+        in_flight = GaugeMetricFamily("rag_llm_scheduler_in_flight", "Provider calls in flight.", labels=["client"])
+        queued = GaugeMetricFamily("rag_llm_scheduler_queued", "Calls waiting for admission.", labels=["client", "priority"])
+        for name, client in (("generation", app.generation_client), ("embedding", app.embedding_client)):
+            scheduler = getattr(client, "scheduler", None)
+            if scheduler is None:
+                continue
+            stats = scheduler.stats()
+            concurrency_limit.add_metric([name], stats["concurrency_limit"])
+            in_flight.add_metric([name], stats["in_flight"])
+            for priority, count in stats["queued"].items():
+                queued.add_metric([name, str(priority)], count)
+        yield from (concurrency_limit, in_flight, queued)
+
+# ---- Ingestion (labels: project, file type) ----
+FILE_HASHED_BYTES = Counter(
+    "rag_file_hashed_bytes_total", "Bytes written to disk and hashed on upload.", ["project"])
+FILE_SAVE_SECONDS = Histogram(
+    "rag_file_save_seconds", "Time to write and hash one upload.", ["project"], buckets=LATENCY_BUCKETS)
+FILE_PAGES_LOADED = Counter(
+    "rag_file_pages_loaded_total", "Pages (PDF) or text blocks (TXT) read from disk.", ["project", "file_type"])
+FILE_LOAD_SECONDS = Histogram(
+    "rag_file_load_seconds", "Time spent reading and parsing one file's pages.", ["project", "file_type"], buckets=LATENCY_BUCKETS)
+FILE_SPLIT_SECONDS = Histogram(
+    "rag_file_split_seconds", "Time spent splitting one file into chunks.", ["project", "file_type"], buckets=LATENCY_BUCKETS)
+CHUNKS_PRODUCED = Counter(
+    "rag_chunks_produced_total", "Chunks produced by the splitter.", ["project", "file_type"])
+PROCESS_ASSET_SECONDS = Histogram(
+    "rag_process_asset_seconds", "End-to-end time to process one asset.", ["project", "outcome"], buckets=LATENCY_BUCKETS)
+
+# ---- MongoDB (labels: collection) ----
+MONGO_BULK_WRITE_SECONDS = Histogram(
+    "rag_mongo_bulk_write_seconds", "Latency of one bulk_write.", ["collection"], buckets=LATENCY_BUCKETS)
+MONGO_DOCUMENTS_WRITTEN = Counter(
+    "rag_mongo_documents_written_total", "Documents inserted through bulk_write.", ["collection"])
+
+# ---- Embedding, vector DB and lexical search (labels: project, backend) ----
+EMBEDDING_SECONDS = Histogram(
+    "rag_embedding_seconds", "Time to embed one request's texts, cache and batching included.", ["project", "backend", "document_type"], buckets=LATENCY_BUCKETS)
+EMBEDDING_TEXTS = Counter(
+    "rag_embedding_texts_total", "Texts sent for embedding.", ["project", "backend", "document_type"])
+VECTORDB_UPSERT_SECONDS = Histogram(
+    "rag_vectordb_upsert_seconds", "Latency of one vector DB upsert batch.", ["project", "backend"], buckets=LATENCY_BUCKETS)
+VECTORDB_UPSERTED_POINTS = Counter(
+    "rag_vectordb_upserted_points_total", "Points upserted into the vector DB.", ["project", "backend"])
+VECTORDB_SEARCH_SECONDS = Histogram(
+    "rag_vectordb_search_seconds", "Latency of one vector DB search request.", ["project", "backend", "operation"], buckets=LATENCY_BUCKETS)
+LEXICAL_SEARCH_SECONDS = Histogram(
+    "rag_lexical_search_seconds", "Latency of one BM25 search.", ["project"], buckets=LATENCY_BUCKETS)
+GENERATION_TTFT_SECONDS = Histogram(
+    "rag_generation_time_to_first_token_seconds", "Time from request to the first streamed answer token.", ["project", "backend"], buckets=LATENCY_BUCKETS)
+GENERATION_SECONDS = Histogram(
+    "rag_generation_seconds", "Time to stream a whole answer.", ["project", "backend"], buckets=LATENCY_BUCKETS)
+
+# ---- LLM provider calls, after caching and batching (labels: backend, operation) ----
+LLM_REQUEST_SECONDS = Histogram(
+    "rag_llm_request_seconds", "Latency of one provider call, retries included.", ["backend", "operation"], buckets=LATENCY_BUCKETS)
+LLM_REQUEST_FAILURES = Counter(
+    "rag_llm_request_failures_total", "Provider calls that failed after retries.", ["backend", "operation"])
+LLM_EMBEDDING_BATCH_SIZE = Histogram(
+    "rag_llm_embedding_batch_size", "Texts per embedding request sent to the provider.", ["backend", "document_type"], buckets=SIZE_BUCKETS)
+
+# ---- Embedding batcher, before caching (labels: document_type) ----
+EMBEDDING_BATCHER_BATCH_SIZE = Histogram(
+    "rag_embedding_batcher_batch_size", "Unique texts per batch the embedding batcher sends on.", ["document_type"], buckets=SIZE_BUCKETS)
+EMBEDDING_BATCHER_CALLERS = Histogram(
+    "rag_embedding_batcher_callers_per_batch", "embed_text calls merged into one batch.", ["document_type"], buckets=SIZE_BUCKETS)
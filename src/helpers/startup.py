@@ -0,0 +1,27 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+class StartupTimer:
+    """Collects wall-clock durations of the import and lifespan startup phases."""
+
+    def __init__(self, started_at: float = None):
+        self.started_at = started_at or time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self) -> Dict[str, float]:
+        """Phase durations in milliseconds, plus the total since started_at."""
+        report = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        report["total"] = round((time.perf_counter() - self.started_at) * 1000, 2)
+        return report
@@ -1,11 +1,29 @@
+import time
+_import_started_at = time.perf_counter()
+
+import os
+import logging
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
 
-from routes import base, data, nlp
+from routes import base, data, nlp, metrics
 from helpers.config import get_settings
 from stores.vectordb import VectorDBFactory
-from stores.llm import LLMProviderFactory
+from stores.llm import LLMProviderFactory, AsyncCachedEmbeddingProvider, AsyncBatchingEmbeddingProvider
+from stores.llm.templates import TemplateParser
+from stores.lexical import BM25Index
+from models import ProjectModel, AssetModel, ChunkModel, ChatSessionModel, ChatMessageModel, ProcessJobModel
+from controllers import ProcessJobController
+from helpers.startup import StartupTimer
+from helpers.cache import TTLCache
+
+logger = logging.getLogger('uvicorn.error')
+
+startup_timer = StartupTimer(started_at=_import_started_at)
+startup_timer.record("imports", time.perf_counter() - _import_started_at)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -13,43 +31,151 @@ async def lifespan(app: FastAPI):
     FastAPI lifespan context manager to initialize and clean up resources.
 
     This function is automatically triggered at startup and shutdown:
-    - Initializes MongoDB connection.
+    - Initializes the shared MongoDB connection pool and bootstraps indexes.
+    - Starts the process pool used for parsing and chunking files.
     - Connects to the vector database (e.g., Qdrant).
-    - Configures the LLM generation and embedding providers.
+    - Opens the local BM25 lexical index.
+    - Starts the background workers that run /process jobs.
+    - Configures the async LLM generation and embedding providers on a shared HTTP pool,
+      with embedding calls cached and coalesced into batches.
+    - Logs how long imports and each startup phase took.
     - Closes resources on app shutdown.
     """
     # Load app settings
-    settings = get_settings()
+    with startup_timer.phase("settings"):
+        settings = get_settings()
 
     # ------------------ Startup ------------------ #
-    # MongoDB connection
-    app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
-    app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
+    # MongoDB connection (one pool for the whole process, shared by every model)
+    with startup_timer.phase("mongodb"):
+        app.mongo_conn = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=settings.MONGODB_SOCKET_TIMEOUT_MS,
+        )
+        app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
+
+        # Create collection indexes once instead of checking on every request
+        for model in (ProjectModel, AssetModel, ChunkModel, ChatSessionModel, ChatMessageModel, ProcessJobModel):
+            await model(db_client=app.db_client).init_collection()
+
+    # Process pool for CPU-bound parsing/chunking (keeps the event loop free)
+    with startup_timer.phase("process_pool"):
+        app.process_pool = ProcessPoolExecutor(max_workers=settings.PROCESS_POOL_MAX_WORKERS)
+        # Shared queues that stream chunk batches back from the pool workers
+        app.process_manager = Manager()
 
     # Vector database connection
-    vectordb_factory = VectorDBFactory(config=settings)
-    app.vectordb_client = vectordb_factory.create(provider=settings.VECTOR_DB_BACKEND)
-    app.vectordb_client.connect()
+    with startup_timer.phase("vectordb"):
+        vectordb_factory = VectorDBFactory(config=settings)
+        # Async wrapper: vector I/O runs on its own executor, never on the loop
+        app.vectordb_client = vectordb_factory.create_async(provider=settings.VECTOR_DB_BACKEND)
+        await app.vectordb_client.connect()
+
+    # Local BM25 index per project (lexical search without an embedding call)
+    with startup_timer.phase("lexical_index"):
+        app.lexical_index = None
+        if settings.LEXICAL_INDEX_ENABLED:
+            app.lexical_index = BM25Index(
+                db_path=vectordb_factory.get_database_dir(db_name=settings.LEXICAL_INDEX_PATH_NAME),
+                k1=settings.LEXICAL_BM25_K1,
+                b=settings.LEXICAL_BM25_B,
+            )
+
+    # Background /process jobs on a bounded worker pool
+    with startup_timer.phase("process_jobs"):
+        app.process_jobs = ProcessJobController(
+            db_client=app.db_client,
+            process_pool=app.process_pool,
+            process_manager=app.process_manager,
+            lexical_index=app.lexical_index,
+        )
+        await app.process_jobs.start()
 
     # Language  provider setup
-    llm_factory = LLMProviderFactory(config=settings)
+    with startup_timer.phase("llm_providers"):
+        llm_factory = LLMProviderFactory(config=settings)
+
+        # One keep-alive HTTP pool shared by the async generation and embedding clients
+        app.llm_http_client = llm_factory.create_http_client()
 
-    # Generation model
-    app.generation_client = llm_factory.create(provider=settings.GENERATION_BACKEND)
-    app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+        # Generation model
+        app.generation_client = llm_factory.create_async(
+            provider=settings.GENERATION_BACKEND,
+            http_client=app.llm_http_client,
+            name="generation",
+        )
+        app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
 
-    # Embedding model
-    app.embedding_client = llm_factory.create(provider=settings.EMBEDDING_BACKEND)
-    app.embedding_client.set_embedding_model(
-        model_id=settings.EMBEDDING_MODEL_ID,
-        embedding_size=settings.EMBEDDING_MODEL_SIZE,
+        # Embedding model (behind a persistent cache so only misses hit the API)
+        app.embedding_client = llm_factory.create_async(
+            provider=settings.EMBEDDING_BACKEND,
+            http_client=app.llm_http_client,
+            name="embedding",
+        )
+        app.embedding_cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cache_dir = vectordb_factory.get_database_dir(db_name=settings.EMBEDDING_CACHE_PATH_NAME)
+            app.embedding_cache = AsyncCachedEmbeddingProvider(
+                provider=app.embedding_client,
+                provider_name=settings.EMBEDDING_BACKEND,
+                db_path=os.path.join(cache_dir, "embeddings.sqlite3"),
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+            app.embedding_client = app.embedding_cache
+        # Concurrent queries share one cache lookup and one provider request
+        if settings.EMBEDDING_BATCH_ENABLED:
+            app.embedding_client = AsyncBatchingEmbeddingProvider(
+                provider=app.embedding_client,
+                window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+                max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            )
+        app.embedding_client.set_embedding_model(
+            model_id=settings.EMBEDDING_MODEL_ID,
+            embedding_size=settings.EMBEDDING_MODEL_SIZE,
+        )
+
+    # Search caches: query embeddings (project-independent) and per-project top-k
+    app.query_embedding_cache = TTLCache(
+        max_size=settings.SEARCH_QUERY_CACHE_MAX_SIZE,
+        ttl_seconds=settings.SEARCH_QUERY_CACHE_TTL_SECONDS,
+    )
+    app.search_result_cache = TTLCache(
+        max_size=settings.SEARCH_RESULT_CACHE_MAX_SIZE,
+        ttl_seconds=settings.SEARCH_RESULT_CACHE_TTL_SECONDS,
+    )
+
+    # Hot tail (newest messages + summary) of recently active chat sessions
+    app.chat_session_cache = TTLCache(
+        max_size=settings.CHAT_HOT_TAIL_CACHE_MAX_SIZE,
+        ttl_seconds=settings.CHAT_HOT_TAIL_CACHE_TTL_SECONDS,
     )
+
+    app.template_parser = TemplateParser(
+        language=settings.PRIMARY_LANG,
+        default_language=settings.DEFAULT_LANG,
+    )
+
+    app.startup_report = startup_timer.report()
+    logger.info(f"Startup timings (ms): {app.startup_report}")
     
     yield  # App runs here
 
     # ------------------ Shutdown ------------------ #
+    # Stop jobs first: they still need Mongo and the process pool to roll back
+    await app.process_jobs.stop()
     app.mongo_conn.close()
-    app.vectordb_client.disconnect()
+    app.process_pool.shutdown(wait=True, cancel_futures=True)
+    app.process_manager.shutdown()
+    await app.vectordb_client.disconnect()
+    if app.lexical_index is not None:
+        app.lexical_index.close()
+    if app.embedding_cache is not None:
+        app.embedding_cache.close()
+    await app.llm_http_client.aclose()
 
 
 # Initialize FastAPI app with lifespan handler
@@ -58,4 +184,5 @@ app = FastAPI(lifespan=lifespan)
 # Register all route modules
 app.include_router(base.base_router)
 app.include_router(data.data_router)
-app.include_router(nlp.nlp_router)
\ No newline at end of file
+app.include_router(nlp.nlp_router)
+app.include_router(metrics.metrics_router)
\ No newline at end of file
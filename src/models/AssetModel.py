@@ -14,22 +14,18 @@ class AssetModel(BaseDataModel):
 
     @classmethod
     async def create_instance(cls, db_client: AsyncIOMotorDatabase):
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
 
     async def init_collection(self):
-        # Make sure that collection was not created yet
-        # all_collection = value when one insertion happen 
-        all_collection = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_ASSET_NAME.value not in all_collection:
-            indexes = Asset.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"],
-                )
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = Asset.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
 
     async def create_asset(self, asset: Asset):
         result = await self.collection.insert_one(asset.model_dump(by_alias=True, exclude_unset=True))
@@ -0,0 +1,81 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from pymongo import DESCENDING
+from typing import List, Optional, Union
+
+from .BaseDataModel import BaseDataModel
+from .enums import DataBaseEnum
+from .db_schemes import ChatMessage
+
+class ChatMessageModel(BaseDataModel):
+    def __init__(self, db_client: AsyncIOMotorDatabase):
+        super().__init__(db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_CHAT_MESSAGE_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase):
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
+
+    async def init_collection(self):
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = ChatMessage.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
+
+    async def insert_messages(self, messages: List[ChatMessage]) -> List[ChatMessage]:
+        if not messages:
+            return messages
+
+        result = await self.collection.insert_many(
+            [message.model_dump(by_alias=True, exclude_unset=True) for message in messages],
+            ordered=True,
+        )
+        for message, inserted_id in zip(messages, result.inserted_ids):
+            message.id = inserted_id
+        return messages
+
+    async def get_recent_messages(
+        self,
+        message_project_id: Union[str, ObjectId],
+        message_session_id: str,
+        limit: int,
+        after_id: Optional[ObjectId] = None
+    ) -> List[ChatMessage]:
+        """
+        Return the newest `limit` messages of a session (oldest first),
+        skipping those up to after_id (already folded into the summary).
+        """
+        message_project_id = ObjectId(message_project_id) if isinstance(message_project_id, str) else message_project_id
+        search_dict = {
+            "message_project_id": message_project_id,
+            "message_session_id": message_session_id,
+        }
+        if after_id is not None:
+            search_dict["_id"] = {"$gt": after_id}
+
+        # Newest first on the tail index, so the read is bounded by limit, not session length
+        cursor = self.collection.find(search_dict).sort("_id", DESCENDING).limit(limit)
+        records = [ChatMessage(**record) async for record in cursor]
+        records.reverse()
+        return records
+
+    async def delete_session_messages(self, message_project_id: Union[str, ObjectId], message_session_id: str) -> int:
+        message_project_id = ObjectId(message_project_id) if isinstance(message_project_id, str) else message_project_id
+        result = await self.collection.delete_many({
+            "message_project_id": message_project_id,
+            "message_session_id": message_session_id,
+        })
+        return result.deleted_count
+
+    async def delete_messages_by_project_id(self, message_project_id: Union[str, ObjectId]) -> int:
+        message_project_id = ObjectId(message_project_id) if isinstance(message_project_id, str) else message_project_id
+        result = await self.collection.delete_many({"message_project_id": message_project_id})
+        return result.deleted_count
+
+    async def drop_messages_collection(self):
+        await self.collection.drop()
@@ -0,0 +1,82 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from pymongo import ReturnDocument
+from typing import Optional, Union
+
+from .BaseDataModel import BaseDataModel
+from .enums import DataBaseEnum
+from .db_schemes import ChatSession
+
+class ChatSessionModel(BaseDataModel):
+    def __init__(self, db_client: AsyncIOMotorDatabase):
+        super().__init__(db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_CHAT_SESSION_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase):
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
+
+    async def init_collection(self):
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = ChatSession.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
+
+    async def get_or_create_session(self, session_project_id: Union[str, ObjectId], session_id: str) -> ChatSession:
+        session_project_id = ObjectId(session_project_id) if isinstance(session_project_id, str) else session_project_id
+        session = ChatSession(session_project_id=session_project_id, session_id=session_id)
+
+        # One round trip, and safe when two requests open the same session at once
+        record = await self.collection.find_one_and_update(
+            {"session_project_id": session_project_id, "session_id": session_id},
+            {"$setOnInsert": session.model_dump(by_alias=True, exclude_none=True)},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return ChatSession(**record)
+
+    async def update_summary(
+        self,
+        session_project_id: Union[str, ObjectId],
+        session_id: str,
+        summary: str,
+        summarized_until: ObjectId,
+        previous_until: Optional[ObjectId] = None
+    ) -> bool:
+        """
+        Store a new rolling summary. The update only applies if no other
+        worker advanced the summary since previous_until was read.
+        """
+        session_project_id = ObjectId(session_project_id) if isinstance(session_project_id, str) else session_project_id
+        result = await self.collection.update_one(
+            {
+                "session_project_id": session_project_id,
+                "session_id": session_id,
+                "session_summarized_until": previous_until,
+            },
+            {"$set": {
+                "session_summary": summary,
+                "session_summarized_until": summarized_until,
+            }},
+        )
+        return result.modified_count > 0
+
+    async def delete_session(self, session_project_id: Union[str, ObjectId], session_id: str) -> int:
+        session_project_id = ObjectId(session_project_id) if isinstance(session_project_id, str) else session_project_id
+        result = await self.collection.delete_one(
+            {"session_project_id": session_project_id, "session_id": session_id}
+        )
+        return result.deleted_count
+
+    async def delete_sessions_by_project_id(self, session_project_id: Union[str, ObjectId]) -> int:
+        session_project_id = ObjectId(session_project_id) if isinstance(session_project_id, str) else session_project_id
+        result = await self.collection.delete_many({"session_project_id": session_project_id})
+        return result.deleted_count
+
+    async def drop_sessions_collection(self):
+        await self.collection.drop()
@@ -1,12 +1,13 @@
 from math import ceil
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
-from pymongo import InsertOne
-from typing import List, Union
+from pymongo import InsertOne, UpdateOne, ASCENDING
+from typing import List, Union, Set
 
 from .BaseDataModel import BaseDataModel
 from .enums import DataBaseEnum
 from .db_schemes import DataChunk
+from helpers.metrics import MONGO_BULK_WRITE_SECONDS, MONGO_DOCUMENTS_WRITTEN
 
 class ChunkModel(BaseDataModel):
     def __init__(self, db_client: AsyncIOMotorDatabase):
@@ -15,22 +16,18 @@ class ChunkModel(BaseDataModel):
 
     @classmethod
     async def create_instance(cls, db_client: AsyncIOMotorDatabase):
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
 
     async def init_collection(self):
-        # Make sure that collection was not created yet
-        # all_collection = value when one insertion happen 
-        all_collection = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_CHUNK_NAME.value not in all_collection:
-            indexes = DataChunk.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"],
-                )
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = DataChunk.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
 
     async def create_chunk(self, chunk: DataChunk):
         result = await self.collection.insert_one(chunk.model_dump(by_alias=True, exclude_unset=True))
@@ -56,9 +53,11 @@ class ChunkModel(BaseDataModel):
                 for chunk in batch
             ]
             
-            result = await self.collection.bulk_write(operations)
+            with MONGO_BULK_WRITE_SECONDS.labels(DataBaseEnum.COLLECTION_CHUNK_NAME.value).time():
+                result = await self.collection.bulk_write(operations)
             if not result.acknowledged:
                 raise Exception("Bulk insert not acknowledged by MongoDB")
+            MONGO_DOCUMENTS_WRITTEN.labels(DataBaseEnum.COLLECTION_CHUNK_NAME.value).inc(len(operations))
         return len(chunks)
             
     # This called pagination to avoid the overload
@@ -77,6 +76,66 @@ class ChunkModel(BaseDataModel):
         )
         return [DataChunk(**doc) async for doc in cursor]
 
+    async def iter_project_chunks(
+        self,
+        project_id: Union[str, ObjectId],
+        batch_size: int = 100
+    ):
+        """Stream a project's chunks in batches with one cursor (no skip/limit)."""
+        chunk_project_id = ObjectId(project_id) if isinstance(project_id, str) else project_id
+        cursor = (
+            self.collection
+            .find({"chunk_project_id": chunk_project_id})
+            .sort("_id", ASCENDING)
+            .batch_size(batch_size)
+        )
+
+        batch = []
+        async for doc in cursor:
+            batch.append(DataChunk(**doc))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    async def get_existing_hash_ids(
+        self,
+        project_id: Union[str, ObjectId],
+        hash_ids: List[str]
+    ) -> Set[str]:
+        """Return which of the given chunk_hash_ids still exist in the project."""
+        chunk_project_id = ObjectId(project_id) if isinstance(project_id, str) else project_id
+        cursor = self.collection.find(
+            {"chunk_project_id": chunk_project_id, "chunk_hash_id": {"$in": hash_ids}},
+            projection={"_id": 0, "chunk_hash_id": 1},
+        )
+        return {doc["chunk_hash_id"] async for doc in cursor}
+
+    async def get_chunks_by_hash_ids(
+        self,
+        project_id: Union[str, ObjectId],
+        hash_ids: List[str]
+    ) -> List[DataChunk]:
+        """Fetch a project's chunks by chunk_hash_id (e.g. to map search hits back to chunk_order)."""
+        chunk_project_id = ObjectId(project_id) if isinstance(project_id, str) else project_id
+        cursor = self.collection.find(
+            {"chunk_project_id": chunk_project_id, "chunk_hash_id": {"$in": hash_ids}}
+        )
+        return [DataChunk(**doc) async for doc in cursor]
+
+    async def set_chunk_hash_ids(self, chunks: List[DataChunk]) -> int:
+        """Backfill chunk_hash_id on chunks stored before it existed."""
+        operations = [
+            UpdateOne({"_id": chunk.id}, {"$set": {"chunk_hash_id": chunk.chunk_hash_id}})
+            for chunk in chunks
+        ]
+        if not operations:
+            return 0
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
     async def get_total_pages(
         self,
         project_id: Union[str, ObjectId],
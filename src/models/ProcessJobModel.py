@@ -0,0 +1,214 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timezone
+from typing import Optional, Union, Tuple, List, Set
+
+from .BaseDataModel import BaseDataModel
+from .enums import DataBaseEnum, ProcessJobStatusEnum
+from .db_schemes import ProcessJob
+
+ACTIVE_STATUSES = [ProcessJobStatusEnum.QUEUED.value, ProcessJobStatusEnum.RUNNING.value]
+
+class ProcessJobModel(BaseDataModel):
+    def __init__(self, db_client: AsyncIOMotorDatabase):
+        super().__init__(db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_PROCESS_JOB_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase):
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
+
+    async def init_collection(self):
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = ProcessJob.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+                sparse=index.get("sparse", False),
+            )
+
+    async def create_job(self, job: ProcessJob) -> Tuple[ProcessJob, bool]:
+        """
+        Insert a job unless an identical one is still queued or running.
+        Returns: (job, created); created is False when the in-flight job is returned
+        """
+        # exclude_none: a null job_active_key would still be indexed
+        document = job.model_dump(by_alias=True, exclude_none=True)
+        while True:
+            try:
+                result = await self.collection.insert_one(document)
+                job.id = result.inserted_id
+                return job, True
+            except DuplicateKeyError:
+                existing = await self.get_active_job(job.job_active_key)
+                if existing is not None:
+                    return existing, False
+                # The other job finished in between; its key is free again
+                document.pop("_id", None)
+
+    async def get_active_job(self, job_active_key: str) -> Optional[ProcessJob]:
+        record = await self.collection.find_one({"job_active_key": job_active_key})
+        return ProcessJob(**record) if record is not None else None
+
+    async def get_job(self, job_project_id: Union[str, ObjectId], job_id: Union[str, ObjectId]) -> Optional[ProcessJob]:
+        job_project_id = ObjectId(job_project_id) if isinstance(job_project_id, str) else job_project_id
+        try:
+            job_id = ObjectId(job_id) if isinstance(job_id, str) else job_id
+        except InvalidId:
+            return None
+
+        record = await self.collection.find_one({"_id": job_id, "job_project_id": job_project_id})
+        return ProcessJob(**record) if record is not None else None
+
+    async def mark_running(self, job_id: ObjectId) -> Optional[ProcessJob]:
+        """Move a queued job to running; None if it is no longer queued."""
+        record = await self.collection.find_one_and_update(
+            {"_id": job_id, "job_status": ProcessJobStatusEnum.QUEUED.value},
+            {"$set": {
+                "job_status": ProcessJobStatusEnum.RUNNING.value,
+                "job_started_at": datetime.now(timezone.utc),
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+        return ProcessJob(**record) if record is not None else None
+
+    async def update_asset(
+        self,
+        job_id: ObjectId,
+        asset_index: int,
+        status: str,
+        inserted_chunks: int = 0,
+        error: Optional[str] = None,
+        finished: bool = False
+    ) -> bool:
+        """
+        Record one asset's progress; finished also counts it towards the job.
+        Returns: whether the job should stop, i.e. cancellation was requested
+        (by any process) or the job was deleted with its project
+        """
+        update = {"$set": {
+            f"job_assets.{asset_index}.status": status,
+            f"job_assets.{asset_index}.inserted_chunks": inserted_chunks,
+            f"job_assets.{asset_index}.error": error,
+        }}
+        if finished:
+            update["$inc"] = {"job_finished_assets": 1, "job_inserted_chunks": inserted_chunks}
+
+        record = await self.collection.find_one_and_update(
+            {"_id": job_id},
+            update,
+            projection={"job_cancel_requested": 1},
+        )
+        return record is None or bool(record.get("job_cancel_requested"))
+
+    async def finish_job(self, job_id: ObjectId, status: str, error: Optional[str] = None) -> None:
+        await self.collection.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "job_status": status,
+                    "job_error": error,
+                    "job_finished_at": datetime.now(timezone.utc),
+                },
+                # Frees the dedupe key for the next identical request
+                "$unset": {"job_active_key": ""},
+            },
+        )
+
+    async def request_cancel(self, job_project_id: Union[str, ObjectId], job_id: Union[str, ObjectId]) -> Optional[ProcessJob]:
+        """Flag a queued or running job for cancellation; None if it is not in flight."""
+        job_project_id = ObjectId(job_project_id) if isinstance(job_project_id, str) else job_project_id
+        try:
+            job_id = ObjectId(job_id) if isinstance(job_id, str) else job_id
+        except InvalidId:
+            return None
+
+        record = await self.collection.find_one_and_update(
+            {"_id": job_id, "job_project_id": job_project_id, "job_status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"job_cancel_requested": True}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return ProcessJob(**record) if record is not None else None
+
+    async def request_cancel_jobs(self, job_project_id: Optional[Union[str, ObjectId]] = None) -> int:
+        """Flag every queued or running job (of one project, if given) for cancellation."""
+        query = {"job_status": {"$in": ACTIVE_STATUSES}}
+        if job_project_id is not None:
+            query["job_project_id"] = ObjectId(job_project_id) if isinstance(job_project_id, str) else job_project_id
+
+        result = await self.collection.update_many(query, {"$set": {"job_cancel_requested": True}})
+        return result.modified_count
+
+    async def get_uncancelled_job_ids(self, job_ids: List[ObjectId]) -> Set[ObjectId]:
+        """Of the given jobs, those that still exist and have no cancellation request."""
+        cursor = self.collection.find(
+            {"_id": {"$in": job_ids}, "job_cancel_requested": False},
+            projection={"_id": 1},
+        )
+        return {doc["_id"] async for doc in cursor}
+
+    async def has_running_jobs(
+        self,
+        stale_before: datetime,
+        job_project_id: Optional[Union[str, ObjectId]] = None
+    ) -> bool:
+        """Whether a job (of one project, if given) is running in a process that is still alive."""
+        query = {
+            "job_status": ProcessJobStatusEnum.RUNNING.value,
+            "job_heartbeat_at": {"$gte": stale_before},
+        }
+        if job_project_id is not None:
+            query["job_project_id"] = ObjectId(job_project_id) if isinstance(job_project_id, str) else job_project_id
+
+        record = await self.collection.find_one(query, projection={"_id": 1})
+        return record is not None
+
+    async def heartbeat(self, job_owner_id: str) -> int:
+        """Mark the owner's queued and running jobs as alive."""
+        result = await self.collection.update_many(
+            {"job_owner_id": job_owner_id, "job_status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"job_heartbeat_at": datetime.now(timezone.utc)}},
+        )
+        return result.modified_count
+
+    async def fail_orphaned_jobs(self, stale_before: datetime, error: str) -> int:
+        """Jobs whose owner stopped heartbeating will never finish; close them."""
+        return await self.fail_active_jobs(
+            {"$or": [
+                {"job_heartbeat_at": {"$lt": stale_before}},
+                {"job_heartbeat_at": None},
+            ]},
+            error=error,
+        )
+
+    async def fail_owner_jobs(self, job_owner_id: str, error: str) -> int:
+        """Close the jobs one process still holds, e.g. the rest of its queue on shutdown."""
+        return await self.fail_active_jobs({"job_owner_id": job_owner_id}, error=error)
+
+    async def fail_active_jobs(self, query: dict, error: str) -> int:
+        result = await self.collection.update_many(
+            {**query, "job_status": {"$in": ACTIVE_STATUSES}},
+            {
+                "$set": {
+                    "job_status": ProcessJobStatusEnum.FAILED.value,
+                    "job_error": error,
+                    "job_finished_at": datetime.now(timezone.utc),
+                },
+                "$unset": {"job_active_key": ""},
+            },
+        )
+        return result.modified_count
+
+    async def delete_jobs_by_project_id(self, job_project_id: Union[str, ObjectId]) -> int:
+        job_project_id = ObjectId(job_project_id) if isinstance(job_project_id, str) else job_project_id
+        result = await self.collection.delete_many({"job_project_id": job_project_id})
+        return result.deleted_count
+
+    async def drop_jobs_collection(self):
+        await self.collection.drop()
@@ -5,34 +5,25 @@ from .BaseDataModel import BaseDataModel
 from .enums import DataBaseEnum
 from .db_schemes import Project
 
-from motor.motor_asyncio import AsyncIOMotorClient
-
 class ProjectModel(BaseDataModel):
     def __init__(self, db_client: AsyncIOMotorDatabase):
         super().__init__(db_client)
-        self.db_client = AsyncIOMotorClient(self.app_settings.MONGODB_URL)[self.app_settings.MONGODB_DATABASE]
-
-
         self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
 
     @classmethod
     async def create_instance(cls, db_client: AsyncIOMotorDatabase):
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
+        # Collections and indexes are bootstrapped once in main.lifespan
+        return cls(db_client)
 
     async def init_collection(self):
-        # Make sure that collection was not created yet
-        # all_collection = value when one insertion happen 
-        all_collection = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_PROJECT_NAME.value not in all_collection:
-            indexes = Project.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"],
-                )
+        # Called once at startup; create_index is a no-op if the index exists
+        indexes = Project.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+            )
 
     async def create_project(self, project: Project):
         result = await self.collection.insert_one(project.model_dump(by_alias=True, exclude_unset=True))
@@ -1,3 +1,6 @@
 from .ProjectModel import ProjectModel
 from .ChunkModel import ChunkModel
-from .AssetModel import AssetModel
\ No newline at end of file
+from .AssetModel import AssetModel
+from .ChatSessionModel import ChatSessionModel
+from .ChatMessageModel import ChatMessageModel
+from .ProcessJobModel import ProcessJobModel
\ No newline at end of file
@@ -1,3 +1,6 @@
 from .project import Project
 from .data_chunk import DataChunk
-from .asset import Asset
\ No newline at end of file
+from .asset import Asset
+from .chat_session import ChatSession
+from .chat_message import ChatMessage
+from .process_job import ProcessJob, ProcessJobAsset
\ No newline at end of file
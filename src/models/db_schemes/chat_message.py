@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from datetime import datetime, timezone
+
+class ChatMessage(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+
+    message_project_id: ObjectId
+    message_session_id: str = Field(..., min_length=1)
+    message_role: str = Field(..., min_length=1)     # "user" | "assistant"
+    message_content: str
+    message_tokens: int = Field(default=0, ge=0)     # local estimate, see ContextController
+
+    message_created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "populate_by_name": True
+    }
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {
+                # Newest-first tail reads of one session
+                "key": [
+                    ("message_project_id", ASCENDING),
+                    ("message_session_id", ASCENDING),
+                    ("_id", DESCENDING),
+                ],
+                "name": "message_session_tail_idx",
+                "unique": False,
+            },
+        ]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+from pymongo import ASCENDING
+from datetime import datetime, timezone
+
+class ChatSession(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+
+    session_project_id: ObjectId
+    session_id: str = Field(..., min_length=1, max_length=128)
+
+    # Rolling summary of every message up to and including session_summarized_until
+    session_summary: Optional[str] = None
+    session_summarized_until: Optional[ObjectId] = None
+
+    session_created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "populate_by_name": True
+    }
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {
+                "key": [("session_project_id", ASCENDING), ("session_id", ASCENDING)],
+                "name": "session_project_id_session_id_unique_idx",
+                "unique": True,
+            },
+        ]
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Union
 from bson.objectid import ObjectId
 from pymongo import ASCENDING
+import hashlib
+import uuid
 
 class DataChunk(BaseModel):
     id: Optional[ObjectId] = Field(None, alias="_id")
@@ -14,6 +16,9 @@ class DataChunk(BaseModel):
     chunk_size: int
     chunk_overlap_size: int
 
+    # Deterministic id from the content hash, also used as the vector DB point id
+    chunk_hash_id: Optional[str] = None
+
     model_config = {
         "arbitrary_types_allowed": True, # To allow the ObjectId type
         "populate_by_name": True  # important if you use alias `_id`
@@ -39,9 +44,28 @@ class DataChunk(BaseModel):
                 ],
                 "name": "proj_asset_param_idx",
                 "unique": False
+            },
+            {
+                "key": [
+                    ("chunk_project_id", ASCENDING),
+                    ("chunk_hash_id", ASCENDING),
+                ],
+                "name": "proj_hash_id_idx",
+                "unique": False # identical text within an asset shares an id
             }
         ]
 
+    @classmethod
+    def compute_hash_id(cls, chunk_asset_id: Union[str, ObjectId], chunk_text: str) -> str:
+        """
+        UUID built from sha256(asset id, text): unchanged chunks keep their id
+        across re-processing, so only new content needs to be embedded.
+        """
+        digest = hashlib.sha256(f"{chunk_asset_id}:{chunk_text}".encode("utf-8")).hexdigest()
+        return str(uuid.UUID(hex=digest[:32]))
+
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    # Vector/lexical record id (the chunk's chunk_hash_id when indexed by content hash)
+    id: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,70 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from datetime import datetime, timezone
+
+class ProcessJobAsset(BaseModel):
+    asset_id: str
+    asset_name: str
+    status: str = "pending"
+    inserted_chunks: int = 0
+    error: Optional[str] = None
+
+class ProcessJob(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+
+    job_project_id: ObjectId
+    job_status: str = Field(..., min_length=1)
+
+    # sha256 of project + request; only set while queued/running, so the
+    # unique sparse index dedupes identical in-flight jobs and nothing else
+    job_active_key: Optional[str] = None
+
+    # The ProcessRequest that created the job
+    job_params: dict = Field(default_factory=dict)
+
+    job_assets: List[ProcessJobAsset] = Field(default_factory=list)
+    job_total_assets: int = 0
+    job_finished_assets: int = 0
+    job_inserted_chunks: int = 0
+
+    job_cancel_requested: bool = False
+
+    # The API process whose queue holds the job; it refreshes job_heartbeat_at
+    # while alive, so jobs of a dead process can be told apart from live ones
+    job_owner_id: Optional[str] = None
+    job_heartbeat_at: Optional[datetime] = None
+    job_error: Optional[str] = None
+
+    job_created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    job_started_at: Optional[datetime] = None
+    job_finished_at: Optional[datetime] = None
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "populate_by_name": True
+    }
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {
+                "key": [("job_active_key", ASCENDING)],
+                "name": "job_active_key_unique_idx",
+                "unique": True,
+                "sparse": True,
+            },
+            {
+                "key": [("job_project_id", ASCENDING), ("job_created_at", DESCENDING)],
+                "name": "job_project_id_created_at_idx",
+                "unique": False,
+            },
+            {
+                "key": [("job_status", ASCENDING)],
+                "name": "job_status_idx",
+                "unique": False,
+            },
+        ]
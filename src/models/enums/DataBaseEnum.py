@@ -4,4 +4,7 @@ class DataBaseEnum(Enum):
 
     COLLECTION_PROJECT_NAME = "projects" 
     COLLECTION_CHUNK_NAME = "chunks"
-    COLLECTION_ASSET_NAME = "assets"
\ No newline at end of file
+    COLLECTION_ASSET_NAME = "assets"
+    COLLECTION_CHAT_SESSION_NAME = "chat_sessions"
+    COLLECTION_CHAT_MESSAGE_NAME = "chat_messages"
+    COLLECTION_PROCESS_JOB_NAME = "process_jobs"
\ No newline at end of file
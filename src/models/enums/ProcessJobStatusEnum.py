@@ -0,0 +1,17 @@
+from enum import Enum
+
+class ProcessJobStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class ProcessAssetStatusEnum(Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    SKIPPED = "skipped"         # identical chunks already stored
+    EMPTY = "empty"             # file produced no chunks
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -18,5 +18,15 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vector_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vector_search_error"
     VECTORDB_SEARCH_SUCCESS = "vector_search_success"
+    VECTORDB_SEARCH_BATCH_TOO_LARGE = "vector_search_batch_too_large"
+    SEARCH_MODE_NOT_SUPPORTED = "search_mode_not_supported"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+    CHAT_SESSION_DELETED = "chat_session_deleted"
+    PROCESSING_JOB_QUEUED = "processing_job_queued"
+    PROCESSING_JOB_ALREADY_QUEUED = "processing_job_already_queued"
+    PROCESSING_JOB_QUEUE_FULL = "processing_job_queue_full"
+    PROCESSING_JOB_RETRIEVED = "processing_job_retrieved"
+    PROCESSING_JOB_NOT_FOUND = "processing_job_not_found"
+    PROCESSING_JOB_CANCEL_REQUESTED = "processing_job_cancel_requested"
+    PROCESSING_JOB_ALREADY_FINISHED = "processing_job_already_finished"
\ No newline at end of file
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class SearchModeEnum(Enum):
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
@@ -1,4 +1,6 @@
 from .ResponseSignal import ResponseSignal
 from .FileTypeEnum import FileTypeEnum
 from .DataBaseEnum import DataBaseEnum
-from .AssetTypeEnum import AssetTypeEnum
\ No newline at end of file
+from .AssetTypeEnum import AssetTypeEnum
+from .SearchModeEnum import SearchModeEnum
+from .ProcessJobStatusEnum import ProcessJobStatusEnum, ProcessAssetStatusEnum
\ No newline at end of file
@@ -6,14 +6,16 @@ from fastapi import (
 )
 from fastapi.responses import JSONResponse
 import os
+import asyncio
 import shutil
 import logging
+from pymongo.errors import DuplicateKeyError
 
-from controllers import DataController, ProcessController
+from controllers import DataController
 from models.enums import ResponseSignal, AssetTypeEnum
 from .schemes.data import ProcessRequest
-from models.db_schemes import DataChunk, Asset
-from models import ProjectModel, ChunkModel, AssetModel
+from models.db_schemes import Asset
+from models import ProjectModel, ChunkModel, AssetModel, ChatSessionModel, ChatMessageModel, ProcessJobModel
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -41,46 +43,65 @@ async def upload_data(
             content={"signal": result_signal}
         )
 
-    # Compute the file hash before saving
-    file_hash = await data_controller.compute_file_hash(file)
-
-    # Check if file with same content already exists
-    asset_model = await AssetModel.create_instance(request.app.db_client)
-    existing = await asset_model.is_existed(
-        asset_project_id=project.id,
-        file_hash=file_hash
-    )
-
-    if existing:
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={"signal": ResponseSignal.FILE_DUPLICATE_CONTENT.value}
-        )
-
-    # Save file only if it's not a duplicate
-    success, file_path, file_id_name = await data_controller.save_file_to_disk(
+    # Write to a temp file and hash in the same pass (single read of the upload)
+    success, temp_file_path, file_hash = await data_controller.save_and_hash_file(
         file=file,
         project_id=project_id
     )
 
     if not success:
-        logger.error(f"Error while saving file: {file_id_name}")
+        logger.error(f"Error while saving file: {file_hash}")
         return JSONResponse(
             content={"signal": ResponseSignal.FILE_UPLOADED_FAILED.value},
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    # Insert asset metadata into database
-    asset_resource = Asset(
-        asset_project_id=project.id,
-        asset_type=AssetTypeEnum.FILE.value,
-        asset_file_extension=os.path.splitext(file_path)[-1],
-        asset_name=file_id_name,
-        asset_size=os.path.getsize(file_path),
-        asset_file_hash=file_hash
-    )
+    # Until the asset record exists, whatever is on disk is ours to remove
+    # (also on client disconnect or a failing DB call)
+    file_path = temp_file_path
+    asset_record = None
+    try:
+        # Check if file with same content already exists
+        asset_model = await AssetModel.create_instance(request.app.db_client)
+        existing = await asset_model.is_existed(
+            asset_project_id=project.id,
+            file_hash=file_hash
+        )
+
+        if existing:
+            return JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={"signal": ResponseSignal.FILE_DUPLICATE_CONTENT.value}
+            )
+
+        # Keep the file only if it's not a duplicate
+        file_path, file_id_name = data_controller.commit_temp_file(
+            temp_file_path=temp_file_path,
+            org_file_name=file.filename,
+            project_id=project_id
+        )
+
+        # Insert asset metadata into database
+        asset_resource = Asset(
+            asset_project_id=project.id,
+            asset_type=AssetTypeEnum.FILE.value,
+            asset_file_extension=os.path.splitext(file_path)[-1],
+            asset_name=file_id_name,
+            asset_size=os.path.getsize(file_path),
+            asset_file_hash=file_hash
+        )
 
-    asset_record = await asset_model.create_asset(asset=asset_resource)
+        try:
+            asset_record = await asset_model.create_asset(asset=asset_resource)
+        except DuplicateKeyError:
+            # A concurrent upload of the same content won the unique hash index
+            return JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={"signal": ResponseSignal.FILE_DUPLICATE_CONTENT.value}
+            )
+    finally:
+        if asset_record is None:
+            data_controller.discard_temp_file(file_path)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -91,12 +112,17 @@ async def upload_data(
     )
 
 @data_router.post("/process/{project_id}")
-async def process_endpoint(request: Request, project_id: str, process_request: ProcessRequest):
-    chunk_size = process_request.chunk_size
-    overlap_size=process_request.overlap_size
-    do_reset = process_request.do_reset
-    force_reproduce_chunks = process_request.force_reproduce_chunks
-
+async def process_endpoint(
+    request: Request,
+    project_id: str,
+    process_request: ProcessRequest
+):
+    """
+    Queue a job that parses, chunks and stores the project's files (or just
+    file_id) and return its job_id at once; poll /process/jobs/{project_id}/{job_id}
+    for progress. An identical request while the job is queued or running
+    returns the same job.
+    """
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
     project = await project_model.get_or_create_project(project_id)
 
@@ -141,89 +167,75 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             }
         )
     
-    process_controller = ProcessController(project_id=project_id)
+    job, created = await request.app.process_jobs.submit(
+        project=project,
+        params=process_request.model_dump(),
+        assets=project_file_ids,
+    )
 
-    chunk_model = await ChunkModel.create_instance(request.app.db_client)
-    
-    # Delete all chunks
-    if do_reset == 1: 
-        await chunk_model.delete_chunks_by_project_id(chunk_project_id=project.id)
-        logger.info(f"Delete all chunks of project_id({project_id})")
-    
-    no_records = 0
-    no_files = 0
-
-    for asset_id, asset_name in project_file_ids.items():
-        if force_reproduce_chunks:
-            await chunk_model.delete_chunks_for_asset(
-                chunk_project_id=project.id,
-                chunk_asset_id=asset_id
-            )
-            logger.info(f"[Force] cleared chunks for {asset_name}")
-        else:
-            # 1) identical‑param check
-            same_params = await chunk_model.is_chunks_exist(
-                chunk_project_id=project.id,
-                chunk_asset_id=asset_id,
-                chunk_size=chunk_size,
-                overlap_size=overlap_size,
-            )
-            if same_params:
-                logger.info(f"[Skip] identical chunks already exist → {asset_name}")
-                continue  # nothing to do
-
-            # 2) different‑param chunks: remove them
-            removed = await chunk_model.delete_chunks_for_asset(
-                chunk_project_id=project.id,
-                chunk_asset_id=asset_id
-            )
-            if removed:
-                logger.info(f"[Update] removed {removed} outdated chunks for {asset_name}")
-
-        # -------- read, chunk, insert --------
-        file_content = process_controller.get_file_content(file_id=asset_name)
-        if file_content is None:
-            logger.error(f"[Error] cannot read file {asset_name}")
-            continue
-
-        chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=asset_name,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size,
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"signal": ResponseSignal.PROCESSING_JOB_QUEUE_FULL.value}
         )
-        if not chunks:
-            logger.warning(f"[Skip] no chunks from {asset_name}")
-            continue
-
-        docs = [
-            DataChunk(
-                chunk_project_id=project.id,
-                chunk_text=c.page_content,
-                chunk_metadata=c.metadata,
-                chunk_order=i + 1,
-                chunk_asset_id=asset_id,
-                chunk_size=chunk_size,
-                chunk_overlap_size=overlap_size,
-            )
-            for i, c in enumerate(chunks)
-        ]
 
-        try:
-            inserted = await chunk_model.insert_many_chunks(docs)
-            no_records += inserted
-            no_files  += 1
-            logger.info(f"[Insert] {inserted} chunks stored for {asset_name}")
-        except Exception as exc:
-            logger.error(f"[Error] failed insert for {asset_name}: {exc}")
+    signal = ResponseSignal.PROCESSING_JOB_QUEUED if created else ResponseSignal.PROCESSING_JOB_ALREADY_QUEUED
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": signal.value,
+            "job_id": str(job.id),
+            "status": job.job_status,
+            "total_assets": job.job_total_assets,
+        }
+    )
+
+@data_router.get("/process/jobs/{project_id}/{job_id}")
+async def get_process_job(request: Request, project_id: str, job_id: str):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id)
 
+    job_model = await ProcessJobModel.create_instance(db_client=request.app.db_client)
+    job = await job_model.get_job(job_project_id=project.id, job_id=job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.PROCESSING_JOB_NOT_FOUND.value}
+        )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_file": no_files
+            "signal": ResponseSignal.PROCESSING_JOB_RETRIEVED.value,
+            "job": request.app.process_jobs.get_job_status(job),
+        }
+    )
+
+@data_router.post("/process/jobs/{project_id}/{job_id}/cancel")
+async def cancel_process_job(request: Request, project_id: str, job_id: str):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id)
+
+    job = await request.app.process_jobs.cancel(project=project, job_id=job_id)
+    if job is None:
+        job_model = await ProcessJobModel.create_instance(db_client=request.app.db_client)
+        if await job_model.get_job(job_project_id=project.id, job_id=job_id) is None:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"signal": ResponseSignal.PROCESSING_JOB_NOT_FOUND.value}
+            )
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"signal": ResponseSignal.PROCESSING_JOB_ALREADY_FINISHED.value}
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.PROCESSING_JOB_CANCEL_REQUESTED.value,
+            "job_id": str(job.id),
+            "status": job.job_status,
         }
     )
 
@@ -231,7 +243,11 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
 async def delete_project(request: Request,project_id: str):
     project_model = ProjectModel(request.app.db_client)
     project = await project_model.get_or_create_project(project_id)
+
+    # Wait for the project's jobs to stop, or a batch in flight could land after the deletes
+    await request.app.process_jobs.cancel_project_jobs(project)
     await project_model.delete_project(project_id)
+    await ProcessJobModel(request.app.db_client).delete_jobs_by_project_id(job_project_id=project.id)
     
     chunk_model = ChunkModel(request.app.db_client)
     await chunk_model.delete_chunks_by_project_id(chunk_project_id=project.id)
@@ -239,6 +255,14 @@ async def delete_project(request: Request,project_id: str):
     asset_model = AssetModel(request.app.db_client)
     await asset_model.delete_assets_by_project_id(asset_project_id=project.id)
 
+    await ChatSessionModel(request.app.db_client).delete_sessions_by_project_id(session_project_id=project.id)
+    await ChatMessageModel(request.app.db_client).delete_messages_by_project_id(message_project_id=project.id)
+
+    request.app.search_result_cache.invalidate(namespace=project_id)
+    request.app.chat_session_cache.invalidate(namespace=project_id)
+    if request.app.lexical_index is not None:
+        await asyncio.to_thread(request.app.lexical_index.drop, project_id)
+
     project_path = DataController().get_project_path(project_id)
     for item in os.listdir(project_path):
         item_path = os.path.join(project_path, item)
@@ -253,12 +277,22 @@ async def delete_project(request: Request,project_id: str):
 
 @data_router.get("/reset_all")
 async def delete_project(request: Request):
+    await request.app.process_jobs.cancel_all_jobs()
+    await ProcessJobModel(request.app.db_client).drop_jobs_collection()
+
     project_model = ProjectModel(request.app.db_client)
     await project_model.drop_projects_collection()
     chunk_model = ChunkModel(request.app.db_client)
     await chunk_model.drop_chunks_collection()
     asset_model = AssetModel(request.app.db_client)
     await asset_model.drop_assets_collection()
+    await ChatSessionModel(request.app.db_client).drop_sessions_collection()
+    await ChatMessageModel(request.app.db_client).drop_messages_collection()
+
+    request.app.search_result_cache.clear()
+    request.app.chat_session_cache.clear()
+    if request.app.lexical_index is not None:
+        await asyncio.to_thread(request.app.lexical_index.drop_all)
 
     file_path = DataController().files_dir
     for item in os.listdir(file_path):
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+
+from helpers.metrics import get_stage_registry, RuntimeMetricsCollector
+
+metrics_router = APIRouter(
+    tags=["metrics"]
+)
+
+@metrics_router.get("/metrics")
+async def get_metrics(request: Request):
+    # Cache and scheduler state is read from this process's app on each scrape
+    runtime_registry = CollectorRegistry()
+    runtime_registry.register(RuntimeMetricsCollector(request.app))
+
+    content = generate_latest(get_stage_registry()) + generate_latest(runtime_registry)
+    return Response(content=content, media_type=CONTENT_TYPE_LATEST)
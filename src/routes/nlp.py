@@ -1,6 +1,17 @@
-from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, status, Request, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from contextlib import aclosing
+import json
 import logging
+import time
+
+from .schemes.nlp import PushRequest, SearchRequest, SearchBatchRequest, AnswerRequest
+from models import ProjectModel, ChunkModel, ChatSessionModel, ChatMessageModel
+from models.enums import ResponseSignal, SearchModeEnum
+from controllers import NLPController, ChatSessionController
+from helpers.config import get_settings, Settings
+from helpers.metrics import project_label, GENERATION_TTFT_SECONDS, GENERATION_SECONDS
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -8,3 +19,359 @@ nlp_router = APIRouter(
     prefix="/api/v1/nlp",
     tags=["api_v1", "nlp"]
 )
+
+@nlp_router.post("/index/push/{project_id}")
+async def index_project(request: Request, project_id: str, push_request: PushRequest):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        search_result_cache=request.app.search_result_cache,
+    )
+
+    nlp_controller.invalidate_search_cache(project=project)
+    try:
+        result = await nlp_controller.index_into_vector_db(
+            project=project,
+            chunk_model=chunk_model,
+            do_reset=bool(push_request.do_reset),
+        )
+    except Exception as exc:
+        logger.error(f"[Error] indexing failed for project {project_id}: {exc}")
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value}
+        )
+    finally:
+        # Drop results cached by searches that ran while the index was changing
+        nlp_controller.invalidate_search_cache(project=project)
+
+    elapsed = result["elapsed"]
+    chunks_per_second = result["inserted"] / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        f"[Index] {result['inserted']} new, {result['skipped']} unchanged, "
+        f"{result['deleted']} deleted for {project_id} "
+        f"in {elapsed:.2f}s ({chunks_per_second:.1f} chunks/s)"
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": result["inserted"],
+            "skipped_items_count": result["skipped"],
+            "deleted_items_count": result["deleted"],
+            "elapsed_seconds": round(elapsed, 3),
+            "chunks_per_second": round(chunks_per_second, 1),
+        }
+    )
+
+@nlp_router.post("/index/search/{project_id}")
+async def search_index(request: Request, project_id: str, search_request: SearchRequest):
+    if search_request.mode not in {mode.value for mode in SearchModeEnum}:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.SEARCH_MODE_NOT_SUPPORTED.value}
+        )
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        query_embedding_cache=request.app.query_embedding_cache,
+        search_result_cache=request.app.search_result_cache,
+        lexical_index=request.app.lexical_index,
+    )
+
+    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    # Lexical mode answers from the local BM25 index without any API call
+    results = await nlp_controller.retrieve_documents(
+        project=project,
+        chunk_model=chunk_model,
+        text=search_request.text,
+        limit=search_request.limit,
+        mode=search_request.mode,
+    )
+
+    if results is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value}
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [result.model_dump() for result in results],
+        }
+    )
+
+@nlp_router.post("/index/search-batch/{project_id}")
+async def search_index_batch(
+    request: Request,
+    project_id: str,
+    search_request: SearchBatchRequest,
+    app_settings: Settings = Depends(get_settings)
+):
+    if len(search_request.texts) > app_settings.SEARCH_BATCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.VECTORDB_SEARCH_BATCH_TOO_LARGE.value}
+        )
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        query_embedding_cache=request.app.query_embedding_cache,
+        search_result_cache=request.app.search_result_cache,
+    )
+
+    results = await nlp_controller.search_vector_db_collection_batch(
+        project=project,
+        texts=search_request.texts,
+        limit=search_request.limit,
+    )
+
+    if results is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value}
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                [result.model_dump() for result in query_results]
+                for query_results in results
+            ],
+        }
+    )
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(request: Request, project_id: str, answer_request: AnswerRequest):
+    """
+    Retrieve context, then stream the answer as Server-Sent Events:
+    "token" events carry text as it is generated, a final "done" event carries
+    the full answer, the updated chat_history and time-to-first-token.
+
+    With a session_id the history is kept server-side instead: the turn is
+    stored in Mongo, only the newest messages within the history token budget
+    are sent to the model, and older ones are folded into a rolling summary
+    after the response has been sent.
+    """
+    started_at = time.perf_counter()
+
+    if answer_request.mode not in {mode.value for mode in SearchModeEnum}:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.SEARCH_MODE_NOT_SUPPORTED.value}
+        )
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        query_embedding_cache=request.app.query_embedding_cache,
+        search_result_cache=request.app.search_result_cache,
+        lexical_index=request.app.lexical_index,
+        template_parser=request.app.template_parser,
+    )
+
+    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    documents = await nlp_controller.retrieve_documents(
+        project=project,
+        chunk_model=chunk_model,
+        text=answer_request.text,
+        limit=answer_request.limit,
+        mode=answer_request.mode,
+    )
+
+    if documents is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.RAG_ANSWER_ERROR.value}
+        )
+
+    # Merge adjacent chunks, drop duplicates and fit the model's token budget
+    documents, context_tokens = await nlp_controller.build_rag_context(
+        project=project,
+        chunk_model=chunk_model,
+        documents=documents,
+    )
+
+    session_id = answer_request.session_id
+    chat_controller, session_state = None, None
+    if session_id:
+        chat_controller = ChatSessionController(
+            session_model=await ChatSessionModel.create_instance(db_client=request.app.db_client),
+            message_model=await ChatMessageModel.create_instance(db_client=request.app.db_client),
+            generation_client=request.app.generation_client,
+            template_parser=request.app.template_parser,
+            hot_tail_cache=request.app.chat_session_cache,
+        )
+        session_state = await chat_controller.load_session(project=project, session_id=session_id)
+        chat_history, _ = chat_controller.build_chat_history(
+            session_state,
+            system_prompt=request.app.template_parser.get("rag", "system_prompt"),
+        )
+    else:
+        # Client-held history is bounded by the same budget
+        chat_history = nlp_controller.trim_chat_history(answer_request.chat_history)
+
+    async def event_stream():
+        async with aclosing(nlp_controller.stream_rag_answer(
+            query=answer_request.text,
+            documents=documents,
+            chat_history=chat_history,
+            started_at=started_at,
+        )) as events:
+            async for event, data in events:
+                if event == "done":
+                    generation_labels = (project_label(project_id), nlp_controller.app_settings.GENERATION_BACKEND)
+                    GENERATION_TTFT_SECONDS.labels(*generation_labels).observe(data["ttft_seconds"])
+                    GENERATION_SECONDS.labels(*generation_labels).observe(data["total_seconds"])
+                    logger.info(
+                        f"[RAG] {project_id} prompt_tokens~{data['prompt_tokens']} "
+                        f"(context {context_tokens}) ttft={data['ttft_seconds'] * 1000:.0f}ms "
+                        f"total={data['total_seconds'] * 1000:.0f}ms"
+                    )
+                    if chat_controller is not None:
+                        # Store the question, not the document-laden prompt, so replayed turns stay small
+                        data.pop("chat_history")
+                        data["session_id"] = session_id
+                        try:
+                            await chat_controller.append_turn(
+                                project=project,
+                                session_id=session_id,
+                                state=session_state,
+                                query=answer_request.text,
+                                answer=data["answer"],
+                            )
+                        except Exception as exc:
+                            logger.error(f"[Error] saving chat session {session_id} failed: {exc}")
+                    data = {
+                        "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+                        "context_tokens": context_tokens,
+                        **data,
+                    }
+                elif event == "error":
+                    data = {"signal": ResponseSignal.RAG_ANSWER_ERROR.value}
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def summarize_session():
+        if chat_controller.needs_summary(session_state):
+            await chat_controller.summarize(project=project, session_id=session_id, state=session_state)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs once the stream is finished, off the answer's critical path
+        background=BackgroundTask(summarize_session) if chat_controller is not None else None,
+    )
+
+@nlp_router.delete("/chat/{project_id}/{session_id}")
+async def delete_chat_session(request: Request, project_id: str, session_id: str):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_or_create_project(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    chat_controller = ChatSessionController(
+        session_model=await ChatSessionModel.create_instance(db_client=request.app.db_client),
+        message_model=await ChatMessageModel.create_instance(db_client=request.app.db_client),
+        generation_client=request.app.generation_client,
+        template_parser=request.app.template_parser,
+        hot_tail_cache=request.app.chat_session_cache,
+    )
+    deleted = await chat_controller.delete_session(project=project, session_id=session_id)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.CHAT_SESSION_DELETED.value,
+            "deleted_messages_count": deleted,
+        }
+    )
+
+@nlp_router.get("/generation/stats")
+async def generation_stats(request: Request):
+    scheduler = getattr(request.app.generation_client, "scheduler", None)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "scheduler": scheduler.stats() if scheduler is not None else None,
+        }
+    )
+
+@nlp_router.get("/embedding/stats")
+async def embedding_stats(request: Request):
+    batch_stats = getattr(request.app.embedding_client, "batch_stats", None)
+    scheduler = getattr(request.app.embedding_client, "scheduler", None)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "batching": batch_stats() if callable(batch_stats) else None,
+            "scheduler": scheduler.stats() if scheduler is not None else None,
+        }
+    )
+
+@nlp_router.get("/cache/stats")
+async def cache_stats(request: Request):
+    stats = {
+        "query_embedding_cache": request.app.query_embedding_cache.stats(),
+        "search_result_cache": request.app.search_result_cache.stats(),
+        "chat_session_cache": request.app.chat_session_cache.stats(),
+    }
+
+    if request.app.embedding_cache is not None:
+        stats["embedding_cache"] = request.app.embedding_cache.stats()
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content=stats)
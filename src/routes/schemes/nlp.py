@@ -1,9 +1,23 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 5
\ No newline at end of file
+    limit: Optional[int] = 5
+    mode: Optional[str] = "vector"  # "vector" | "lexical" | "hybrid"
+
+class SearchBatchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+
+class AnswerRequest(BaseModel):
+    text: str
+    limit: Optional[int] = 5
+    mode: Optional[str] = "vector"  # "vector" | "lexical" | "hybrid"
+    # Server-side session: history is stored, trimmed and summarized for you
+    session_id: Optional[str] = Field(default=None, min_length=1, max_length=128)
+    # Stateless alternative, returned by the previous answer's "done" event
+    chat_history: Optional[List[Dict[str, str]]] = None
@@ -0,0 +1,244 @@
+import asyncio
+import heapq
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import List, Dict, Tuple, Iterable
+
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class BM25Index:
+    """
+    Per-project BM25 inverted index, one SQLite file per project.
+
+    Postings live in a WITHOUT ROWID table clustered on (term, doc), so a
+    query reads each term's postings with one range scan. Documents are keyed
+    by chunk_hash_id, so re-adding an unchanged chunk is a no-op, and by asset
+    id so an asset's chunks can be dropped when it is re-processed.
+
+    A project's index is marked "built" once it holds every chunk in Mongo;
+    until then callers should backfill it instead of adding incrementally,
+    one backfill per project at a time (get_backfill_lock).
+    """
+
+    # Keep codes like "E-1042", "v2.3.1" or "AB/12" as one token
+    TOKEN_PATTERN = re.compile(r"\w+(?:[-./:]\w+)*")
+    # SQLite's default limit on host parameters per statement is 999
+    SQL_BATCH = 500
+
+    def __init__(self, db_path: str, k1: float = 1.2, b: float = 0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+
+        self.connections: Dict[str, sqlite3.Connection] = {}
+        self.locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Event-loop side: serializes backfills so one can't reset another's progress
+        self.backfill_locks: Dict[str, asyncio.Lock] = {}
+
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for token in self.TOKEN_PATTERN.findall(text.casefold()):
+            tokens.append(token)
+            # Compound codes also match on their parts ("e-1042" -> "e", "1042")
+            if not token.isalnum():
+                tokens.extend(re.split(r"[-./:]", token))
+        return tokens
+
+    def get_index_path(self, project_id: str) -> str:
+        return os.path.join(self.db_path, f"{project_id}.sqlite3")
+
+    def get_connection(self, project_id: str) -> Tuple[sqlite3.Connection, threading.Lock]:
+        with self._lock:
+            if project_id not in self.connections:
+                connection = sqlite3.connect(self.get_index_path(project_id), check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS docs (
+                        doc INTEGER PRIMARY KEY,
+                        chunk_id TEXT NOT NULL UNIQUE,
+                        asset_id TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        length INTEGER NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS docs_asset_id_idx ON docs (asset_id);
+                    CREATE TABLE IF NOT EXISTS postings (
+                        term TEXT NOT NULL,
+                        doc INTEGER NOT NULL,
+                        tf INTEGER NOT NULL,
+                        PRIMARY KEY (term, doc)
+                    ) WITHOUT ROWID;
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    );
+                    """
+                )
+                connection.commit()
+                self.connections[project_id] = connection
+                self.locks[project_id] = threading.Lock()
+            return self.connections[project_id], self.locks[project_id]
+
+    def get_backfill_lock(self, project_id: str) -> asyncio.Lock:
+        if project_id not in self.backfill_locks:
+            self.backfill_locks[project_id] = asyncio.Lock()
+        return self.backfill_locks[project_id]
+
+    def is_built(self, project_id: str) -> bool:
+        if not os.path.exists(self.get_index_path(project_id)):
+            return False
+        connection, lock = self.get_connection(project_id)
+        with lock:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'built'").fetchone()
+        return row is not None and row[0] == "1"
+
+    def mark_built(self, project_id: str) -> None:
+        connection, lock = self.get_connection(project_id)
+        with lock:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', '1')")
+            connection.commit()
+
+    def add_chunks(self, project_id: str, chunks: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Index (chunk_id, asset_id, text) triples; chunk ids already present are skipped.
+        Returns: number of newly indexed chunks
+        """
+        connection, lock = self.get_connection(project_id)
+        added = 0
+        with lock:
+            for chunk_id, asset_id, text in chunks:
+                tokens = self.tokenize(text)
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO docs (chunk_id, asset_id, text, length) VALUES (?, ?, ?, ?)",
+                    (chunk_id, str(asset_id), text, len(tokens))
+                )
+                if not cursor.rowcount:
+                    continue
+                doc = cursor.lastrowid
+                connection.executemany(
+                    "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)",
+                    [(term, doc, tf) for term, tf in Counter(tokens).items()]
+                )
+                added += 1
+            connection.commit()
+        return added
+
+    def remove_asset(self, project_id: str, asset_id: str) -> int:
+        if not os.path.exists(self.get_index_path(project_id)):
+            return 0
+
+        connection, lock = self.get_connection(project_id)
+        with lock:
+            docs = connection.execute(
+                "SELECT doc, text FROM docs WHERE asset_id = ?", (str(asset_id),)
+            ).fetchall()
+            # Postings are keyed by term, so re-tokenize to find exactly the rows to drop
+            connection.executemany(
+                "DELETE FROM postings WHERE term = ? AND doc = ?",
+                [(term, doc) for doc, text in docs for term in set(self.tokenize(text))]
+            )
+            connection.execute("DELETE FROM docs WHERE asset_id = ?", (str(asset_id),))
+            connection.commit()
+        return len(docs)
+
+    def reset(self, project_id: str, built: bool = True) -> None:
+        """Empty the project's index; built=True marks the empty index as complete."""
+        connection, lock = self.get_connection(project_id)
+        with lock:
+            connection.execute("DELETE FROM postings")
+            connection.execute("DELETE FROM docs")
+            connection.execute("DELETE FROM meta")
+            if built:
+                connection.execute("INSERT INTO meta (key, value) VALUES ('built', '1')")
+            connection.commit()
+
+    def drop(self, project_id: str) -> None:
+        """Delete the project's index files. Does file I/O; call it from a worker thread."""
+        with self._lock:
+            connection = self.connections.pop(project_id, None)
+            lock = self.locks.pop(project_id, None)
+        if connection is not None:
+            # Let a search or add_chunks already running on this connection finish first
+            with lock:
+                connection.close()
+
+        index_path = self.get_index_path(project_id)
+        for path in (index_path, f"{index_path}-wal", f"{index_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def drop_all(self) -> None:
+        for name in os.listdir(self.db_path):
+            if name.endswith(".sqlite3"):
+                self.drop(name[: -len(".sqlite3")])
+
+    def search(self, project_id: str, text: str, limit: int = 5) -> List[RetrievedDocument]:
+        if not os.path.exists(self.get_index_path(project_id)):
+            return []
+
+        terms = list(dict.fromkeys(self.tokenize(text)))
+        if not terms:
+            return []
+
+        connection, lock = self.get_connection(project_id)
+        with lock:
+            total_docs, total_length = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+            ).fetchone()
+            if not total_docs:
+                return []
+            average_length = total_length / total_docs
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = connection.execute(
+                    """
+                    SELECT postings.doc, postings.tf, docs.length
+                    FROM postings JOIN docs ON docs.doc = postings.doc
+                    WHERE postings.term = ?
+                    """,
+                    (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf, length in postings:
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            if not top:
+                return []
+
+            placeholders = ",".join("?" * len(top))
+            records = {
+                doc: (chunk_id, text)
+                for doc, chunk_id, text in connection.execute(
+                    f"SELECT doc, chunk_id, text FROM docs WHERE doc IN ({placeholders})",
+                    [doc for doc, _ in top]
+                )
+            }
+
+        return [
+            RetrievedDocument(text=records[doc][1], score=score, id=records[doc][0])
+            for doc, score in top
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            for project_id, connection in self.connections.items():
+                with self.locks[project_id]:
+                    connection.close()
+            self.connections = {}
+            self.locks = {}
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from typing import List, Optional, Union, Dict, Tuple, AsyncIterator
+
+from .AsyncLLMInterface import AsyncLLMInterface
+from .LLMEnum import DocumentTypeEnum
+from helpers.metrics import EMBEDDING_BATCHER_BATCH_SIZE, EMBEDDING_BATCHER_CALLERS
+
+class AsyncBatchingEmbeddingProvider(AsyncLLMInterface):
+    """
+    Coalesces concurrent embed_text calls into one provider request.
+
+    Texts from callers arriving within window_ms of the first pending one are
+    sent together (up to max_batch_size texts, de-duplicated) and each caller
+    gets back exactly its own vectors. A call that alone reaches
+    max_batch_size (e.g. an indexing batch) is sent straight through.
+    Batches never mix document types, since providers embed them differently.
+    """
+
+    def __init__(self, provider: AsyncLLMInterface, window_ms: float = 5, max_batch_size: int = 64):
+        self.provider = provider
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        # document_type -> [(texts, future)] waiting for the next flush
+        self.pending: Dict[Optional[str], List[Tuple[List[str], asyncio.Future]]] = {}
+        self.pending_sizes: Dict[Optional[str], int] = {}
+        self.timers: Dict[Optional[str], asyncio.TimerHandle] = {}
+        self.tasks = set()
+
+        self.passthrough_calls = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # Anything not batched (process_text, enums, cache stats, ...) comes from the wrapped provider
+        return getattr(self.provider, name)
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.provider.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        return await self.provider.generate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        return self.provider.stream_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        return self.provider.construct_prompt(prompt=prompt, role=role)
+
+    async def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: Optional[str] = None
+    ) -> List[List[float]]:
+        texts = [text] if isinstance(text, str) else list(text)
+        if not texts:
+            return []
+
+        if len(texts) >= self.max_batch_size:
+            self.passthrough_calls += 1
+            self.observe_batch(document_type, texts=len(texts), callers=1)
+            return await self.provider.embed_text(text=texts, document_type=document_type)
+
+        # Send what is already waiting if these texts would overflow the batch
+        if self.pending_sizes.get(document_type, 0) + len(texts) > self.max_batch_size:
+            self.schedule_flush(document_type)
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending.setdefault(document_type, []).append((texts, future))
+        self.pending_sizes[document_type] = self.pending_sizes.get(document_type, 0) + len(texts)
+
+        if self.pending_sizes[document_type] >= self.max_batch_size:
+            self.schedule_flush(document_type)
+        elif document_type not in self.timers:
+            self.timers[document_type] = asyncio.get_running_loop().call_later(
+                self.window_seconds, self.schedule_flush, document_type
+            )
+
+        return await future
+
+    def schedule_flush(self, document_type: Optional[str]) -> None:
+        timer = self.timers.pop(document_type, None)
+        if timer is not None:
+            timer.cancel()
+
+        requests = self.pending.pop(document_type, [])
+        self.pending_sizes.pop(document_type, None)
+        if not requests:
+            return
+
+        # Keep a reference so the task is not garbage-collected mid-flight
+        task = asyncio.create_task(self.flush(requests, document_type))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self, requests: List[Tuple[List[str], asyncio.Future]], document_type: Optional[str]) -> None:
+        unique = list(dict.fromkeys(t for texts, _ in requests for t in texts))
+        self.observe_batch(document_type, texts=len(unique), callers=len(requests))
+
+        try:
+            vectors = await self.provider.embed_text(text=unique, document_type=document_type)
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not vectors or len(vectors) != len(unique):
+            # Every caller sees the provider's failure value (None / []), as if it had called alone
+            for _, future in requests:
+                if not future.done():
+                    future.set_result(vectors)
+            return
+
+        by_text = dict(zip(unique, vectors))
+        for texts, future in requests:
+            # A caller that was cancelled while waiting no longer needs its vectors
+            if not future.done():
+                future.set_result([by_text[t] for t in texts])
+
+    def observe_batch(self, document_type: Optional[str], texts: int, callers: int) -> None:
+        # Texts sent per provider call, and caller requests merged into each call
+        label = document_type or DocumentTypeEnum.DOCUMENT.value
+        EMBEDDING_BATCHER_BATCH_SIZE.labels(label).observe(texts)
+        EMBEDDING_BATCHER_CALLERS.labels(label).observe(callers)
+
+    def batch_stats(self) -> Dict[str, object]:
+        # Batch-size distributions are exported on /metrics
+        return {
+            "window_ms": self.window_seconds * 1000,
+            "max_batch_size": self.max_batch_size,
+            "passthrough_calls": self.passthrough_calls,
+        }
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import List, Optional, Union, Dict, Tuple, AsyncIterator
+
+from .AsyncLLMInterface import AsyncLLMInterface
+from .EmbeddingCache import EmbeddingCache
+
+class AsyncCachedEmbeddingProvider(AsyncLLMInterface):
+    """
+    Wraps any AsyncLLMInterface and serves embed_text from the persistent,
+    content-addressed EmbeddingCache; only misses are awaited on the provider.
+    SQLite access runs in a worker thread so it never blocks the loop.
+    """
+
+    def __init__(self, provider: AsyncLLMInterface, provider_name: str, db_path: str, max_entries: int = 1_000_000):
+        self.provider = provider
+        # Entries are keyed on the backend (e.g. "OPENAI"), not on the wrapper class
+        self.provider_name = provider_name
+        self.cache = EmbeddingCache(db_path=db_path, max_entries=max_entries)
+
+        self.embedding_model_id: Optional[str] = None
+        self.embedding_size: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # Anything not cached (process_text, enums, ...) comes from the wrapped provider
+        return getattr(self.provider, name)
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.provider.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+        self.provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        return await self.provider.generate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        return self.provider.stream_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        return self.provider.construct_prompt(prompt=prompt, role=role)
+
+    async def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: Optional[str] = None
+    ) -> List[List[float]]:
+        texts = [text] if isinstance(text, str) else text
+        keys = [self.get_cache_key(t, document_type) for t in texts]
+
+        cached = await asyncio.to_thread(self.cache.load, keys)
+
+        # Embed each distinct missing text only once
+        missing: Dict[str, str] = {}
+        for key, t in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = t
+
+        miss_count = sum(1 for key in keys if key not in cached)
+        self.hits += len(keys) - miss_count
+        self.misses += miss_count
+
+        if missing:
+            vectors = await self.provider.embed_text(
+                text=list(missing.values()),
+                document_type=document_type
+            )
+            if not vectors or len(vectors) != len(missing):
+                # Keep the provider's failure value (None / []) for the caller
+                return vectors
+
+            fresh = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(self.cache.store, fresh)
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    def get_cache_key(self, text: str, document_type: Optional[str] = None) -> str:
+        return EmbeddingCache.get_cache_key(
+            provider_name=self.provider_name,
+            model_id=self.embedding_model_id,
+            text=text,
+            document_type=document_type
+        )
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "entries": self.cache.entries,
+            "max_entries": self.cache.max_entries,
+        }
+
+    def close(self) -> None:
+        self.cache.close()
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import List, Union, Tuple, Optional, Dict, AsyncIterator
+
+class AsyncLLMInterface(ABC):
+    """
+    Async counterpart of LLMInterface.
+    Generation and embedding calls are awaitable so many requests can be in
+    flight per worker without tying up threads.
+    """
+
+    @abstractmethod
+    def set_generation_model(self, model_id: str) -> None:
+        """Select which model to use for text generation."""
+        pass
+
+    @abstractmethod
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        """Select which model to use for embeddings."""
+        pass
+
+    @abstractmethod
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        Generate text from a prompt.
+        Returns: (generated_text, updated_chat_history)
+        """
+        pass
+
+    @abstractmethod
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text from a prompt, yielding it piece by piece as it arrives.
+        The user turn and the full reply are appended to chat_history only
+        once the stream completes; errors are raised to the caller.
+        """
+        pass
+
+    @abstractmethod
+    async def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: Optional[str] = None
+    ) -> List[List[float]]:
+        """Return embedding vector(s) for the given text."""
+        pass
+
+    @abstractmethod
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        """Wrap a single message into the LLM’s expected prompt format."""
+        pass
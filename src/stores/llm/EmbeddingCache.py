@@ -0,0 +1,122 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from typing import List, Dict, Optional
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed SQLite store for embedding vectors.
+
+    Keys are sha256(provider, embedding model id, document_type, sha256(text)),
+    vectors are stored as float32 blobs and the table is trimmed back to
+    max_entries by least-recently-used access time. Thread-safe.
+    """
+
+    # SQLite's default limit on host parameters per statement is 999
+    _SQL_BATCH = 500
+
+    def __init__(self, db_path: str, max_entries: int = 1_000_000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used_idx ON embeddings (last_used)"
+        )
+        self.connection.commit()
+
+        # Row count is tracked in memory so inserts don't need a COUNT(*) scan
+        self.entries = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def get_cache_key(
+        provider_name: str,
+        model_id: Optional[str],
+        text: str,
+        document_type: Optional[str] = None
+    ) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        raw = f"{provider_name}|{model_id}|{document_type}|{text_hash}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def load(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        now = time.time()
+
+        with self._lock:
+            for i in range(0, len(unique_keys), self._SQL_BATCH):
+                batch = unique_keys[i: i + self._SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+            if found:
+                # Touch hits so LRU eviction keeps hot entries
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self.connection.commit()
+
+        return found
+
+    def store(self, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [
+                    (key, array("f", vector).tobytes(), now)
+                    for key, vector in vectors.items()
+                ]
+            )
+
+            self.entries += len(vectors)
+            if self.entries > self.max_entries:
+                # The estimate counts replaced rows too, so confirm before evicting
+                self.entries = self.connection.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+
+            overflow = self.entries - self.max_entries
+            if overflow > 0:
+                self.connection.execute(
+                    """
+                    DELETE FROM embeddings WHERE key IN (
+                        SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,)
+                )
+                self.entries -= overflow
+                self.logger.info(f"Evicted {overflow} embeddings from cache.")
+
+            self.connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
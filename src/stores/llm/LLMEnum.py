@@ -3,6 +3,7 @@ from enum import Enum
 class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
+    OFFLINE = "OFFLINE"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
@@ -17,6 +18,11 @@ class CoHereEnums(Enum):
     DOCUMENT = "search_document"
     QUERY = "search_query"
 
+class OfflineEnums(Enum):
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
+
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
     QUERY = "query"
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Union, Tuple, Optional, Dict
+from typing import List, Union, Tuple, Optional, Dict, Iterator
 
 class LLMInterface(ABC):
     """Base interface for any LLM provider (sync or async)."""
@@ -28,6 +28,21 @@ class LLMInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Generate text from a prompt, yielding it piece by piece as it arrives.
+        The user turn and the full reply are appended to chat_history only
+        once the stream completes; errors are raised to the caller.
+        """
+        pass
+
     @abstractmethod
     def embed_text(
         self,
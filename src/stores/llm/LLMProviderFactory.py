@@ -1,5 +1,7 @@
+import httpx
+
 from .LLMEnum import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider
+from .ProviderScheduler import ProviderScheduler
 
 from helpers.config import Settings
 
@@ -8,7 +10,9 @@ class LLMProviderFactory:
         self.config = config
 
     def create(self, provider: str):
+        # Providers are imported here so unused SDKs are never loaded
         if provider == LLMEnums.OPENAI.value:
+            from .providers.OpenAIProvider import OpenAIProvider
             return OpenAIProvider(
                 api_key=self.config.OPENAI_API_KEY,
                 api_url=self.config.OPENAI_API_URL,
@@ -18,6 +22,7 @@ class LLMProviderFactory:
             )
         
         if provider == LLMEnums.COHERE.value:
+            from .providers.CoHereProvider import CoHereProvider
             return CoHereProvider(
                 api_key=self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
@@ -25,4 +30,104 @@ class LLMProviderFactory:
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
             )
         
+        if provider == LLMEnums.OFFLINE.value:
+            from .providers.OfflineProvider import OfflineProvider
+            return OfflineProvider(
+                seed=self.config.OFFLINE_LLM_SEED,
+                latency_ms=self.config.OFFLINE_LLM_LATENCY_MS,
+                token_latency_ms=self.config.OFFLINE_LLM_TOKEN_LATENCY_MS,
+                error_rate=self.config.OFFLINE_LLM_ERROR_RATE,
+                error_status_code=self.config.OFFLINE_LLM_ERROR_STATUS_CODE,
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+            )
+
+        return None
+
+    def create_http_client(self) -> httpx.AsyncClient:
+        """One keep-alive pool shared by every async provider in the process."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.config.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=self.get_timeout(),
+        )
+
+    def get_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            self.config.LLM_READ_TIMEOUT_SECONDS,
+            connect=self.config.LLM_CONNECT_TIMEOUT_SECONDS,
+        )
+
+    def create_scheduler(self, name: str) -> ProviderScheduler:
+        """Admission control shared by every caller of one async client."""
+        return ProviderScheduler(
+            name=name,
+            requests_per_minute=self.config.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=self.config.LLM_TOKENS_PER_MINUTE,
+            initial_concurrency=self.config.LLM_INITIAL_CONCURRENCY,
+            min_concurrency=self.config.LLM_MIN_CONCURRENCY,
+            max_concurrency=self.config.LLM_MAX_CONCURRENCY,
+            default_cooldown=self.config.LLM_RATE_LIMIT_COOLDOWN_SECONDS,
+        )
+
+    def create_async(self, provider: str, http_client: httpx.AsyncClient, name: str = None):
+        scheduler = None
+        if self.config.LLM_SCHEDULER_ENABLED:
+            scheduler = self.create_scheduler(name=name or provider)
+
+        if provider == LLMEnums.OPENAI.value:
+            from .providers.AsyncOpenAIProvider import AsyncOpenAIProvider
+            return AsyncOpenAIProvider(
+                api_key=self.config.OPENAI_API_KEY,
+                api_url=self.config.OPENAI_API_URL,
+                http_client=http_client,
+                timeout=self.get_timeout(),
+                max_retries=self.config.LLM_MAX_RETRIES,
+                retry_base_delay=self.config.LLM_RETRY_BASE_DELAY_SECONDS,
+                retry_max_delay=self.config.LLM_RETRY_MAX_DELAY_SECONDS,
+                scheduler=scheduler,
+                bulk_max_retries=self.config.LLM_BULK_MAX_RETRIES,
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+            )
+
+        if provider == LLMEnums.COHERE.value:
+            from .providers.AsyncCoHereProvider import AsyncCoHereProvider
+            return AsyncCoHereProvider(
+                api_key=self.config.COHERE_API_KEY,
+                http_client=http_client,
+                timeout=self.config.LLM_READ_TIMEOUT_SECONDS,
+                max_retries=self.config.LLM_MAX_RETRIES,
+                retry_base_delay=self.config.LLM_RETRY_BASE_DELAY_SECONDS,
+                retry_max_delay=self.config.LLM_RETRY_MAX_DELAY_SECONDS,
+                scheduler=scheduler,
+                bulk_max_retries=self.config.LLM_BULK_MAX_RETRIES,
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+            )
+
+        if provider == LLMEnums.OFFLINE.value:
+            from .providers.AsyncOfflineProvider import AsyncOfflineProvider
+            return AsyncOfflineProvider(
+                seed=self.config.OFFLINE_LLM_SEED,
+                latency_ms=self.config.OFFLINE_LLM_LATENCY_MS,
+                token_latency_ms=self.config.OFFLINE_LLM_TOKEN_LATENCY_MS,
+                error_rate=self.config.OFFLINE_LLM_ERROR_RATE,
+                error_status_code=self.config.OFFLINE_LLM_ERROR_STATUS_CODE,
+                max_retries=self.config.LLM_MAX_RETRIES,
+                retry_base_delay=self.config.LLM_RETRY_BASE_DELAY_SECONDS,
+                retry_max_delay=self.config.LLM_RETRY_MAX_DELAY_SECONDS,
+                scheduler=scheduler,
+                bulk_max_retries=self.config.LLM_BULK_MAX_RETRIES,
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+            )
+
         return None
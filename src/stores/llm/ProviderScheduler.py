@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+
+import httpx
+
+class CallPriority(IntEnum):
+    INTERACTIVE = 0     # query embeddings, generation: a user is waiting
+    BULK = 1            # indexing: throughput matters, latency does not
+
+class TokenBucket:
+    """Refills rate_per_second up to capacity; a None rate means unlimited."""
+
+    def __init__(self, rate_per_second: Optional[float], capacity: Optional[float] = None):
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else (rate_per_second or 0)
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def get_wait(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if now)."""
+        if self.rate is None:
+            return 0.0
+        self.refill()
+        # A request larger than the whole bucket waits for a full bucket, then overdraws
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.rate is not None:
+            self.level -= amount
+
+class ProviderScheduler:
+    """
+    Admission control for one provider client, shared by all its callers.
+
+    A call waits for a concurrency slot and for room in the request and token
+    buckets. The concurrency limit is AIMD: it grows by 1/limit per success and
+    halves when the provider pushes back (a 429, or a 5xx/timeout). A 429 also
+    pauses all admissions for the Retry-After the provider sent. Waiting calls are admitted strictly by
+    priority, so interactive calls overtake queued bulk calls.
+    Not thread-safe; use it from the event loop.
+    """
+
+    # Rough chars per token for sizing a call against the token bucket
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        default_cooldown: float = 1.0
+    ):
+        self.name = name
+        # Bursts: up to one second's worth of requests and ten seconds' worth of tokens
+        request_rate = requests_per_minute / 60 if requests_per_minute else None
+        token_rate = tokens_per_minute / 60 if tokens_per_minute else None
+        self.request_bucket = TokenBucket(request_rate, capacity=max(request_rate, 1) if request_rate else None)
+        self.token_bucket = TokenBucket(token_rate, capacity=token_rate * 10 if token_rate else None)
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.default_cooldown = default_cooldown
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.decreased_at = float("-inf")
+        # (priority, sequence, cost, future)
+        self.waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self.sequence = itertools.count()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+        self.admitted = {priority.name.lower(): 0 for priority in CallPriority}
+        self.rate_limited = 0
+        self.overloaded = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: CallPriority = CallPriority.INTERACTIVE,
+        cost: float = 0,
+        retryable: Tuple[Type[BaseException], ...] = ()
+    ) -> AsyncIterator[None]:
+        """
+        Hold one admission for the duration of a provider call. A retryable
+        error raised inside counts as push-back (a 429, or an overload for
+        anything else) and is re-raised; other errors release neutrally.
+        """
+        await self.acquire(priority=priority, cost=cost)
+        try:
+            yield
+        except retryable as e:
+            self.release(error=e)
+            raise
+        except BaseException:
+            self.release(succeeded=False)
+            raise
+        self.release(succeeded=True)
+
+    async def acquire(self, priority: CallPriority, cost: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (int(priority), next(self.sequence), cost, future))
+        self.dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller gave up: hand the slot back
+                self.in_flight -= 1
+                self.dispatch()
+            raise
+        self.admitted[CallPriority(priority).name.lower()] += 1
+
+    def release(self, succeeded: bool = False, error: Optional[BaseException] = None) -> None:
+        self.in_flight -= 1
+
+        if succeeded:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        elif error is not None:
+            if self.get_status_code(error) == 429:
+                self.rate_limited += 1
+                self.back_off(cooldown=self.get_retry_after(error) or self.default_cooldown)
+            else:
+                self.overloaded += 1
+                self.back_off(cooldown=0.0)
+
+        self.dispatch()
+
+    def back_off(self, cooldown: float) -> None:
+        now = time.monotonic()
+        if cooldown > 0:
+            self.paused_until = max(self.paused_until, now + cooldown)
+
+        # Calls in flight together fail together; halve once per burst, not once per call
+        if now - self.decreased_at < self.default_cooldown:
+            return
+        self.decreased_at = now
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        self.logger.warning(
+            f"{self.name}: provider pushed back, concurrency limit {self.limit:.1f}"
+            + (f", pausing {cooldown:.2f}s" if cooldown > 0 else "")
+        )
+
+    def dispatch(self) -> None:
+        """Admit waiting calls, best priority first, while limits allow."""
+        while self.waiters and self.waiters[0][3].done():
+            # Cancelled before admission
+            heapq.heappop(self.waiters)
+
+        while self.waiters and self.in_flight < int(self.limit):
+            _, _, cost, future = self.waiters[0]
+            if future.done():
+                heapq.heappop(self.waiters)
+                continue
+
+            wait = max(
+                self.paused_until - time.monotonic(),
+                self.request_bucket.get_wait(1),
+                self.token_bucket.get_wait(cost),
+            )
+            if wait > 0:
+                self.schedule_dispatch(wait)
+                return
+
+            heapq.heappop(self.waiters)
+            self.request_bucket.take(1)
+            self.token_bucket.take(cost)
+            self.in_flight += 1
+            future.set_result(None)
+
+    def schedule_dispatch(self, delay: float) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+
+        def run():
+            self.timer = None
+            self.dispatch()
+
+        self.timer = asyncio.get_running_loop().call_later(delay, run)
+
+    @classmethod
+    def estimate_tokens(cls, texts: List[str]) -> int:
+        return sum(len(text) for text in texts) // cls.CHARS_PER_TOKEN + 1
+
+    def get_status_code(self, error: BaseException) -> Optional[int]:
+        status_code = getattr(error, "status_code", None)
+        if status_code is None and isinstance(getattr(error, "response", None), httpx.Response):
+            status_code = error.response.status_code
+        return status_code
+
+    def get_retry_after(self, error: BaseException) -> Optional[float]:
+        """Seconds from a Retry-After header (delta or HTTP date), if the error carries one."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+        if not headers:
+            return None
+
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, object]:
+        queued = {priority.name.lower(): 0 for priority in CallPriority}
+        for priority, _, _, future in self.waiters:
+            if not future.done():
+                queued[CallPriority(priority).name.lower()] += 1
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": queued,
+            "admitted": dict(self.admitted),
+            "rate_limited": self.rate_limited,
+            "overloaded": self.overloaded,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 3),
+        }
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from .ProviderScheduler import ProviderScheduler, CallPriority
+from helpers.metrics import LLM_REQUEST_SECONDS, LLM_REQUEST_FAILURES
+
+T = TypeVar("T")
+
+class RetryPolicy:
+    """
+    Retries transient provider errors with exponential backoff and full jitter:
+    attempt n sleeps uniform(0, min(max_delay, base_delay * 2**n)), so clients
+    that failed together don't all retry together.
+
+    With a scheduler, every attempt is admitted by it and reports back how
+    the provider answered; a Retry-After from the provider overrides a
+    shorter backoff. Each call's total time (waits and retries included) and
+    final failures are recorded per backend and operation.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retryable: Tuple[Type[BaseException], ...] = (),
+        scheduler: Optional[ProviderScheduler] = None,
+        bulk_max_retries: Optional[int] = None,
+        backend: str = "unknown"
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+        self.scheduler = scheduler
+        # Bulk work can afford to wait out a long rate limit instead of dropping data
+        self.bulk_max_retries = bulk_max_retries if bulk_max_retries is not None else max_retries
+        self.backend = backend
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = self.scheduler.get_retry_after(error) if self.scheduler and error else None
+        return max(delay, retry_after or 0.0)
+
+    def get_max_retries(self, priority: CallPriority) -> int:
+        return self.bulk_max_retries if priority == CallPriority.BULK else self.max_retries
+
+    async def backoff(self, attempt: int, error: BaseException, description: str, max_retries: int) -> None:
+        delay = self.get_delay(attempt, error)
+        self.logger.warning(
+            f"{description} failed ({type(error).__name__}), "
+            f"retry {attempt + 1}/{max_retries} in {delay:.2f}s"
+        )
+        await asyncio.sleep(delay)
+
+    async def attempt(self, func: Callable[[], Awaitable[T]], priority: CallPriority, cost: float) -> T:
+        if self.scheduler is None:
+            return await func()
+        async with self.scheduler.slot(priority=priority, cost=cost, retryable=self.retryable):
+            return await func()
+
+    async def run(
+        self,
+        func: Callable[[], Awaitable[T]],
+        description: str = "call",
+        priority: CallPriority = CallPriority.INTERACTIVE,
+        cost: float = 0,
+        operation: str = "call"
+    ) -> T:
+        max_retries = self.get_max_retries(priority)
+        attempt = 0
+        started_at = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return await self.attempt(func, priority=priority, cost=cost)
+                except self.retryable as e:
+                    if attempt >= max_retries:
+                        raise
+                    await self.backoff(attempt, e, description, max_retries)
+                    attempt += 1
+        except Exception:
+            LLM_REQUEST_FAILURES.labels(self.backend, operation).inc()
+            raise
+        finally:
+            LLM_REQUEST_SECONDS.labels(self.backend, operation).observe(time.perf_counter() - started_at)
+
+    async def stream(
+        self,
+        open_stream: Callable[[], AsyncIterator[T]],
+        description: str = "stream",
+        priority: CallPriority = CallPriority.INTERACTIVE,
+        cost: float = 0,
+        operation: str = "stream"
+    ) -> AsyncIterator[T]:
+        """
+        Relay items from open_stream(), reopening it on a transient error only
+        while nothing has been yielded yet; a stream that fails midway raises.
+        A scheduler slot is held until the stream ends.
+        """
+        max_retries = self.get_max_retries(priority)
+        attempt = 0
+        started_at = time.perf_counter()
+        try:
+            while True:
+                started = False
+                try:
+                    # aclosing shuts the provider stream (and its HTTP response) as soon as
+                    # this generator is closed, not whenever it gets garbage collected
+                    if self.scheduler is None:
+                        async with aclosing(open_stream()) as items:
+                            async for item in items:
+                                started = True
+                                yield item
+                    else:
+                        async with self.scheduler.slot(priority=priority, cost=cost, retryable=self.retryable):
+                            async with aclosing(open_stream()) as items:
+                                async for item in items:
+                                    started = True
+                                    yield item
+                    return
+                except self.retryable as e:
+                    if started or attempt >= max_retries:
+                        raise
+                    await self.backoff(attempt, e, description, max_retries)
+                    attempt += 1
+        except Exception:
+            LLM_REQUEST_FAILURES.labels(self.backend, operation).inc()
+            raise
+        finally:
+            LLM_REQUEST_SECONDS.labels(self.backend, operation).observe(time.perf_counter() - started_at)
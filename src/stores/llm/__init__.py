@@ -1,2 +1,7 @@
 from .LLMInterface import LLMInterface
-from .LLMProviderFactory import LLMProviderFactory
\ No newline at end of file
+from .LLMProviderFactory import LLMProviderFactory
+from .AsyncLLMInterface import AsyncLLMInterface
+from .AsyncCachedEmbeddingProvider import AsyncCachedEmbeddingProvider
+from .AsyncBatchingEmbeddingProvider import AsyncBatchingEmbeddingProvider
+from .EmbeddingCache import EmbeddingCache
+from .RetryPolicy import RetryPolicy
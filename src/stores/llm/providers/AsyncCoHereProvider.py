@@ -0,0 +1,216 @@
+import httpx
+import cohere
+import logging
+from typing import Union, List, Tuple, Optional, AsyncIterator
+
+from ..AsyncLLMInterface import AsyncLLMInterface
+from ..LLMEnum import LLMEnums, CoHereEnums, DocumentTypeEnum
+from ..RetryPolicy import RetryPolicy
+from ..ProviderScheduler import ProviderScheduler, CallPriority
+from helpers.metrics import LLM_EMBEDDING_BATCH_SIZE
+
+class AsyncCoHereProvider(AsyncLLMInterface):
+    """
+    Cohere provider on cohere.AsyncClient, sharing the caller's httpx pool
+    and retrying transient errors through RetryPolicy.
+    """
+
+    RETRYABLE_ERRORS = (
+        cohere.errors.TooManyRequestsError,
+        cohere.errors.ServiceUnavailableError,
+        cohere.errors.InternalServerError,
+        cohere.errors.GatewayTimeoutError,
+        httpx.TimeoutException,
+        httpx.TransportError,
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        http_client: httpx.AsyncClient = None,
+        timeout: float = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        scheduler: ProviderScheduler = None,
+        bulk_max_retries: int = None,
+        default_input_max_characters: int=1000,
+        default_generation_max_output_tokens: int=1000,
+        default_generation_temperature: float=0.1
+    ):
+        self.api_key = api_key
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generate_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.client = cohere.AsyncClient(
+            api_key=self.api_key,
+            timeout=timeout,
+            httpx_client=http_client,
+        )
+        self.scheduler = scheduler
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            retryable=self.RETRYABLE_ERRORS,
+            scheduler=scheduler,
+            bulk_max_retries=bulk_max_retries,
+            backend=LLMEnums.COHERE.value
+        )
+
+        self.enums = CoHereEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.generate_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: List[dict] = None,
+        max_output_tokens: int = None,
+        temperature: float = None
+    ) -> Tuple[Optional[str], List[dict]]:
+        """
+        Returns (response_text, updated_chat_history)
+        """
+        if not self.client or not self.generate_model_id:
+            self.logger.error("Cohere client or model ID not set.")
+            return None, chat_history or []
+
+        chat_history = chat_history or []
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        try:
+            # send only prior history + the new message
+            response = await self.retry_policy.run(
+                lambda: self.client.chat(
+                    model=self.generate_model_id,
+                    chat_history=chat_history,
+                    message=prompt,
+                    max_tokens=max_output_tokens,
+                    temperature=temperature
+                ),
+                description="Cohere chat",
+                operation="generation",
+                cost=self.estimate_chat_tokens(chat_history, prompt, max_output_tokens)
+            )
+        except Exception as e:
+            self.logger.exception(f"Error in Cohere chat: {e}")
+            return None, chat_history
+
+        if not response or not response.text:
+            self.logger.error("Empty response from Cohere.")
+            return None, chat_history
+
+        # now append the turn to history for next time
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+        chat_history.append(self.construct_prompt(response.text, self.enums.ASSISTANT.value))
+
+        return response.text, chat_history
+
+    async def stream_text(
+        self,
+        prompt: str,
+        chat_history: List[dict] = None,
+        max_output_tokens: int = None,
+        temperature: float = None
+    ) -> AsyncIterator[str]:
+        if not self.client or not self.generate_model_id:
+            raise RuntimeError("Cohere client or model ID not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        async def open_stream():
+            async for event in self.client.chat_stream(
+                model=self.generate_model_id,
+                chat_history=chat_history,
+                message=prompt,
+                max_tokens=max_output_tokens,
+                temperature=temperature
+            ):
+                if event.event_type == "text-generation" and event.text:
+                    yield event.text
+
+        parts = []
+        async for text in self.retry_policy.stream(
+            open_stream,
+            description="Cohere chat stream",
+            operation="generation_stream",
+            cost=self.estimate_chat_tokens(chat_history, prompt, max_output_tokens)
+        ):
+            parts.append(text)
+            yield text
+
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+        chat_history.append(self.construct_prompt("".join(parts).strip(), self.enums.ASSISTANT.value))
+
+    async def embed_text(self, text: Union[str, List[str]], document_type: str=None):
+        if not self.client:
+            self.logger.error("CoHere client was not set.")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set.")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        input_type= self.enums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = self.enums.QUERY.value
+
+        LLM_EMBEDDING_BATCH_SIZE.labels(self.retry_policy.backend, document_type or DocumentTypeEnum.DOCUMENT.value).observe(len(text))
+        try:
+            response = await self.retry_policy.run(
+                lambda: self.client.embed(
+                    texts=text,
+                    model=self.embedding_model_id,
+                    input_type=input_type,
+                    embedding_types=['float']
+                ),
+                description="Cohere embedding",
+                operation="embedding",
+                # Document embeddings come from indexing and yield to queries
+                priority=CallPriority.INTERACTIVE if document_type == DocumentTypeEnum.QUERY.value else CallPriority.BULK,
+                cost=ProviderScheduler.estimate_tokens(text)
+            )
+        except Exception as e:
+            self.logger.exception(f"Error in Cohere embedding: {e}")
+            return None
+
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
+            return None
+
+        return [f for f in response.embeddings.float]
+
+    def estimate_chat_tokens(self, chat_history: List[dict], prompt: str, max_output_tokens: int) -> int:
+        texts = [message.get("message") or "" for message in chat_history] + [prompt]
+        return ProviderScheduler.estimate_tokens(texts) + (max_output_tokens or 0)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "message": prompt
+        }
+
+    def process_text(self, text: str):
+        # Cut if to large and remove start and end /n and space
+        return text[:self.default_input_max_characters].strip()
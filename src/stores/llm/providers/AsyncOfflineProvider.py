@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Union, List, Optional, Tuple, Dict, AsyncIterator
+
+from ..AsyncLLMInterface import AsyncLLMInterface
+from ..LLMEnum import LLMEnums, OfflineEnums, DocumentTypeEnum
+from ..RetryPolicy import RetryPolicy
+from ..ProviderScheduler import ProviderScheduler, CallPriority
+from helpers.metrics import LLM_EMBEDDING_BATCH_SIZE
+from .OfflineProvider import OfflineProvider, OfflineProviderError
+
+
+class AsyncOfflineProvider(AsyncLLMInterface):
+    """
+    Async OfflineProvider. Latency is awaited instead of slept, and injected
+    errors go through RetryPolicy and the scheduler exactly like a real
+    provider's, so retries and back-off can be load-tested offline.
+    """
+
+    RETRYABLE_ERRORS = (OfflineProviderError,)
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: float = 0,
+        token_latency_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status_code: int = 503,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        scheduler: ProviderScheduler = None,
+        bulk_max_retries: int = None,
+        default_input_max_characters: int = 1000,
+        default_generation_max_output_tokens: int = 1000,
+        default_generation_temperature: float = 0.1
+    ):
+        # Embedding and echo logic is shared with the sync provider; only waiting differs
+        self.provider = OfflineProvider(
+            seed=seed,
+            latency_ms=0,
+            token_latency_ms=0,
+            error_rate=error_rate,
+            error_status_code=error_status_code,
+            default_input_max_characters=default_input_max_characters,
+            default_generation_max_output_tokens=default_generation_max_output_tokens,
+            default_generation_temperature=default_generation_temperature,
+        )
+        self.latency_seconds = latency_ms / 1000
+        self.token_latency_seconds = token_latency_ms / 1000
+
+        self.scheduler = scheduler
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            retryable=self.RETRYABLE_ERRORS,
+            scheduler=scheduler,
+            bulk_max_retries=bulk_max_retries,
+            backend=LLMEnums.OFFLINE.value
+        )
+
+        self.enums = OfflineEnums
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def generate_model_id(self) -> Optional[str]:
+        return self.provider.generate_model_id
+
+    @property
+    def embedding_model_id(self) -> Optional[str]:
+        return self.provider.embedding_model_id
+
+    @property
+    def embedding_size(self) -> Optional[int]:
+        return self.provider.embedding_size
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.provider.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        if not self.generate_model_id:
+            self.logger.error("Offline generation model was not set.")
+            return None, chat_history or []
+
+        chat_history = chat_history or []
+        max_output_tokens = max_output_tokens or self.provider.default_generation_max_output_tokens
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        async def call():
+            await asyncio.sleep(self.latency_seconds)
+            self.provider.maybe_fail("generation")
+            words = self.provider.get_reply_words(prompt, max_output_tokens)
+            await asyncio.sleep(self.token_latency_seconds * len(words))
+            return " ".join(words)
+
+        try:
+            reply = await self.retry_policy.run(
+                call,
+                description="Offline chat",
+                operation="generation",
+                cost=self.estimate_chat_tokens(chat_history, max_output_tokens)
+            )
+        except Exception as e:
+            self.logger.exception(f"Offline chat call failed: {e}")
+            return None, chat_history
+
+        chat_history.append(self.construct_prompt(reply, self.enums.ASSISTANT.value))
+        return reply, chat_history
+
+    async def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        if not self.generate_model_id:
+            raise RuntimeError("Offline generation model was not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+        max_output_tokens = max_output_tokens or self.provider.default_generation_max_output_tokens
+        user_message = self.construct_prompt(prompt, self.enums.USER.value)
+
+        async def open_stream():
+            await asyncio.sleep(self.latency_seconds)
+            self.provider.maybe_fail("generation")
+            for i, word in enumerate(self.provider.get_reply_words(prompt, max_output_tokens)):
+                await asyncio.sleep(self.token_latency_seconds)
+                yield word if i == 0 else f" {word}"
+
+        parts = []
+        async for text in self.retry_policy.stream(
+            open_stream,
+            description="Offline chat stream",
+            operation="generation_stream",
+            cost=self.estimate_chat_tokens(chat_history + [user_message], max_output_tokens)
+        ):
+            parts.append(text)
+            yield text
+
+        chat_history.append(user_message)
+        chat_history.append(self.construct_prompt("".join(parts), self.enums.ASSISTANT.value))
+
+    async def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: Optional[str] = None
+    ) -> List[List[float]]:
+        if not self.embedding_model_id or not self.embedding_size:
+            self.logger.error("Offline embedding model was not set.")
+            return None
+
+        texts = [text] if isinstance(text, str) else text
+        LLM_EMBEDDING_BATCH_SIZE.labels(self.retry_policy.backend, document_type or DocumentTypeEnum.DOCUMENT.value).observe(len(texts))
+
+        async def call():
+            await asyncio.sleep(self.latency_seconds)
+            self.provider.maybe_fail("embedding")
+            # A real provider spends no local CPU; keep the hashing off the event loop
+            return await asyncio.to_thread(self.provider.get_embeddings, texts)
+
+        try:
+            return await self.retry_policy.run(
+                call,
+                description="Offline embedding",
+                operation="embedding",
+                priority=CallPriority.INTERACTIVE if document_type == DocumentTypeEnum.QUERY.value else CallPriority.BULK,
+                cost=ProviderScheduler.estimate_tokens(texts)
+            )
+        except Exception as e:
+            self.logger.exception(f"Offline embedding call failed: {e}")
+            return None
+
+    def estimate_chat_tokens(self, messages: List[Dict[str, str]], max_output_tokens: int) -> int:
+        return ProviderScheduler.estimate_tokens([message.get("content") or "" for message in messages]) + (max_output_tokens or 0)
+
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        return self.provider.construct_prompt(prompt=prompt, role=role)
+
+    def process_text(self, text: str) -> str:
+        return self.provider.process_text(text)
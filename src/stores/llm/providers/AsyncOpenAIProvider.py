@@ -0,0 +1,210 @@
+import httpx
+import openai
+from openai import AsyncOpenAI
+import logging
+from typing import Union, List, Optional, Tuple, Dict, AsyncIterator
+
+from ..AsyncLLMInterface import AsyncLLMInterface
+from ..LLMEnum import LLMEnums, OpenAIEnums, DocumentTypeEnum
+from ..RetryPolicy import RetryPolicy
+from ..ProviderScheduler import ProviderScheduler, CallPriority
+from helpers.metrics import LLM_EMBEDDING_BATCH_SIZE
+
+
+class AsyncOpenAIProvider(AsyncLLMInterface):
+    """
+    OpenAI provider on the async SDK client. The httpx client is shared
+    (keep-alive pool owned by the caller); retries are done by RetryPolicy,
+    so the SDK's own retries are turned off.
+    """
+
+    RETRYABLE_ERRORS = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = None,
+        http_client: httpx.AsyncClient = None,
+        timeout: httpx.Timeout = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        scheduler: ProviderScheduler = None,
+        bulk_max_retries: int = None,
+        default_input_max_characters: int = 1000,
+        default_generation_max_output_tokens: int = 1000,
+        default_generation_temperature: float = 0.1
+    ):
+        self.api_key = api_key
+        self.api_url = api_url
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generate_model_id: Optional[str] = None
+        self.embedding_model_id: Optional[str] = None
+        self.embedding_size: Optional[int] = None
+
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url if self.api_url and len(self.api_key) else None,
+            http_client=http_client,
+            timeout=timeout if timeout is not None else openai.NOT_GIVEN,
+            max_retries=0
+        )
+        self.scheduler = scheduler
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            retryable=self.RETRYABLE_ERRORS,
+            scheduler=scheduler,
+            bulk_max_retries=bulk_max_retries,
+            backend=LLMEnums.OPENAI.value
+        )
+
+        self.enums = OpenAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.generate_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    async def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        if not self.client or not self.generate_model_id:
+            self.logger.error("OpenAI client or model ID not set.")
+            return None, chat_history or []
+
+        chat_history = chat_history or []
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        # Append user message
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        try:
+            response = await self.retry_policy.run(
+                lambda: self.client.chat.completions.create(
+                    model=self.generate_model_id,
+                    messages=chat_history,
+                    max_tokens=max_output_tokens,
+                    temperature=temperature
+                ),
+                description="OpenAI chat",
+                operation="generation",
+                cost=self.estimate_chat_tokens(chat_history, max_output_tokens)
+            )
+        except Exception as e:
+            self.logger.exception(f"OpenAI chat call failed: {e}")
+            return None, chat_history
+
+        if not response or not response.choices or not response.choices[0].message:
+            self.logger.error("Empty or invalid response from OpenAI.")
+            return None, chat_history
+
+        assistant_reply = response.choices[0].message.content.strip()
+        chat_history.append(self.construct_prompt(assistant_reply, self.enums.ASSISTANT.value))
+
+        return assistant_reply, chat_history
+
+    async def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        if not self.client or not self.generate_model_id:
+            raise RuntimeError("OpenAI client or model ID not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        user_message = self.construct_prompt(prompt, self.enums.USER.value)
+
+        async def open_stream():
+            stream = await self.client.chat.completions.create(
+                model=self.generate_model_id,
+                messages=chat_history + [user_message],
+                max_tokens=max_output_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        parts = []
+        async for text in self.retry_policy.stream(
+            open_stream,
+            description="OpenAI chat stream",
+            operation="generation_stream",
+            cost=self.estimate_chat_tokens(chat_history + [user_message], max_output_tokens)
+        ):
+            parts.append(text)
+            yield text
+
+        chat_history.append(user_message)
+        chat_history.append(self.construct_prompt("".join(parts).strip(), self.enums.ASSISTANT.value))
+
+    async def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: str = None
+    ) -> List[List[float]]:
+        if not self.client or not self.embedding_model_id:
+            self.logger.error("OpenAI embedding setup incomplete.")
+            return []
+
+        texts = [text] if isinstance(text, str) else text
+
+        LLM_EMBEDDING_BATCH_SIZE.labels(self.retry_policy.backend, document_type or DocumentTypeEnum.DOCUMENT.value).observe(len(texts))
+        try:
+            response = await self.retry_policy.run(
+                lambda: self.client.embeddings.create(
+                    input=texts,
+                    model=self.embedding_model_id
+                ),
+                description="OpenAI embedding",
+                operation="embedding",
+                # Document embeddings come from indexing and yield to queries
+                priority=CallPriority.INTERACTIVE if document_type == DocumentTypeEnum.QUERY.value else CallPriority.BULK,
+                cost=ProviderScheduler.estimate_tokens(texts)
+            )
+        except Exception as e:
+            self.logger.exception(f"OpenAI embedding call failed: {e}")
+            return []
+
+        if not response or not response.data:
+            self.logger.error("Empty embedding response from OpenAI.")
+            return []
+
+        return [record.embedding for record in response.data]
+
+    def estimate_chat_tokens(self, messages: List[Dict[str, str]], max_output_tokens: int) -> int:
+        return ProviderScheduler.estimate_tokens([message.get("content") or "" for message in messages]) + (max_output_tokens or 0)
+
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        return {
+            "role": role,
+            "content": prompt
+        }
+
+    def process_text(self, text: str) -> str:
+        return text[:self.default_input_max_characters].strip()
@@ -1,6 +1,6 @@
 import cohere
 import logging
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Iterator
 
 from ..LLMInterface import LLMInterface
 from ..LLMEnum import CoHereEnums, DocumentTypeEnum
@@ -82,6 +82,36 @@ class CoHereProvider(LLMInterface):
         return response.text, chat_history
 
 
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: List[dict] = None,
+        max_output_tokens: int = None,
+        temperature: float = None
+    ) -> Iterator[str]:
+        if not self.client or not self.generate_model_id:
+            raise RuntimeError("Cohere client or model ID not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        parts = []
+        for event in self.client.chat_stream(
+            model=self.generate_model_id,
+            chat_history=chat_history,
+            message=prompt,
+            max_tokens=max_output_tokens,
+            temperature=temperature
+        ):
+            if event.event_type == "text-generation" and event.text:
+                parts.append(event.text)
+                yield event.text
+
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+        chat_history.append(self.construct_prompt("".join(parts).strip(), self.enums.ASSISTANT.value))
+
     def embed_text(self, text: Union[str, List[str]], document_type: str=None):
         if not self.client:
             self.logger.error("CoHere client was not set.")
@@ -0,0 +1,188 @@
+import hashlib
+import logging
+import random
+import re
+import time
+from functools import lru_cache
+from typing import Union, List, Optional, Tuple, Dict, Iterator
+
+import numpy as np
+
+from ..LLMInterface import LLMInterface
+from ..LLMEnum import OfflineEnums
+
+
+class OfflineProviderError(Exception):
+    """Injected failure; status_code lets the scheduler treat it like an HTTP error."""
+
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@lru_cache(maxsize=200_000)
+def get_token_vector(seed: int, model_id: str, size: int, token: str) -> np.ndarray:
+    digest = hashlib.blake2b(f"{seed}:{model_id}:{token}".encode("utf-8"), digest_size=8).digest()
+    vector = np.random.default_rng(int.from_bytes(digest, "little")).standard_normal(size).astype(np.float32)
+    vector.flags.writeable = False  # shared through the cache
+    return vector
+
+
+class OfflineProvider(LLMInterface):
+    """
+    Local stand-in for a real provider, for benchmarks and load tests:
+    no network, no API key, no cost.
+
+    Embeddings are feature-hashed: each token gets a fixed random vector
+    seeded by its hash, a text is the normalized sum of its tokens. The same
+    text always gets the same vector, and texts that share words end up close,
+    so search results stay meaningful. Generation echoes the end of the prompt.
+
+    latency_ms is added per call and token_latency_ms per generated word;
+    error_rate fails that share of calls with an OfflineProviderError.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: float = 0,
+        token_latency_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status_code: int = 503,
+        default_input_max_characters: int = 1000,
+        default_generation_max_output_tokens: int = 1000,
+        default_generation_temperature: float = 0.1
+    ):
+        self.seed = seed
+        self.latency_seconds = latency_ms / 1000
+        self.token_latency_seconds = token_latency_ms / 1000
+        self.error_rate = error_rate
+        self.error_status_code = error_status_code
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generate_model_id: Optional[str] = None
+        self.embedding_model_id: Optional[str] = None
+        self.embedding_size: Optional[int] = None
+
+        # Seeded so a run's failure pattern is reproducible
+        self.random = random.Random(seed)
+
+        self.enums = OfflineEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str) -> None:
+        self.generate_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def maybe_fail(self, operation: str) -> None:
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise OfflineProviderError(
+                f"Injected {operation} failure ({self.error_status_code})",
+                status_code=self.error_status_code,
+            )
+
+    def get_reply_words(self, prompt: str, max_output_tokens: Optional[int] = None) -> List[str]:
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        words = prompt.split()
+        # One word per output token, ending on the question in a RAG prompt
+        return ["Echo:"] + words[-max(max_output_tokens - 1, 1):]
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            tokens = self.TOKEN_PATTERN.findall(text.casefold()) or [text]
+            vector = np.zeros(self.embedding_size, dtype=np.float32)
+            for token in tokens:
+                vector += get_token_vector(self.seed, self.embedding_model_id or "", self.embedding_size, token)
+            norm = np.linalg.norm(vector)
+            vectors.append((vector / norm if norm else vector).tolist())
+        return vectors
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        if not self.generate_model_id:
+            self.logger.error("Offline generation model was not set.")
+            return None, chat_history or []
+
+        chat_history = chat_history or []
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        time.sleep(self.latency_seconds)
+        try:
+            self.maybe_fail("generation")
+        except OfflineProviderError as e:
+            self.logger.error(f"Offline generation failed: {e}")
+            return None, chat_history
+
+        words = self.get_reply_words(prompt, max_output_tokens)
+        time.sleep(self.token_latency_seconds * len(words))
+
+        reply = " ".join(words)
+        chat_history.append(self.construct_prompt(reply, self.enums.ASSISTANT.value))
+        return reply, chat_history
+
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Iterator[str]:
+        if not self.generate_model_id:
+            raise RuntimeError("Offline generation model was not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+
+        time.sleep(self.latency_seconds)
+        self.maybe_fail("generation")
+
+        parts = []
+        for i, word in enumerate(self.get_reply_words(prompt, max_output_tokens)):
+            time.sleep(self.token_latency_seconds)
+            parts.append(word if i == 0 else f" {word}")
+            yield parts[-1]
+
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+        chat_history.append(self.construct_prompt("".join(parts), self.enums.ASSISTANT.value))
+
+    def embed_text(
+        self,
+        text: Union[str, List[str]],
+        document_type: Optional[str] = None
+    ) -> List[List[float]]:
+        if not self.embedding_model_id or not self.embedding_size:
+            self.logger.error("Offline embedding model was not set.")
+            return None
+
+        texts = [text] if isinstance(text, str) else text
+
+        time.sleep(self.latency_seconds)
+        try:
+            self.maybe_fail("embedding")
+        except OfflineProviderError as e:
+            self.logger.error(f"Offline embedding failed: {e}")
+            return None
+
+        return self.get_embeddings(texts)
+
+    def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
+        return {
+            "role": role,
+            "content": prompt
+        }
+
+    def process_text(self, text: str) -> str:
+        return text[:self.default_input_max_characters].strip()
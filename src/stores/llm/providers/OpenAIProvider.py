@@ -1,6 +1,6 @@
 from openai import OpenAI
 import logging
-from typing import Union, List, Optional, Tuple, Dict
+from typing import Union, List, Optional, Tuple, Dict, Iterator
 
 from ..LLMInterface import LLMInterface
 from ..LLMEnum import OpenAIEnums
@@ -80,6 +80,38 @@ class OpenAIProvider(LLMInterface):
 
         return assistant_reply, chat_history
 
+    def stream_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Iterator[str]:
+        if not self.client or not self.generate_model_id:
+            raise RuntimeError("OpenAI client or model ID not set.")
+
+        chat_history = chat_history if chat_history is not None else []
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature or self.default_generation_temperature
+
+        user_message = self.construct_prompt(prompt, self.enums.USER.value)
+        stream = self.client.chat.completions.create(
+            model=self.generate_model_id,
+            messages=chat_history + [user_message],
+            max_tokens=max_output_tokens,
+            temperature=temperature,
+            stream=True
+        )
+
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+
+        chat_history.append(user_message)
+        chat_history.append(self.construct_prompt("".join(parts).strip(), self.enums.ASSISTANT.value))
+
     def embed_text(
         self,
         text: Union[str, List[str]],
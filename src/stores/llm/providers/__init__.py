@@ -1,2 +1,23 @@
-from .CoHereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
\ No newline at end of file
+import importlib
+
+# Provider modules are imported on first access so only the configured
+# backend's SDK (openai / cohere) gets loaded.
+_PROVIDERS = {
+    "CoHereProvider": ".CoHereProvider",
+    "OpenAIProvider": ".OpenAIProvider",
+    "AsyncCoHereProvider": ".AsyncCoHereProvider",
+    "AsyncOpenAIProvider": ".AsyncOpenAIProvider",
+    "OfflineProvider": ".OfflineProvider",
+    "AsyncOfflineProvider": ".AsyncOfflineProvider",
+}
+
+def __getattr__(name: str):
+    if name in _PROVIDERS:
+        module = importlib.import_module(_PROVIDERS[name], __name__)
+        # Importing the submodule binds its name on this package; rebind it to the class.
+        # Any direct submodule import (e.g. AsyncOfflineProvider importing OfflineProvider)
+        # binds the module first and this hook never runs for that name, so in-tree
+        # code imports classes from their submodules instead of from the package.
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
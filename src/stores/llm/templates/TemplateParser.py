@@ -0,0 +1,37 @@
+import importlib
+import os
+from typing import Dict, Optional
+
+class TemplateParser:
+    """
+    Loads prompt templates from locales/<language>/<group>.py, where each key
+    is a string.Template; falls back to the default language when the
+    requested one has no such group.
+    """
+
+    def __init__(self, language: Optional[str] = None, default_language: str = "en"):
+        self.current_path = os.path.dirname(os.path.abspath(__file__))
+        self.default_language = default_language
+        self.language = None
+
+        self.set_language(language)
+
+    def set_language(self, language: Optional[str]) -> None:
+        if language and os.path.exists(os.path.join(self.current_path, "locales", language)):
+            self.language = language
+        else:
+            self.language = self.default_language
+
+    def get(self, group: str, key: str, vars: Optional[Dict[str, object]] = None) -> Optional[str]:
+        if not group or not key:
+            return None
+
+        language = self.language
+        if not os.path.exists(os.path.join(self.current_path, "locales", language, f"{group}.py")):
+            language = self.default_language
+
+        module = importlib.import_module(f"{__package__}.locales.{language}.{group}")
+        template = getattr(module, key, None)
+        if template is None:
+            return None
+        return template.substitute(vars or {})
@@ -0,0 +1 @@
+from .TemplateParser import TemplateParser
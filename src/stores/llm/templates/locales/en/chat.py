@@ -0,0 +1,26 @@
+from string import Template
+
+#### CHAT SESSION PROMPTS ####
+
+#### Summary ####
+
+summary_prompt = Template("\n".join([
+    "Update the running summary of a conversation between a user and an assistant.",
+    "Keep the facts, names, numbers and open questions needed to continue the conversation.",
+    "Drop greetings and repetition. Write at most a short paragraph.",
+    "",
+    "## Current summary:",
+    "$summary",
+    "",
+    "## New messages:",
+    "$transcript",
+    "",
+    "## Updated summary:",
+]))
+
+#### History ####
+
+history_summary_prompt = Template("\n".join([
+    "## Summary of the earlier conversation:",
+    "$summary",
+]))
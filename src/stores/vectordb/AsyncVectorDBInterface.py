@@ -0,0 +1,138 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Set, AsyncIterator
+
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class AsyncVectorDBInterface(ABC):
+    """
+    Async counterpart of VectorDBInterface.
+    Every operation is awaitable so vector I/O never blocks the event loop.
+    """
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """
+        Establish a connection to the vector database.
+        """
+        pass
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """
+        Cleanly disconnect from the vector database and release any held resources.
+        """
+        pass
+
+    @abstractmethod
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        """
+        Check whether a specific collection exists in the database.
+        """
+        pass
+
+    @abstractmethod
+    async def list_all_collection(self) -> List[str]:
+        """
+        Retrieve the names of all existing collections in the database.
+        """
+        pass
+
+    @abstractmethod
+    async def get_collection_info(self, collection_name: str):
+        """
+        Retrieve metadata or configuration details for a specific collection.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_collection(self, collection_name: str) -> bool:
+        """
+        Delete a specific collection from the database.
+        """
+        pass
+
+    @abstractmethod
+    async def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False
+    ) -> bool:
+        """
+        Create a new collection to store vectors.
+        """
+        pass
+
+    @abstractmethod
+    async def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: List[float],
+        metadata: Optional[Dict] = None,
+        record_id: Optional[str] = None
+    ) -> bool:
+        """
+        Insert a single document into the collection.
+        """
+        pass
+
+    @abstractmethod
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[Dict]] = None,
+        record_ids: Optional[List[str]] = None,
+        batch_size: int = 50
+    ) -> bool:
+        """
+        Insert multiple documents into the collection in batches.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_ids(self, collection_name: str, record_ids: List[str]) -> Set[str]:
+        """
+        Return the subset of the given record ids already stored in the collection.
+        """
+        pass
+
+    @abstractmethod
+    def iter_record_ids(self, collection_name: str, batch_size: int = 1000) -> AsyncIterator[List[str]]:
+        """
+        Asynchronously yield all record ids of the collection, page by page.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_many(self, collection_name: str, record_ids: List[str]) -> bool:
+        """
+        Delete the given records from the collection.
+        """
+        pass
+
+    @abstractmethod
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: List[float],
+        limit: int
+    ) -> List[RetrievedDocument]:
+        """
+        Perform a similarity search to retrieve top-k documents closest to the given vector.
+        """
+        pass
+
+    @abstractmethod
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: int
+    ) -> List[List[RetrievedDocument]]:
+        """
+        Run one top-k search per vector in a single call; results keep the input order.
+        """
+        pass
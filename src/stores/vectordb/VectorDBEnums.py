@@ -2,7 +2,12 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    NUMPY = "NUMPY"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
-    DOT = "dot"
\ No newline at end of file
+    DOT = "dot"
+
+class QuantizationEnums(Enum):
+    SCALAR = "scalar"
+    BINARY = "binary"
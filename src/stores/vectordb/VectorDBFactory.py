@@ -1,6 +1,5 @@
 import os
 
-from .providers import QdrantDBProvider
 from .VectorDBEnums import VectorDBEnums
 from helpers.config import Settings
 
@@ -18,11 +17,47 @@ class VectorDBFactory:
         return database_path
     
     def create(self, provider: str):
+        # Providers are imported here so unused SDKs are never loaded
         if provider == VectorDBEnums.QDRANT.value:
+            from .providers.QdrantDBProvider import QdrantDBProvider
             db_path = self.get_database_dir(db_name= self.config.VECTOR_DB_PATH_NAME)
             return QdrantDBProvider(
                 db_path=db_path,
-                distance_method=self.config.VECTOR_DB_DIATANCE_METHOD
+                distance_method=self.config.VECTOR_DB_DIATANCE_METHOD,
+                db_url=self.config.VECTOR_DB_URL,
+                upsert_batch_size=self.config.VECTOR_DB_UPSERT_BATCH_SIZE,
+                upsert_parallel=self.config.VECTOR_DB_UPSERT_PARALLEL,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                search_hnsw_ef=self.config.VECTOR_DB_SEARCH_HNSW_EF,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_always_ram=self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+                quantization_rescore=self.config.VECTOR_DB_QUANTIZATION_RESCORE,
+                quantization_oversampling=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLING,
+                vectors_on_disk=self.config.VECTOR_DB_VECTORS_ON_DISK,
+                payload_on_disk=self.config.VECTOR_DB_PAYLOAD_ON_DISK
+            )
+
+        if provider == VectorDBEnums.NUMPY.value:
+            from .providers.NumpyDBProvider import NumpyDBProvider
+            db_path = self.get_database_dir(db_name= self.config.VECTOR_DB_PATH_NAME)
+            return NumpyDBProvider(
+                db_path=db_path,
+                distance_method=self.config.VECTOR_DB_DIATANCE_METHOD,
+                dtype=self.config.VECTOR_DB_NUMPY_DTYPE,
+                compaction_ratio=self.config.VECTOR_DB_NUMPY_COMPACTION_RATIO
             )
 
         return None
+
+    def create_async(self, provider: str):
+        """Wrap the selected provider so every call runs off the event loop."""
+        vectordb_client = self.create(provider=provider)
+        if vectordb_client is None:
+            return None
+
+        from .providers.AsyncVectorDBProvider import AsyncVectorDBProvider
+        return AsyncVectorDBProvider(
+            provider=vectordb_client,
+            max_workers=self.config.VECTOR_DB_EXECUTOR_WORKERS
+        )
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Iterator
 
 from models.db_schemes.data_chunk import RetrievedDocument
 
@@ -94,14 +94,49 @@ class VectorDBInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_existing_ids(self, collection_name: str, record_ids: List[str]) -> Set[str]:
+        """
+        Return the subset of the given record ids already stored in the collection.
+        """
+        pass
+
+    @abstractmethod
+    def iter_record_ids(self, collection_name: str, batch_size: int = 1000) -> Iterator[List[str]]:
+        """
+        Yield all record ids of the collection, page by page.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, collection_name: str, record_ids: List[str]) -> bool:
+        """
+        Delete the given records from the collection.
+        """
+        pass
+
     @abstractmethod
     def search_by_vector(
         self,
         collection_name: str,
         vector: List[float],
         limit: int
-    ) -> List[RetrievedDocument]:
+    ) -> Optional[List[RetrievedDocument]]:
         """
         Perform a similarity search to retrieve top-k documents closest to the given vector.
+        Returns None if the search failed (as opposed to [] for no matches).
+        """
+        pass
+
+    @abstractmethod
+    def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: int
+    ) -> Optional[List[List[RetrievedDocument]]]:
+        """
+        Run one top-k search per vector in a single call; results keep the input order.
+        Returns None if the search failed.
         """
         pass
@@ -1,2 +1,3 @@
 from .VectorDBFactory import VectorDBFactory
-from .VectorDBInterface import VectorDBInterface
\ No newline at end of file
+from .VectorDBInterface import VectorDBInterface
+from .AsyncVectorDBInterface import AsyncVectorDBInterface
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Set, AsyncIterator
+
+from ..VectorDBInterface import VectorDBInterface
+from ..AsyncVectorDBInterface import AsyncVectorDBInterface
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class AsyncVectorDBProvider(AsyncVectorDBInterface):
+    """
+    Runs any VectorDBInterface on a dedicated thread pool.
+
+    The pool is separate from the loop's default executor so slow vector I/O
+    can't starve other to_thread work. Embedded stores such as Qdrant local
+    mode are not thread-safe, so the default is a single worker; insert_many
+    is submitted batch by batch so searches interleave with a large upsert
+    instead of waiting for all of it.
+    """
+
+    def __init__(self, provider: VectorDBInterface, max_workers: int = 1):
+        self.provider = provider
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def connect(self) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="vectordb"
+        )
+        await self._run(self.provider.connect)
+
+    async def disconnect(self) -> None:
+        await self._run(self.provider.disconnect)
+        self.executor.shutdown(wait=True)
+        self.executor = None
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return await self._run(self.provider.is_collection_existed, collection_name=collection_name)
+
+    async def list_all_collection(self) -> List[str]:
+        return await self._run(self.provider.list_all_collection)
+
+    async def get_collection_info(self, collection_name: str):
+        return await self._run(self.provider.get_collection_info, collection_name=collection_name)
+
+    async def delete_collection(self, collection_name: str) -> bool:
+        return await self._run(self.provider.delete_collection, collection_name=collection_name)
+
+    async def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False
+    ) -> bool:
+        return await self._run(
+            self.provider.create_collection,
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            do_reset=do_reset
+        )
+
+    async def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: List[float],
+        metadata: Optional[Dict] = None,
+        record_id: Optional[str] = None
+    ) -> bool:
+        return await self._run(
+            self.provider.insert_one,
+            collection_name=collection_name,
+            text=text,
+            vector=vector,
+            metadata=metadata,
+            record_id=record_id
+        )
+
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[Dict]] = None,
+        record_ids: Optional[List[str]] = None,
+        batch_size: int = 50
+    ) -> bool:
+        if metadatas is None:
+            metadatas = [{}] * len(texts)
+
+        for i in range(0, len(texts), batch_size):
+            is_inserted = await self._run(
+                self.provider.insert_many,
+                collection_name=collection_name,
+                texts=texts[i: i + batch_size],
+                vectors=vectors[i: i + batch_size],
+                metadatas=metadatas[i: i + batch_size],
+                record_ids=record_ids[i: i + batch_size] if record_ids is not None else None,
+                batch_size=batch_size
+            )
+            if not is_inserted:
+                return False
+        return True
+
+    async def get_existing_ids(self, collection_name: str, record_ids: List[str]) -> Set[str]:
+        return await self._run(
+            self.provider.get_existing_ids,
+            collection_name=collection_name,
+            record_ids=record_ids
+        )
+
+    async def iter_record_ids(self, collection_name: str, batch_size: int = 1000) -> AsyncIterator[List[str]]:
+        pages = self.provider.iter_record_ids(collection_name=collection_name, batch_size=batch_size)
+        while (record_ids := await self._run(next, pages, None)) is not None:
+            yield record_ids
+
+    async def delete_many(self, collection_name: str, record_ids: List[str]) -> bool:
+        return await self._run(
+            self.provider.delete_many,
+            collection_name=collection_name,
+            record_ids=record_ids
+        )
+
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: List[float],
+        limit: int
+    ) -> Optional[List[RetrievedDocument]]:
+        return await self._run(
+            self.provider.search_by_vector,
+            collection_name=collection_name,
+            vector=vector,
+            limit=limit
+        )
+
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: int
+    ) -> Optional[List[List[RetrievedDocument]]]:
+        return await self._run(
+            self.provider.search_by_vectors,
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit
+        )
@@ -0,0 +1,451 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import uuid
+import numpy as np
+from typing import List, Optional, Dict, Set, Iterator, Union
+
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class NumpyDBProvider(VectorDBInterface):
+    """
+    In-process exact search over memory-mapped vector files, for projects
+    small enough that one matmul beats an ANN index (roughly < 200k chunks).
+
+    Each collection is a directory holding:
+      meta.json       embedding size, storage dtype and distance
+      vectors.bin     append-only row-major matrix, read through np.memmap
+      records.sqlite  row -> record id, text, metadata and a tombstone flag
+
+    Deletes and upserts only tombstone rows; the matrix is compacted once
+    dead rows exceed compaction_ratio of the file.
+    """
+
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.bin"
+    RECORDS_FILE = "records.sqlite"
+
+    # Rows scored per matmul block, bounds the float32 copy of a float16 matrix
+    SEARCH_BLOCK_ROWS = 65536
+    # SQLite's default limit on host parameters per statement is 999
+    SQL_BATCH = 500
+    # Don't bother compacting tiny collections
+    MIN_COMPACTION_ROWS = 1000
+
+    def __init__(
+        self,
+        db_path: str,
+        distance_method: str,
+        dtype: str = "float32",
+        compaction_ratio: float = 0.3
+    ):
+        self.db_path = db_path
+        self.dtype = np.dtype(dtype)
+        self.compaction_ratio = compaction_ratio
+        self.collections: Dict[str, dict] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+        if distance_method == DistanceMethodEnums.COSINE.value:
+            self.distance_method = DistanceMethodEnums.COSINE.value
+        elif distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = DistanceMethodEnums.DOT.value
+        else:
+            self.logger.warning(f"Unknown distance method '{distance_method}', using Cosine as default.")
+            self.distance_method = DistanceMethodEnums.COSINE.value
+
+    def connect(self) -> None:
+        os.makedirs(self.db_path, exist_ok=True)
+        self.collections = {}
+
+    def disconnect(self) -> None:
+        for state in self.collections.values():
+            state["connection"].close()
+        self.collections = {}
+
+    def get_collection_dir(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(
+            os.path.join(self.get_collection_dir(collection_name), self.META_FILE)
+        )
+
+    def list_all_collection(self) -> List[str]:
+        return [
+            name for name in sorted(os.listdir(self.db_path))
+            if self.is_collection_existed(name)
+        ]
+
+    def get_collection_info(self, collection_name: str):
+        if not self.is_collection_existed(collection_name):
+            return None
+
+        state = self.open_collection(collection_name)
+        return {
+            **state["meta"],
+            "points_count": int(state["alive"].sum()),
+            "stored_rows": state["count"],
+        }
+
+    def delete_collection(self, collection_name: str) -> bool:
+        if not self.is_collection_existed(collection_name):
+            self.logger.warning(f"Collection {collection_name} does not exist.")
+            return False
+
+        self.logger.info(f"Deleting collection: {collection_name}")
+        state = self.collections.pop(collection_name, None)
+        if state is not None:
+            state["connection"].close()
+        shutil.rmtree(self.get_collection_dir(collection_name))
+        return True
+
+    def create_collection(
+        self, collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False
+    ) -> bool:
+        if do_reset:
+            self.delete_collection(collection_name)
+
+        if self.is_collection_existed(collection_name):
+            self.logger.info(f"Collection '{collection_name}' already exists.")
+            return False
+
+        collection_dir = self.get_collection_dir(collection_name)
+        os.makedirs(collection_dir, exist_ok=True)
+        open(os.path.join(collection_dir, self.VECTORS_FILE), "wb").close()
+
+        connection = sqlite3.connect(os.path.join(collection_dir, self.RECORDS_FILE))
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                row INTEGER PRIMARY KEY,
+                record_id TEXT NOT NULL,
+                text TEXT,
+                metadata TEXT,
+                alive INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS records_record_id_idx ON records (record_id)")
+        connection.commit()
+        connection.close()
+
+        # meta.json is written last: its presence marks the collection as complete
+        with open(os.path.join(collection_dir, self.META_FILE), "w") as f:
+            json.dump({
+                "embedding_size": embedding_size,
+                "dtype": self.dtype.name,
+                "distance": self.distance_method,
+            }, f)
+
+        self.logger.info(f"Collection '{collection_name}' created.")
+        return True
+
+    def open_collection(self, collection_name: str) -> dict:
+        """Load (once) the collection's metadata, records DB and alive mask."""
+        if collection_name in self.collections:
+            return self.collections[collection_name]
+
+        collection_dir = self.get_collection_dir(collection_name)
+        with open(os.path.join(collection_dir, self.META_FILE)) as f:
+            meta = json.load(f)
+
+        dtype = np.dtype(meta["dtype"])
+        row_bytes = meta["embedding_size"] * dtype.itemsize
+        # Rows appended without a committed record (e.g. a crash mid-insert) stay dead
+        count = os.path.getsize(os.path.join(collection_dir, self.VECTORS_FILE)) // row_bytes
+
+        connection = sqlite3.connect(
+            os.path.join(collection_dir, self.RECORDS_FILE),
+            check_same_thread=False
+        )
+        alive = np.zeros(count, dtype=bool)
+        alive_rows = [row for (row,) in connection.execute("SELECT row FROM records WHERE alive = 1")]
+        if alive_rows:
+            alive[np.asarray(alive_rows, dtype=np.int64)] = True
+
+        state = {
+            "meta": meta,
+            "dtype": dtype,
+            "connection": connection,
+            "count": count,
+            "alive": alive,
+            "matrix": None,
+        }
+        self.collections[collection_name] = state
+        return state
+
+    def get_matrix(self, collection_name: str, state: dict) -> Optional[np.memmap]:
+        if state["count"] == 0:
+            return None
+        if state["matrix"] is None or len(state["matrix"]) != state["count"]:
+            state["matrix"] = np.memmap(
+                os.path.join(self.get_collection_dir(collection_name), self.VECTORS_FILE),
+                dtype=state["dtype"],
+                mode="r",
+                shape=(state["count"], state["meta"]["embedding_size"])
+            )
+        return state["matrix"]
+
+    def prepare_vectors(self, vectors: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            # Store unit vectors so cosine similarity is a plain dot product
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+        return vectors
+
+    def tombstone(self, state: dict, record_ids: List[str]) -> int:
+        connection = state["connection"]
+        rows = []
+        for i in range(0, len(record_ids), self.SQL_BATCH):
+            batch = record_ids[i: i + self.SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(
+                row for (row,) in connection.execute(
+                    f"SELECT row FROM records WHERE alive = 1 AND record_id IN ({placeholders})",
+                    batch
+                )
+            )
+
+        if rows:
+            connection.executemany("UPDATE records SET alive = 0 WHERE row = ?", [(row,) for row in rows])
+            state["alive"][np.asarray(rows, dtype=np.int64)] = False
+        return len(rows)
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: List[float],
+        metadata: Optional[Dict] = None,
+        record_id: Optional[str] = None
+    ) -> bool:
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadatas=[metadata],
+            record_ids=[record_id] if record_id is not None else None
+        )
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: List[str],
+        vectors: Union[List[List[float]], np.ndarray],
+        metadatas: Optional[List[Dict]] = None,
+        record_ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> bool:
+        if not self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot insert into non-existent collection '{collection_name}'.")
+            return False
+
+        if not texts:
+            # An empty batch is trivially inserted
+            return True
+
+        state = self.open_collection(collection_name)
+        vectors = self.prepare_vectors(vectors)
+        if vectors.shape != (len(texts), state["meta"]["embedding_size"]):
+            self.logger.error(f"Expected {len(texts)} vectors, got array of shape {vectors.shape}.")
+            return False
+
+        if metadatas is None:
+            metadatas = [{}] * len(texts)
+        if record_ids is None:
+            record_ids = [str(uuid.uuid4()) for _ in texts]
+        record_ids = [str(record_id) for record_id in record_ids]
+
+        try:
+            # Upsert: older rows with the same ids become tombstones
+            self.tombstone(state, list(dict.fromkeys(record_ids)))
+            # Within the batch the last occurrence of an id wins
+            last_index = {record_id: i for i, record_id in enumerate(record_ids)}
+
+            start = state["count"]
+            with open(os.path.join(self.get_collection_dir(collection_name), self.VECTORS_FILE), "ab") as f:
+                f.write(vectors.astype(state["dtype"]).tobytes())
+
+            state["connection"].executemany(
+                "INSERT INTO records (row, record_id, text, metadata, alive) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (start + i, record_id, text, json.dumps(metadata or {}), int(last_index[record_id] == i))
+                    for i, (record_id, text, metadata) in enumerate(zip(record_ids, texts, metadatas))
+                ]
+            )
+            state["connection"].commit()
+
+            state["count"] += len(texts)
+            state["alive"] = np.concatenate([
+                state["alive"],
+                np.fromiter((last_index[record_id] == i for i, record_id in enumerate(record_ids)), dtype=bool, count=len(record_ids))
+            ])
+            self.logger.info(f"Inserted {len(texts)} records into '{collection_name}'.")
+        except Exception as e:
+            state["connection"].rollback()
+            # Drop cached state so the next call reloads it from disk
+            self.collections.pop(collection_name, None)
+            state["connection"].close()
+            self.logger.exception(f"Error inserting records batch: {e}")
+            return False
+
+        self.maybe_compact(collection_name, state)
+        return True
+
+    def get_existing_ids(self, collection_name: str, record_ids: List[str]) -> Set[str]:
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return set()
+
+        connection = self.open_collection(collection_name)["connection"]
+        existing = set()
+        for i in range(0, len(record_ids), self.SQL_BATCH):
+            batch = [str(record_id) for record_id in record_ids[i: i + self.SQL_BATCH]]
+            placeholders = ",".join("?" * len(batch))
+            existing.update(
+                record_id for (record_id,) in connection.execute(
+                    f"SELECT record_id FROM records WHERE alive = 1 AND record_id IN ({placeholders})",
+                    batch
+                )
+            )
+        return existing
+
+    def iter_record_ids(self, collection_name: str, batch_size: int = 1000) -> Iterator[List[str]]:
+        if not self.is_collection_existed(collection_name):
+            return
+
+        connection = self.open_collection(collection_name)["connection"]
+        last_row = -1
+        while True:
+            rows = connection.execute(
+                "SELECT row, record_id FROM records WHERE alive = 1 AND row > ? ORDER BY row LIMIT ?",
+                (last_row, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            last_row = rows[-1][0]
+            yield [record_id for _, record_id in rows]
+
+    def delete_many(self, collection_name: str, record_ids: List[str]) -> bool:
+        if not record_ids:
+            return True
+        if not self.is_collection_existed(collection_name):
+            return False
+
+        state = self.open_collection(collection_name)
+        try:
+            deleted = self.tombstone(state, [str(record_id) for record_id in record_ids])
+            state["connection"].commit()
+            self.logger.info(f"Deleted {deleted} records from '{collection_name}'.")
+        except Exception as e:
+            self.logger.exception(f"Error deleting records: {e}")
+            return False
+
+        self.maybe_compact(collection_name, state)
+        return True
+
+    def maybe_compact(self, collection_name: str, state: dict) -> None:
+        dead = state["count"] - int(state["alive"].sum())
+        if state["count"] >= self.MIN_COMPACTION_ROWS and dead > self.compaction_ratio * state["count"]:
+            self.compact(collection_name)
+
+    def compact(self, collection_name: str) -> None:
+        """Rewrite the matrix without tombstoned rows and renumber the records."""
+        state = self.open_collection(collection_name)
+        collection_dir = self.get_collection_dir(collection_name)
+        vectors_path = os.path.join(collection_dir, self.VECTORS_FILE)
+        alive_rows = np.flatnonzero(state["alive"])
+
+        matrix = self.get_matrix(collection_name, state)
+        with open(vectors_path + ".tmp", "wb") as f:
+            for i in range(0, len(alive_rows), self.SEARCH_BLOCK_ROWS):
+                f.write(np.ascontiguousarray(matrix[alive_rows[i: i + self.SEARCH_BLOCK_ROWS]]).tobytes())
+
+        connection = state["connection"]
+        connection.execute("DELETE FROM records WHERE alive = 0")
+        # Rows shrink in ascending order, so a new row number is always already free
+        connection.executemany(
+            "UPDATE records SET row = ? WHERE row = ?",
+            [(new_row, int(old_row)) for new_row, old_row in enumerate(alive_rows) if new_row != old_row]
+        )
+        state["matrix"] = None
+        del matrix
+        os.replace(vectors_path + ".tmp", vectors_path)
+        connection.commit()
+
+        state["count"] = len(alive_rows)
+        state["alive"] = np.ones(len(alive_rows), dtype=bool)
+        self.logger.info(f"Compacted '{collection_name}' to {len(alive_rows)} rows.")
+
+    def search_by_vector(
+        self,
+        collection_name: str,
+        vector: List[float],
+        limit: int
+    ) -> Optional[List[RetrievedDocument]]:
+        results = self.search_by_vectors(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit
+        )
+        return results[0] if results is not None else None
+
+    def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: int
+    ) -> Optional[List[List[RetrievedDocument]]]:
+        if not len(vectors):
+            return []
+        try:
+            state = self.open_collection(collection_name)
+            matrix = self.get_matrix(collection_name, state)
+            k = min(limit, int(state["alive"].sum()))
+            if matrix is None or k <= 0:
+                return [[] for _ in vectors]
+
+            # One pass over the matrix scores every query: (rows, dim) @ (dim, queries)
+            queries = self.prepare_vectors(vectors).T
+            scores = np.empty((state["count"], queries.shape[1]), dtype=np.float32)
+            for i in range(0, state["count"], self.SEARCH_BLOCK_ROWS):
+                block = matrix[i: i + self.SEARCH_BLOCK_ROWS]
+                scores[i: i + len(block)] = block.astype(np.float32, copy=False) @ queries
+            scores[~state["alive"]] = -np.inf
+
+            top = np.argpartition(-scores, k - 1, axis=0)[:k].T
+            top = np.take_along_axis(top, np.argsort(-scores[top, np.arange(len(top))[:, None]], axis=1), axis=1)
+
+            rows = [int(row) for row in np.unique(top)]
+            records = {}
+            for i in range(0, len(rows), self.SQL_BATCH):
+                batch = rows[i: i + self.SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                records.update(
+                    (row, (record_id, text)) for row, record_id, text in state["connection"].execute(
+                        f"SELECT row, record_id, text FROM records WHERE row IN ({placeholders})",
+                        batch
+                    )
+                )
+
+            return [
+                [
+                    RetrievedDocument(
+                        score=float(scores[row, q]),
+                        text=records[int(row)][1] or "",
+                        id=records[int(row)][0]
+                    )
+                    for row in query_top
+                ]
+                for q, query_top in enumerate(top)
+            ]
+        except Exception as e:
+            self.logger.exception(f"Error during search in collection '{collection_name}': {e}")
+            return None
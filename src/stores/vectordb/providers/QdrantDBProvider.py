@@ -1,15 +1,51 @@
 from qdrant_client import models, QdrantClient
 import logging
-from typing import List, Optional, Dict
+import uuid
+import numpy as np
+from typing import List, Optional, Dict, Set, Iterator, Union
 
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import VectorDBEnums, DistanceMethodEnums
+from ..VectorDBEnums import VectorDBEnums, DistanceMethodEnums, QuantizationEnums
 from models.db_schemes.data_chunk import RetrievedDocument
 
 class QdrantDBProvider(VectorDBInterface):
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(
+        self,
+        db_path: str,
+        distance_method: str,
+        db_url: str = None,
+        upsert_batch_size: int = 256,
+        upsert_parallel: int = 1,
+        hnsw_m: int = None,
+        hnsw_ef_construct: int = None,
+        search_hnsw_ef: int = None,
+        quantization: str = None,
+        quantization_always_ram: bool = True,
+        quantization_rescore: bool = True,
+        quantization_oversampling: float = None,
+        vectors_on_disk: bool = False,
+        payload_on_disk: bool = False
+    ):
         self.client = None
         self.db_path = db_path
+        self.db_url = db_url
+
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_parallel = upsert_parallel
+
+        # Collection layout; None keeps Qdrant's defaults
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.search_hnsw_ef = search_hnsw_ef
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.quantization_rescore = quantization_rescore
+        self.quantization_oversampling = quantization_oversampling
+        self.vectors_on_disk = vectors_on_disk
+        self.payload_on_disk = payload_on_disk
+
+        # Collections known to exist, so inserts skip the round trip
+        self.existing_collections: Set[str] = set()
 
         self.logger = logging.getLogger(__name__)
 
@@ -21,14 +57,61 @@ class QdrantDBProvider(VectorDBInterface):
             self.logger.warning(f"Unknown distance method '{distance_method}', using Cosine as default.")
             self.distance_method = models.Distance.COSINE
 
+    def get_hnsw_config(self) -> Optional[models.HnswConfigDiff]:
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def get_quantization_config(self):
+        if self.quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram
+                )
+            )
+        if self.quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=self.quantization_always_ram)
+            )
+        if self.quantization:
+            self.logger.warning(f"Unknown quantization '{self.quantization}', storing full vectors.")
+        return None
+
+    def get_search_params(self) -> Optional[models.SearchParams]:
+        quantization_params = None
+        if self.quantization in (QuantizationEnums.SCALAR.value, QuantizationEnums.BINARY.value):
+            # Search on the compact vectors, then rescore candidates with the originals
+            quantization_params = models.QuantizationSearchParams(
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling
+            )
+
+        if self.search_hnsw_ef is None and quantization_params is None:
+            return None
+        return models.SearchParams(hnsw_ef=self.search_hnsw_ef, quantization=quantization_params)
+
     def connect(self) -> None:
-        self.client = QdrantClient(path=self.db_path)
+        # A server URL enables parallel uploads; otherwise use embedded local mode
+        if self.db_url:
+            self.client = QdrantClient(url=self.db_url)
+        else:
+            self.client = QdrantClient(path=self.db_path)
+        self.existing_collections = set()
 
     def disconnect(self) -> None:
         self.client = None
+        self.existing_collections = set()
 
     def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        if collection_name in self.existing_collections:
+            return True
+
+        is_existed = self.client.collection_exists(collection_name=collection_name)
+        if is_existed:
+            self.existing_collections.add(collection_name)
+        return is_existed
 
     def list_all_collection(self) -> List[str]:
         collections_response = self.client.get_collections()
@@ -41,6 +124,7 @@ class QdrantDBProvider(VectorDBInterface):
         if self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
             self.client.delete_collection(collection_name=collection_name)
+            self.existing_collections.discard(collection_name)
             return True
         self.logger.warning(f"Collection {collection_name} does not exist.")
         return False
@@ -58,9 +142,14 @@ class QdrantDBProvider(VectorDBInterface):
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
-                    distance=self.distance_method
-                )
+                    distance=self.distance_method,
+                    on_disk=self.vectors_on_disk
+                ),
+                hnsw_config=self.get_hnsw_config(),
+                quantization_config=self.get_quantization_config(),
+                on_disk_payload=self.payload_on_disk
             )
+            self.existing_collections.add(collection_name)
             self.logger.info(f"Collection '{collection_name}' created.")
             return True
         self.logger.info(f"Collection '{collection_name}' already exists.")
@@ -102,63 +191,159 @@ class QdrantDBProvider(VectorDBInterface):
         self,
         collection_name: str,
         texts: List[str],
-        vectors: List[List[float]],
+        vectors: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict]] = None,
         record_ids: Optional[List[str]] = None,
-        batch_size: int = 50
+        batch_size: Optional[int] = None
     ) -> bool:
+        """
+        Bulk upsert. Vectors go in as one float32 matrix (column-oriented)
+        instead of a Record per row, uploaded in batch_size slices by
+        upsert_parallel workers (server mode only; local mode is single-threaded).
+        """
         if not self.is_collection_existed(collection_name):
             self.logger.error(f"Cannot insert into non-existent collection '{collection_name}'.")
             return False
 
+        if not texts:
+            # np.asarray([]) is 1-D; an empty batch is trivially inserted
+            return True
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(texts):
+            self.logger.error(
+                f"Expected {len(texts)} vectors, got array of shape {vectors.shape}."
+            )
+            return False
+
         if metadatas is None:
             metadatas = [{}] * len(texts)
         if record_ids is None:
-            record_ids = list(range(len(texts)))
+            # Random ids so separate calls never overwrite each other
+            record_ids = [str(uuid.uuid4()) for _ in texts]
 
         try:
-            for i in range(0, len(texts), batch_size):
-                batch_records = [
-                    models.Record(
-                        id=record_ids[j],
-                        vector=vectors[j],
-                        payload={
-                            "text": texts[j],
-                            "metadata": metadatas[j]
-                        }
-                    )
-                    for j in range(i, min(i + batch_size, len(texts)))
-                ]
-                
-                self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records
-                )
-            self.logger.info(f"All records inserted into '{collection_name}'.")
+            self.client.upload_collection(
+                collection_name=collection_name,
+                vectors=vectors,
+                payload=[
+                    {"text": text, "metadata": metadata}
+                    for text, metadata in zip(texts, metadatas)
+                ],
+                ids=record_ids,
+                batch_size=batch_size or self.upsert_batch_size,
+                parallel=self.upsert_parallel,
+                wait=True
+            )
+            self.logger.info(f"Inserted {len(texts)} records into '{collection_name}'.")
             return True
         except Exception as e:
             self.logger.exception(f"Error inserting records batch: {e}")
             return False
 
+    def get_existing_ids(self, collection_name: str, record_ids: List[str]) -> Set[str]:
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return set()
+
+        records = self.client.retrieve(
+            collection_name=collection_name,
+            ids=record_ids,
+            with_payload=False,
+            with_vectors=False
+        )
+        return {str(record.id) for record in records}
+
+    def iter_record_ids(self, collection_name: str, batch_size: int = 1000) -> Iterator[List[str]]:
+        if not self.is_collection_existed(collection_name):
+            return
+
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False
+            )
+            if records:
+                yield [str(record.id) for record in records]
+            if offset is None:
+                break
+
+    def delete_many(self, collection_name: str, record_ids: List[str]) -> bool:
+        if not record_ids:
+            return True
+
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=record_ids)
+            )
+            self.logger.info(f"Deleted {len(record_ids)} records from '{collection_name}'.")
+            return True
+        except Exception as e:
+            self.logger.exception(f"Error deleting records: {e}")
+            return False
+
     def search_by_vector(
         self,
         collection_name: str,
         vector: List[float],
         limit: int
-    ) -> List[RetrievedDocument]:
+    ) -> Optional[List[RetrievedDocument]]:
         try:
             results = self.client.search(
                 collection_name=collection_name,
                 query_vector=vector,
-                limit=limit
+                limit=limit,
+                search_params=self.get_search_params()
             )
             return [
                 RetrievedDocument(
                     score=record.score,
-                    text=record.payload.get("text", "")
+                    text=record.payload.get("text", ""),
+                    id=str(record.id)
                 )
                 for record in results
             ]
         except Exception as e:
             self.logger.exception(f"Error during search in collection '{collection_name}': {e}")
+            return None
+
+    def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: int
+    ) -> Optional[List[List[RetrievedDocument]]]:
+        if not len(vectors):
             return []
+        try:
+            search_params = self.get_search_params()
+            batch_results = self.client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    models.SearchRequest(
+                        vector=list(map(float, vector)),
+                        limit=limit,
+                        params=search_params,
+                        with_payload=True
+                    )
+                    for vector in vectors
+                ]
+            )
+            return [
+                [
+                    RetrievedDocument(
+                        score=record.score,
+                        text=record.payload.get("text", ""),
+                        id=str(record.id)
+                    )
+                    for record in results
+                ]
+                for results in batch_results
+            ]
+        except Exception as e:
+            self.logger.exception(f"Error during batch search in collection '{collection_name}': {e}")
+            return None